@@ -24,7 +24,7 @@ async def handle_click():
 
 pin_config = ButtonControllerPinConfig()
 debug_led = DebugLed(pin_config)
-button = DebouncedButton(pin_config.BOOT_BUTTON)
+button = DebouncedButton(pin_config.BOOT_BUTTON, use_irq=True)
 button.on_press(handle_click)
 
 
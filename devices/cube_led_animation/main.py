@@ -4,6 +4,7 @@ import uasyncio
 
 from lib.auto_shutdown import AutoShutdown
 from lib.button import DebouncedButton
+from lib.button_gestures import ButtonGestures
 from lib.led_matrix import ANIMATION_STATES, LedMatrix
 from lib.pin_config import PinConfigEsp32C3
 from lib.shift_register import ShiftRegister
@@ -42,24 +43,31 @@ async def main():
             current_animation=random.choice(ANIMATION_STATES),
         )
 
-        board_button = DebouncedButton(pin_config.BOOT_BUTTON)
+        board_button = DebouncedButton(pin_config.BOOT_BUTTON, use_irq=True)
+        gestures = ButtonGestures(board_button, max_clicks=1)
 
         async def cycle_animation():
             print('Cycling animation')
             led_matrix.cycle_animation()
 
-        # Board button toggles power on/off
-        board_button.on_press(cycle_animation)
+        async def toggle_power():
+            led_matrix.toggle_power()
+
+        # Click cycles animations, long press toggles power on/off
+        gestures.on_click(cycle_animation)
+        gestures.on_long_press(toggle_power)
 
         await uasyncio.gather(
             led_matrix.monitor(),
             board_button.monitor(),
+            gestures.monitor(),
             auto_shutdown.monitor(),
         )
     except KeyboardInterrupt:
         print('Keyboard interrupt received')
         try:
             board_button.stop()
+            gestures.stop()
             auto_shutdown.stop()
             led_matrix.stop_animation()
         except Exception as e:
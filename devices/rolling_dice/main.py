@@ -2,6 +2,7 @@ import uasyncio
 from auto_shutdown import AutoShutdown
 from button import Button, DebouncedButton
 from capacitive_touch_sensor import CapacitiveTouchSensor
+from event_dispatcher import EventDispatcher
 from machine import Pin
 from rolling_dice import RollingDice
 from pin_config import PinConfigEsp32C3
@@ -39,15 +40,21 @@ async def main():
             PinConfig.rolling_dice_lr,
         ])
 
-        reed_switch = Button(pin=PinConfig.reed_switch, pin_mode=Pin.IN, pull=Pin.PULL_UP)
+        reed_switch = Button(
+            pin=PinConfig.reed_switch, pin_mode=Pin.IN, pull=Pin.PULL_UP, use_irq=True
+        )
 
         # Set up dice roll handler
         async def handle_roll():
             was_pressed = reed_switch.consume_was_pressed()
             await rolling_dice.roll(6 if was_pressed else None)
 
+        # Rolls run one at a time on a single worker, each input keeps at most one pending roll
+        dispatcher = EventDispatcher(workers=1)
+
         # Set up BOOT button
-        boot_button = DebouncedButton(PinConfig.BOOT_BUTTON)
+        boot_button = DebouncedButton(PinConfig.BOOT_BUTTON, use_irq=True)
+        boot_button.use_dispatcher(dispatcher, EventDispatcher.DROP, size=1)
         boot_button.on_press(handle_roll)
 
         # Set up capacitive touch sensor with our specialized class
@@ -56,7 +63,9 @@ async def main():
             pull_down=True,  # Use pull-down resistor
             active_high=True,  # TTP223 outputs HIGH when touched
             debounce_ms=50,  # 50ms debounce to avoid false triggers
+            use_irq=True,  # Sleep until the sensor output changes
         )
+        touch_sensor.use_dispatcher(dispatcher, EventDispatcher.DROP, size=1)
 
         # Control LED with touch state and roll dice on touch
         async def on_touch():
@@ -70,6 +79,7 @@ async def main():
 
         print('Dice system running...')
         await uasyncio.gather(
+            dispatcher.monitor(),
             boot_button.monitor(),
             touch_sensor.monitor(),
             auto_shutdown.monitor(),
@@ -79,6 +89,7 @@ async def main():
     except KeyboardInterrupt:
         print('Keyboard interrupt received')
         try:
+            dispatcher.stop()
             boot_button.stop()
             touch_sensor.stop()
             auto_shutdown.stop()
@@ -1,6 +1,7 @@
 import uasyncio as asyncio
 from machine import PWM, Pin
 
+from lib.event_dispatcher import EventDispatcher
 from lib.logger import Logger
 
 
@@ -29,6 +30,7 @@ class AudioAmplifier:
 
         self._monitor_task = None
         self._running = False
+        self._channel = None
         self._callbacks = {
             'status_change': None,
             'playback_started': None,
@@ -41,7 +43,7 @@ class AudioAmplifier:
         self._current_audio_data = None
         self._timer = None
 
-        self.logger.info(f'Initialized {amp_type} amplifier on pin {data_pin}')
+        self.logger.info('Initialized %s amplifier on pin %s', amp_type, data_pin)
 
     @property
     def volume(self):
@@ -51,9 +53,9 @@ class AudioAmplifier:
     def volume(self, value):
         if 0 <= value <= 100:
             self._volume = value
-            self.logger.info(f'Volume set to {value}%')
+            self.logger.info('Volume set to %d%%', value)
         else:
-            self.logger.error(f'Invalid volume level: {value}')
+            self.logger.error('Invalid volume level: %s', value)
 
     def enable(self):
         if self.shutdown_pin is not None:
@@ -82,14 +84,14 @@ class AudioAmplifier:
         if self._playing:
             await self.stop_playback()
 
-        self.logger.info(f'Loading WAV file: {filename}')
+        self.logger.info('Loading WAV file: %s', filename)
         result = await sd_reader.read_wav(filename)
         if not result:
-            self.logger.error(f'Failed to read WAV file: {filename}')
+            self.logger.error('Failed to read WAV file: %s', filename)
             return False
 
         sample_rate, audio_data = result
-        self.logger.info(f'WAV loaded: {len(audio_data)} bytes, {sample_rate}Hz')
+        self.logger.info('WAV loaded: %d bytes, %dHz', len(audio_data), sample_rate)
 
         # Update sample rate if different
         if sample_rate != self.sample_rate:
@@ -194,9 +196,15 @@ class AudioAmplifier:
         self._running = False
         self.logger.info('Monitoring stopped')
 
+    def use_dispatcher(self, dispatcher, policy=EventDispatcher.COALESCE, size=4):
+        self._channel = dispatcher.channel(policy, size)
+
     async def _run_callback(self, callback_type, data=None):
         callback = self._callbacks.get(callback_type)
         if callback:
+            if self._channel is not None:
+                self._channel.post(callback, (data,))
+                return
             await asyncio.create_task(callback(data))
 
     async def _monitor(self):
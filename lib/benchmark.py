@@ -0,0 +1,173 @@
+import gc
+import json
+import os
+import sys
+import time
+
+import uasyncio
+from machine import Pin
+
+from lib.audio_amplifier import AudioAmplifier
+from lib.button import Button
+from lib.led_matrix import LedMatrix
+from lib.log_buffer import LogBuffer
+from lib.logger import Logger
+from lib.pin_config import PinConfigEsp32, PinConfigEsp32C3
+from lib.shift_register import ShiftRegister
+
+# Fixture pins per board, the BENCH_* pins of its PinConfig avoid the SPI flash pins
+BOARD_PINS = {
+    'host': PinConfigEsp32C3,
+    'esp32': PinConfigEsp32,
+    'esp32c3': PinConfigEsp32C3,
+}
+
+AUDIO_SAMPLES = 256
+
+
+def bench_shift_register_update(pins=PinConfigEsp32C3):
+    shift_register = ShiftRegister(
+        pins.BENCH_SER_PIN, pins.BENCH_RCLK_PIN, pins.BENCH_SRCLK_PIN, registers=2
+    )
+    shift_register.state[0] = 0xA5
+    shift_register.state[1] = 0x5A
+    return shift_register.update
+
+
+def bench_led_matrix_frame(pins=PinConfigEsp32C3):
+    sr = ShiftRegister(pins.BENCH_SER_PIN, pins.BENCH_RCLK_PIN, pins.BENCH_SRCLK_PIN)
+    matrix = LedMatrix([[sr.q0, sr.q7, sr.q5, sr.q4]])
+    frame = [0]
+
+    def pattern(row, col):
+        return (col + frame[0]) & 1
+
+    def render():
+        frame[0] += 1
+        matrix._set_matrix_pattern(pattern)
+
+    return render
+
+
+def bench_audio_sample_pump(pins=PinConfigEsp32C3):
+    amplifier = AudioAmplifier(pins.BENCH_AUDIO_PIN, sample_rate=8000)
+    samples = bytes(range(AUDIO_SAMPLES))
+
+    async def pump():
+        amplifier._current_audio_data = samples
+        amplifier._current_sample_idx = 0
+        amplifier._playing = True
+        await amplifier._playback_loop()
+
+    return pump
+
+
+def bench_button_scan(pins=PinConfigEsp32C3):
+    button = Button(pins.BENCH_BUTTON_PIN, Pin.IN, Pin.PULL_UP, debug=False)
+    return button._check_once
+
+
+def bench_logger_disabled(pins=None):
+    logger = Logger(prefix='Bench')
+
+    def log():
+        logger.info('Value %d', 42)
+
+    return log
+
+
+def bench_logger_buffered(pins=None):
+    logger = Logger(prefix='Bench', buffer=LogBuffer('bench.log'))
+
+    def log():
+        logger.info('Value %d', 42)
+
+    return log
+
+
+# name -> setup(pins) returning the operation to time, sync or async
+CASES = {
+    'shift_register.update': bench_shift_register_update,
+    'led_matrix.frame': bench_led_matrix_frame,
+    'audio.sample_pump': bench_audio_sample_pump,
+    'button.scan': bench_button_scan,
+    'logger.disabled': bench_logger_disabled,
+    'logger.buffered': bench_logger_buffered,
+}
+
+
+def board_name():
+    """Short board id used to keep per-board baselines apart"""
+    if sys.implementation.name != 'micropython':
+        return 'host'
+    machine = os.uname().machine.lower().replace('-', '')
+    for board in ('esp32c3', 'esp32s3', 'esp32s2'):
+        if board in machine:
+            return board
+    return sys.platform
+
+
+def _mem_alloc():
+    return gc.mem_alloc() if hasattr(gc, 'mem_alloc') else 0
+
+
+async def _measure(op, iterations):
+    result = op()  # warm up caches and lazy state
+    if hasattr(result, 'send'):
+        await result
+    total_us = 0
+    alloc = 0
+    for _ in range(iterations):
+        # gc is paused for one call at a time so long runs cannot exhaust the heap
+        gc.collect()
+        gc.disable()
+        try:
+            alloc_before = _mem_alloc()
+            start = time.ticks_us()
+            result = op()
+            if hasattr(result, 'send'):
+                await result
+            total_us += time.ticks_diff(time.ticks_us(), start)
+            alloc = max(alloc, _mem_alloc() - alloc_before)
+        finally:
+            gc.enable()
+    return total_us // iterations, alloc
+
+
+def measure(op, iterations=100):
+    """
+    Returns (us per call, most bytes allocated by one call).
+
+    Every call runs inside a single event loop, so async cases do not pay for
+    uasyncio.run() setup on each iteration.
+    """
+    return uasyncio.run(_measure(op, iterations))
+
+
+def run(cases=None, iterations=100, board=None, pins=None):
+    """
+    Time each case with ticks_us and print one machine-readable line per case:
+
+        BENCH {"board": "esp32c3", "case": "button.scan", "us": 120, "alloc": 32, ...}
+
+    Capture the serial output (e.g. mpremote run lib/benchmark.py > bench.log) and
+    compare it with scripts/compare_benchmarks.py. Fixtures use the BENCH_* pins of
+    the board's PinConfig; pass pins (any object with those attributes) for boards
+    missing from BOARD_PINS.
+    """
+    board = board or board_name()
+    if pins is None:
+        pins = BOARD_PINS.get(board)
+        if pins is None:
+            raise ValueError(f'No benchmark pins for board {board}, pass pins to run()')
+    results = []
+    for name in cases or CASES:
+        us, alloc = measure(CASES[name](pins), iterations)
+        result = {'board': board, 'case': name, 'us': us, 'alloc': alloc, 'iterations': iterations}
+        print('BENCH', json.dumps(result))
+        results.append(result)
+    return results
+
+
+if __name__ == '__main__':
+    run()
@@ -1,22 +1,29 @@
 import time
 
 import uasyncio
+from edge_capture import EdgeCapture
+from event_dispatcher import EventDispatcher
 from logger import Logger
 from machine import Pin
 
 
 class Button:
-    def __init__(self, pin: int, pin_mode=Pin.IN, pull=Pin.PULL_UP, debug=True):
+    def __init__(self, pin: int, pin_mode=Pin.IN, pull=Pin.PULL_UP, debug=True, use_irq=False):
         try:
             self.pin = Pin(pin, pin_mode, pull)
         except ValueError as e:
             raise ValueError(f'Invalid pin number {pin}: {e!s}') from e
 
+        self.pin_num = pin
+        self.active_high = False
         self._running = False
         self.logger = Logger(prefix=f'Button(pin={pin})', debug=debug)
         self._callbacks = {'down': None, 'up': None, 'press': None}
         self._was_pressed = None
         self.was_pressed = False
+        self._edges = EdgeCapture(self.pin) if use_irq else None
+        self._channel = None
+        self._settle_ms = 1
 
     def is_pressed(self):
         return not bool(self.pin.value())
@@ -30,43 +37,85 @@ class Button:
     def on_press(self, callback):
         self._callbacks['press'] = callback
 
+    def use_dispatcher(self, dispatcher, policy=EventDispatcher.QUEUE, size=4):
+        """Run callbacks on the dispatcher's workers so monitoring continues while they run"""
+        self._channel = dispatcher.channel(policy, size)
+
     async def _run_callback(self, callback_type):
         callback = self._callbacks[callback_type]
         if callback:
+            if self._channel is not None:
+                self._channel.post(callback)
+                return
             try:
                 task = uasyncio.create_task(callback())
                 await task
             except Exception as e:
-                self.logger.info(f'Error executing {callback_type} callback: {e!s}')
+                self.logger.info('Error executing %s callback: %s', callback_type, e)
 
-    async def _check_once(self):
-        is_pressed = self.is_pressed()
+    def _accept(self, is_pressed, now):
+        return True
 
+    async def _update(self, is_pressed, now):
         if self._was_pressed is None:
             self._was_pressed = is_pressed
             return
 
-        if is_pressed and not self._was_pressed:
+        if is_pressed == self._was_pressed or not self._accept(is_pressed, now):
+            return
+
+        if is_pressed:
             await self._run_callback('down')
             self._was_pressed = True
-        elif not is_pressed and self._was_pressed:
+        else:
             await self._run_callback('press')
             await self._run_callback('up')
             self._was_pressed = False
             self.was_pressed = True
 
+    async def _check_once(self):
+        await self._update(self.is_pressed(), time.ticks_us())
+
+    async def _process_edges(self):
+        while self._edges.pending():
+            ticks, level = self._edges.pop()
+            await self._update(not level, ticks)
+
+        # An edge rejected by debouncing may be the last one, so confirm the settled level
+        while self._running and self.is_pressed() != self._was_pressed:
+            await uasyncio.sleep_ms(self._settle_ms)
+            await self._check_once()
+
     async def monitor(self):
         self._running = True
+        if self._edges is not None:
+            await self._monitor_edges()
+            return
+
         while self._running:
             try:
                 await self._check_once()
                 await uasyncio.sleep(0.001)
             except Exception as e:
-                self.logger.info(f'Error in monitor: {e!s}')
+                self.logger.info('Error in monitor: %s', e)
+                await uasyncio.sleep(0.1)
+
+    async def _monitor_edges(self):
+        self._edges.start()
+        await self._check_once()
+        while self._running:
+            try:
+                await self._edges.wait()
+                await self._process_edges()
+            except Exception as e:
+                self.logger.info('Error in monitor: %s', e)
                 await uasyncio.sleep(0.1)
+        self._edges.stop()
 
     def stop(self):
         self._running = False
+        if self._edges is not None:
+            self._edges.wake()
 
     def consume_was_pressed(self):
         """Returns True if the button was pressed since last check and resets the state"""
@@ -78,25 +127,15 @@ class Button:
 class DebouncedButton(Button):
     def __init__(self, pin: int, debounce_ms=20, **kwargs):
         super().__init__(pin, **kwargs)
-        self._debounce_time = debounce_ms / 1000
-        self._last_press = -self._debounce_time
-        self._last_release = -self._debounce_time
-
-    async def _check_once(self):
-        now = time.time()
-        is_pressed = self.is_pressed()
-
-        if self._was_pressed is None:
-            self._was_pressed = is_pressed
-            return
-
-        if is_pressed != self._was_pressed:
-            if is_pressed and now - self._last_press >= self._debounce_time:
-                await self._run_callback('down')
-                self._was_pressed = True
-                self._last_press = now
-            elif not is_pressed and now - self._last_release >= self._debounce_time:
-                await self._run_callback('press')
-                await self._run_callback('up')
-                self._was_pressed = False
-                self._last_release = now
+        self._debounce_us = debounce_ms * 1000
+        self._settle_ms = debounce_ms
+        self._last_change = None
+
+    def _accept(self, is_pressed, now):
+        # Bounces alternate direction, so any edge too close to the last accepted one is noise
+        last = self._last_change
+        if last is not None and time.ticks_diff(now, last) < self._debounce_us:
+            return False
+
+        self._last_change = now
+        return True
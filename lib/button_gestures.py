@@ -0,0 +1,156 @@
+import time
+
+import uasyncio
+from logger import Logger
+from micropython import const
+
+_IDLE = const(0)
+_PRESSED = const(1)
+_RELEASED = const(2)
+_HELD = const(3)
+
+_CLICK_EVENTS = ('click', 'double_click', 'triple_click')
+
+
+class ButtonGestures:
+    """
+    Recognizes click, double/triple click, long-press and hold-to-repeat on a Button.
+
+    The state machine is driven by the button's down/up callbacks and monitor() only
+    sleeps until the next gesture deadline, so an idle button costs no polling.
+    Set max_clicks=1 to report clicks immediately on release without waiting for a
+    possible double click, and repeat_ms to fire repeat events while held after a
+    long press.
+    """
+
+    def __init__(
+        self,
+        button,
+        long_press_ms=600,
+        multi_click_ms=300,
+        repeat_ms=None,
+        max_clicks=3,
+        debug=False,
+    ):
+        if not 1 <= max_clicks <= len(_CLICK_EVENTS):
+            raise ValueError(f'max_clicks must be between 1 and {len(_CLICK_EVENTS)}')
+
+        self.long_press_ms = long_press_ms
+        self.multi_click_ms = multi_click_ms
+        self.repeat_ms = repeat_ms
+        self.max_clicks = max_clicks
+        self.logger = Logger(prefix='ButtonGestures', debug=debug)
+
+        self._callbacks = {
+            'click': None,
+            'double_click': None,
+            'triple_click': None,
+            'long_press': None,
+            'repeat': None,
+        }
+        self._state = _IDLE
+        self._clicks = 0
+        self._deadline = 0
+        self._running = False
+        self._wake = uasyncio.ThreadSafeFlag()
+
+        button.on_button_down(self._handle_down)
+        button.on_button_up(self._handle_up)
+
+    def on_click(self, callback):
+        self._callbacks['click'] = callback
+
+    def on_double_click(self, callback):
+        self._callbacks['double_click'] = callback
+
+    def on_triple_click(self, callback):
+        self._callbacks['triple_click'] = callback
+
+    def on_long_press(self, callback):
+        self._callbacks['long_press'] = callback
+
+    def on_repeat(self, callback):
+        self._callbacks['repeat'] = callback
+
+    async def _run_callback(self, callback_type):
+        callback = self._callbacks[callback_type]
+        if callback:
+            try:
+                task = uasyncio.create_task(callback())
+                await task
+            except Exception as e:
+                self.logger.info('Error executing %s callback: %s', callback_type, e)
+
+    async def _handle_down(self):
+        self._state = _PRESSED
+        self._deadline = time.ticks_add(time.ticks_ms(), self.long_press_ms)
+        self._wake.set()
+
+    async def _handle_up(self):
+        if self._state == _HELD:
+            self._state = _IDLE
+            self._clicks = 0
+            return
+
+        self._clicks += 1
+        if self._clicks >= self.max_clicks:
+            await self._emit_clicks()
+            return
+
+        self._state = _RELEASED
+        self._deadline = time.ticks_add(time.ticks_ms(), self.multi_click_ms)
+        self._wake.set()
+
+    async def _emit_clicks(self):
+        clicks = self._clicks
+        self._clicks = 0
+        self._state = _IDLE
+        await self._run_callback(_CLICK_EVENTS[clicks - 1])
+
+    async def _expire(self, now):
+        if self._state == _RELEASED:
+            await self._emit_clicks()
+        elif self._state == _PRESSED:
+            self._state = _HELD
+            self._clicks = 0
+            if self.repeat_ms:
+                self._deadline = time.ticks_add(now, self.repeat_ms)
+            await self._run_callback('long_press')
+        elif self._state == _HELD and self.repeat_ms:
+            self._deadline = time.ticks_add(self._deadline, self.repeat_ms)
+            await self._run_callback('repeat')
+
+    def _has_deadline(self):
+        if self._state == _HELD:
+            return bool(self.repeat_ms)
+        return self._state != _IDLE
+
+    async def _wait_wake(self, timeout_ms):
+        """Sleeps until a button event or timeout_ms, returns False on timeout"""
+        try:
+            await uasyncio.wait_for_ms(self._wake.wait(), timeout_ms)
+            return True
+        except uasyncio.TimeoutError:
+            return False
+
+    async def monitor(self):
+        self._running = True
+        while self._running:
+            try:
+                if not self._has_deadline():
+                    await self._wake.wait()
+                    continue
+
+                delay = time.ticks_diff(self._deadline, time.ticks_ms())
+                if delay > 0:
+                    await self._wait_wake(delay)
+                    continue
+
+                await self._expire(time.ticks_ms())
+            except Exception as e:
+                self.logger.info('Error in monitor: %s', e)
+                await uasyncio.sleep(0.1)
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
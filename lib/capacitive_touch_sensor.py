@@ -19,8 +19,13 @@ Sensor Behavior:
 import time
 
 import uasyncio
+from edge_capture import EdgeCapture
+from event_dispatcher import EventDispatcher
 from logger import Logger
 from machine import Pin
+from micropython import const
+
+_FULL = const(4096)  # Integrator value at which a touch registers
 
 
 class CapacitiveTouchSensor:
@@ -28,21 +33,42 @@ class CapacitiveTouchSensor:
     A class for controlling capacitive touch sensors like TTP223.
 
     This class properly handles the touch sensor behavior:
-    1. Provides debouncing to avoid false triggers
+    1. Debounces with a fixed-point integrator to avoid false triggers
     2. Handles momentary touch mode (sensor outputs HIGH when touched)
     3. Allows registering callbacks for touch events
+
+    The integrator climbs while the raw reading is touched and falls while it is
+    released. A touch registers once it has been touched for a total of attack_ms,
+    a release once it has been released for release_ms, so short glitches in either
+    direction only partially move it. Readings can come from monitor() polling, from
+    pin IRQs (use_irq=True) or from a shared InputScanner.
     """
 
-    def __init__(self, pin, debounce_ms=50, active_high=True, pull_down=True, debug=False):
+    def __init__(
+        self,
+        pin,
+        debounce_ms=50,
+        active_high=True,
+        pull_down=True,
+        debug=False,
+        attack_ms=20,
+        release_ms=None,
+        poll_ms=10,
+        use_irq=False,
+    ):
         """
         Initialize a capacitive touch sensor.
 
         Args:
             pin: The GPIO pin number connected to the sensor's SIG/OUT pin
-            debounce_ms: Debounce time in milliseconds to avoid false triggers
+            debounce_ms: Default release time when release_ms is not given
             active_high: True if sensor outputs HIGH when touched (default behavior)
             pull_down: Whether to enable pull-down resistor on the pin
             debug: Enable debug logging
+            attack_ms: Accumulated touch time in milliseconds before a touch registers
+            release_ms: Accumulated release time in milliseconds before a release registers
+            poll_ms: Polling interval of monitor() when not using IRQs
+            use_irq: Wake on pin edges instead of polling
         """
         # Set up the pin with appropriate pull resistor
         if pull_down:
@@ -52,23 +78,38 @@ class CapacitiveTouchSensor:
 
         self.pin_num = pin
         self.active_high = active_high
-        self.debounce_time = debounce_ms / 1000  # Convert to seconds
+        self.poll_ms = poll_ms
+        self.attack_ms = attack_ms
+        self.release_ms = debounce_ms if release_ms is None else release_ms
+        self._attack_rate = self._rate(self.attack_ms)
+        self._release_rate = self._rate(self.release_ms)
 
         # State tracking
         self.touched = False
         self.last_touch_time = 0.0
-        self.last_state_change = 0.0  # Initialize as float to match time.time() return type
+        self.latency_ms = None
+        self._level = 0
+        self._raw = False
+        self._last_sample_ms = None
+        self._onset_ms = 0
+        self._edges = EdgeCapture(self.pin) if use_irq else None
         self._running = False
 
         # Callbacks
         self._on_touch = None
         self._on_release = None
         self._on_toggle = None
+        self._channel = None
 
         # Logger for debugging
         self.logger = Logger(prefix=f'CapacitiveTouchSensor(pin={pin})', debug=debug)
         self.logger.info('Initialized')
 
+    @staticmethod
+    def _rate(ms):
+        """Integrator step per millisecond, rounded up so ms is always enough"""
+        return _FULL if ms <= 0 else (_FULL + ms - 1) // ms
+
     def is_touched(self):
         """
         Check if the sensor is currently being touched.
@@ -109,6 +150,17 @@ class CapacitiveTouchSensor:
         """
         self._on_toggle = callback
 
+    def use_dispatcher(self, dispatcher, policy=EventDispatcher.QUEUE, size=4):
+        """
+        Run callbacks on the dispatcher's workers instead of inside monitor().
+
+        Args:
+            dispatcher: The EventDispatcher running the callbacks
+            policy: Channel policy, EventDispatcher.DROP, COALESCE or QUEUE
+            size: Maximum number of pending events
+        """
+        self._channel = dispatcher.channel(policy, size)
+
     async def _run_callback(self, callback):
         """
         Run a callback asynchronously if it exists.
@@ -117,13 +169,122 @@ class CapacitiveTouchSensor:
             callback: The callback function to run
         """
         if callback is not None:
+            if self._channel is not None:
+                self._channel.post(callback)
+                return
             try:
                 # Try to create a task from the callback result
                 # This assumes callback() returns a coroutine
                 task = uasyncio.create_task(callback())
                 await task
             except Exception as e:
-                self.logger.info(f'Error in callback: {e}')
+                self.logger.info('Error in callback: %s', e)
+
+    def _sample(self, touched, now):
+        """
+        Feed a raw reading into the integrator.
+
+        Args:
+            touched: The raw reading, True if touched
+            now: Time of the reading in ticks_ms
+
+        Returns:
+            bool: True if the debounced touch state changed
+        """
+        if self._last_sample_ms is None:
+            self._last_sample_ms = now
+            self._raw = touched
+            self._level = _FULL if touched else 0
+            self.touched = touched
+            return False
+
+        # The previous raw reading held since the last sample
+        elapsed = time.ticks_diff(now, self._last_sample_ms)
+        if elapsed > 0:
+            self._last_sample_ms = now
+            if self._raw:
+                self._level = min(_FULL, self._level + elapsed * self._attack_rate)
+            else:
+                self._level = max(0, self._level - elapsed * self._release_rate)
+
+        if touched != self._raw:
+            self._raw = touched
+            # Latency counts from where the integrator left its settled rail
+            if touched != self.touched and self._level == (_FULL if self.touched else 0):
+                self._onset_ms = now
+
+        # Zero attack or release time registers the change immediately
+        if touched and self.attack_ms <= 0:
+            self._level = _FULL
+        elif not touched and self.release_ms <= 0:
+            self._level = 0
+
+        if self.touched:
+            if self._level > 0:
+                return False
+        elif self._level < _FULL:
+            return False
+
+        self.touched = not self.touched
+        self.latency_ms = time.ticks_diff(now, self._onset_ms)
+        return True
+
+    def _settle_ms(self):
+        """Milliseconds until the integrator reaches its rail, None when settled"""
+        if self._raw:
+            remaining = _FULL - self._level
+            rate = self._attack_rate
+        else:
+            remaining = self._level
+            rate = self._release_rate
+        if remaining <= 0:
+            return None
+        return (remaining + rate - 1) // rate
+
+    async def _notify(self):
+        """Log and run callbacks for the current touch state"""
+        self.logger.info(
+            'Touch state changed: %s after %s ms',
+            'TOUCHED' if self.touched else 'RELEASED',
+            self.latency_ms,
+        )
+
+        # Run appropriate callbacks
+        if self.touched:  # Touch event
+            self.last_touch_time = time.time()
+            await self._run_callback(self._on_touch)
+        else:  # Release event
+            await self._run_callback(self._on_release)
+
+        # Always run toggle callback for any state change
+        await self._run_callback(self._on_toggle)
+
+    async def _process_edges(self):
+        now_ms = time.ticks_ms()
+        now_us = time.ticks_us()
+        while self._edges.pending():
+            edge_us, level = self._edges.pop()
+            edge_ms = time.ticks_add(now_ms, -(time.ticks_diff(now_us, edge_us) // 1000))
+            if self._sample(bool(level) == self.active_high, edge_ms):
+                await self._notify()
+        if self._sample(self.is_touched(), now_ms):
+            await self._notify()
+
+    async def _monitor_edges(self):
+        self._edges.start()
+        self._sample(self.is_touched(), time.ticks_ms())
+        while self._running:
+            try:
+                delay = self._settle_ms()
+                if delay is None:
+                    await self._edges.wait()
+                else:
+                    await uasyncio.sleep_ms(delay)
+                await self._process_edges()
+            except Exception as e:
+                self.logger.info('Error in monitor: %s', e)
+                await uasyncio.sleep(0.1)
+        self._edges.stop()
 
     async def monitor(self):
         """
@@ -132,70 +293,26 @@ class CapacitiveTouchSensor:
         """
         self.logger.info('Starting touch sensor monitoring')
         self._running = True
-        last_touched = None
+        self._last_sample_ms = None
 
-        # For stability tracking
-        stable_count = 0
-        required_stability = 3  # Require 3 consistent readings for a state change
-        current_reading = None
+        if self._edges is not None:
+            await self._monitor_edges()
+            return
 
         while self._running:
             try:
-                # Read the current state
-                is_touched_now = self.is_touched()
-
-                # For initial state
-                if last_touched is None:
-                    last_touched = is_touched_now
-                    self.touched = is_touched_now
-                    current_reading = is_touched_now
-                    continue
-
-                # Stability check to reduce noise/false triggers
-                if is_touched_now == current_reading:
-                    # Same reading, increment stability counter
-                    stable_count += 1
-                else:
-                    # Different reading, reset counter and update current reading
-                    stable_count = 0
-                    current_reading = is_touched_now
-
-                # Only process state change if we have stable readings
-                if stable_count >= required_stability and current_reading != last_touched:
-                    # State has changed and is stable
-                    now = time.time()
-                    time_since_last_change = now - self.last_state_change
-
-                    # Only process if debounce time has passed
-                    if time_since_last_change >= self.debounce_time:
-                        # Update state tracking
-                        self.touched = current_reading
-                        last_touched = current_reading
-                        self.last_state_change = now
-
-                        # Log state change
-                        state_str = 'TOUCHED' if current_reading else 'RELEASED'
-                        self.logger.info(f'Touch state changed: {state_str}')
-
-                        # Run appropriate callbacks
-                        if current_reading:  # Touch event
-                            self.last_touch_time = now
-                            await self._run_callback(self._on_touch)
-                        else:  # Release event
-                            await self._run_callback(self._on_release)
-
-                        # Always run toggle callback for any state change
-                        await self._run_callback(self._on_toggle)
-
+                if self._sample(self.is_touched(), time.ticks_ms()):
+                    await self._notify()
             except Exception as e:
-                self.logger.info(f'Error in monitor: {e}')
+                self.logger.info('Error in monitor: %s', e)
 
-            # Small sleep to avoid hogging the CPU
-            await uasyncio.sleep(0.01)  # 10ms polling interval
+            await uasyncio.sleep_ms(self.poll_ms)
 
     def stop(self):
         """Stop the touch sensor monitoring."""
         self._running = False
+        if self._edges is not None:
+            self._edges.wake()
         self.logger.info('Stopped touch sensor monitoring')
 
     @staticmethod
@@ -259,3 +376,83 @@ class CapacitiveTouchSensor:
 
         print('Test complete.')
         return results
+
+
+class TouchPadSensor(CapacitiveTouchSensor):
+    """
+    Capacitive touch using the ESP32's built-in touch pads instead of a TTP223 module.
+
+    TouchPad.read() drops when the pad is touched. initialize() calibrates a baseline
+    of the untouched reading, which is then tracked with a slow fixed-point moving
+    average while released, so the touch threshold follows temperature and humidity
+    drift. Only the original ESP32 has touch pads, the ESP32-C3 does not.
+    """
+
+    TOUCH_PINS = (0, 2, 4, 12, 13, 14, 15, 27, 32, 33)
+    _FRACTION_BITS = 4
+
+    def __init__(self, pin, sensitivity=10, drift_shift=6, calibration_samples=16, **kwargs):
+        """
+        Initialize an ESP32 touch pad sensor.
+
+        Args:
+            pin: A touch capable GPIO pin number, see TOUCH_PINS
+            sensitivity: Drop below the baseline in percent that counts as touched
+            drift_shift: Baseline tracking speed, each released reading moves the
+                baseline by 1/2**drift_shift of the difference
+            calibration_samples: Number of readings averaged by initialize()
+            **kwargs: Debounce and callback options of CapacitiveTouchSensor
+        """
+        if pin not in self.TOUCH_PINS:
+            raise ValueError(f'Pin {pin} is not touch capable, use one of {self.TOUCH_PINS}')
+        if kwargs.get('use_irq'):
+            raise ValueError('Touch pads do not raise pin IRQs, poll them with monitor()')
+
+        from machine import TouchPad
+
+        super().__init__(pin, pull_down=False, **kwargs)
+        self.touch_pad = TouchPad(self.pin)
+        self.sensitivity = sensitivity
+        self.drift_shift = drift_shift
+        self.calibration_samples = calibration_samples
+        self.threshold = 0
+        self._baseline = 0  # Fixed point with _FRACTION_BITS fractional bits
+
+    @property
+    def baseline(self):
+        return (self._baseline + (1 << (self._FRACTION_BITS - 1))) >> self._FRACTION_BITS
+
+    def _update_threshold(self):
+        self.threshold = self.baseline * (100 - self.sensitivity) // 100
+
+    async def initialize(self):
+        """Calibrate the untouched baseline, the pad must not be touched meanwhile"""
+        total = 0
+        for _ in range(self.calibration_samples):
+            total += self.touch_pad.read()
+            await uasyncio.sleep_ms(5)
+        self._baseline = (total << self._FRACTION_BITS) // self.calibration_samples
+        self._update_threshold()
+        self.logger.info('Calibrated baseline %d, threshold %d', self.baseline, self.threshold)
+
+    def is_touched(self):
+        value = self.touch_pad.read()
+        if value < self.threshold:
+            return True
+
+        if not self.touched:
+            self._baseline += ((value << self._FRACTION_BITS) - self._baseline) >> self.drift_shift
+            self._update_threshold()
+        return False
+
+    def enable_wake(self):
+        """Wake from deep sleep when the pad is touched"""
+        import esp32
+
+        self.touch_pad.config(self.threshold)
+        esp32.wake_on_touch(True)
+
+    async def monitor(self):
+        if not self._baseline:
+            await self.initialize()
+        await super().monitor()
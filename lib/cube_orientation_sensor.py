@@ -1,5 +1,12 @@
+import struct
+import time
+from array import array
 from enum import Enum
 
+import uasyncio
+from edge_capture import EdgeCapture
+from logger import Logger
+from machine import Pin
 from micropython import const
 
 
@@ -12,41 +19,236 @@ class CubeSide(Enum):
     BACK = const('back')
 
 
+# Side -> (axis index, sign of the axis reading when that side faces up)
+_SIDE_AXES = {
+    CubeSide.RIGHT: (0, 1),
+    CubeSide.LEFT: (0, -1),
+    CubeSide.FRONT: (1, 1),
+    CubeSide.BACK: (1, -1),
+    CubeSide.TOP: (2, 1),
+    CubeSide.BOTTOM: (2, -1),
+}
+
+
 class CubeOrientationSensor:
+    """
+    Reads which side of the cube faces up from an MPU6050 accelerometer.
+
+    get_cube_side() is a one-shot reading. monitor() samples every sample_ms and
+    smooths the vector with an integer low-pass filter (each sample moves the filtered
+    value by 1/2**filter_shift of the difference). A new side must beat the current one
+    by hysteresis raw counts (16384 = 1 g), so tilts near 45 degrees do not flicker,
+    and is only reported through on_side_change once the cube has settled: no sample
+    deviated from the filtered vector by more than motion_threshold for settle_ms.
+
+    With int_pin wired to the MPU6050 INT output, the sensor samples into its own FIFO
+    and raises INT on motion. monitor() then drains the FIFO in one burst every
+    drain_ms while the cube moves, and once settled sleeps on the pin edge instead of
+    polling. enable_wake() lets the same pin wake the MCU from deep sleep (ext0 is not
+    available on the ESP32-C3, use a pin that supports deep sleep wake there).
+
+    Shake and tap detection run on the same sample stream. A shake is reported when
+    the motion energy (deviation from the filtered vector) averaged over the last
+    shake_window samples exceeds shake_level. A tap is a burst of jerks (changes between
+    consecutive samples above tap_threshold) no longer than tap_max_ms, with no other
+    jerk within tap_quiet_ms before or after it, so shakes and tumbles do not register
+    as taps.
+    """
+
+    SMPLRT_DIV = const(0x19)
+    CONFIG = const(0x1A)
+    ACCEL_CONFIG = const(0x1C)
+    MOT_THR = const(0x1F)
+    MOT_DUR = const(0x20)
+    FIFO_EN = const(0x23)
+    INT_PIN_CFG = const(0x37)
+    INT_ENABLE = const(0x38)
+    INT_STATUS = const(0x3A)
+    USER_CTRL = const(0x6A)
+    FIFO_COUNTH = const(0x72)
+    FIFO_R_W = const(0x74)
     PWR_MGMT_1 = const(0x6B)
     ACCEL_XOUT_H = const(0x3B)
     ACCEL_YOUT_H = const(0x3D)
     ACCEL_ZOUT_H = const(0x3F)
+    ACCEL_BYTES = const(6)
+    MOTION_BYTES = const(14)  # accel, temperature and gyro registers are contiguous
+
+    # Register bits
+    DLPF_CFG_1 = const(0x01)  # 188 Hz low-pass, sample rate base becomes 1 kHz
+    ACCEL_HPF_5HZ = const(0x01)  # high-pass filter feeding motion detection
+    LATCH_INT_EN = const(0x20)
+    INT_RD_CLEAR = const(0x10)
+    MOT_EN = const(0x40)
+    FIFO_OFLOW = const(0x10)
+    MOT_INT = const(0x40)
+    ACCEL_FIFO_EN = const(0x08)
+    USER_FIFO_EN = const(0x40)
+    USER_FIFO_RESET = const(0x04)
+
+    def __init__(
+        self,
+        i2c,
+        addr=None,
+        sample_ms=20,
+        filter_shift=2,
+        hysteresis=2048,
+        motion_threshold=3000,
+        settle_ms=200,
+        int_pin=None,
+        motion_mg=40,
+        motion_duration_ms=2,
+        fifo_samples=16,
+        shake_window=16,
+        shake_level=6000,
+        shake_cooldown_ms=1000,
+        tap_threshold=12000,
+        tap_max_ms=40,
+        tap_quiet_ms=150,
+        debug=False,
+    ):
+        if shake_window < 2 or shake_window & (shake_window - 1):
+            raise ValueError('Shake window must be a power of two')
 
-    def __init__(self, i2c, addr=None):
         self.i2c = i2c
         self.addr = addr if addr is not None else const(0x68)
+        self.sample_ms = sample_ms
+        self.filter_shift = filter_shift
+        self.hysteresis = hysteresis
+        self.motion_threshold = motion_threshold
+        self.settle_ms = settle_ms
+        self.logger = Logger(prefix='CubeOrientationSensor', debug=debug)
+
+        # Preallocated so a sample is one I2C transaction without allocating a buffer
+        self._accel_buf = bytearray(self.ACCEL_BYTES)
+        self._motion_buf = bytearray(self.MOTION_BYTES)
+
+        # Tracking state of monitor()
+        self.side = None
+        self.settled = False
+        self._filtered = array('l', (0, 0, 0))
+        self._last_motion_ms = 0
+        self._running = False
+
+        self._on_side_change = None
+        self._on_moving = None
+        self._on_settled = None
+        self._on_shake = None
+        self._on_tap = None
+
+        # Shake and tap detection over fixed-size integer buffers
+        self.shake_level = shake_level
+        self.shake_cooldown_ms = shake_cooldown_ms
+        self.tap_threshold = tap_threshold
+        self.tap_max_ms = tap_max_ms
+        self.tap_quiet_ms = tap_quiet_ms
+        self._deviation = 0
+        self._energy = array('l', [0] * shake_window)
+        self._energy_mask = shake_window - 1
+        self._energy_idx = 0
+        self._energy_sum = 0
+        self._previous = array('l', (0, 0, 0))
+        self._last_shake_ms = None
+        self._last_jerk_ms = None
+        self._tap_ms = None  # start of a jerk burst waiting to be confirmed as a tap
+
+        # Motion interrupt and FIFO mode
+        self.motion_mg = motion_mg
+        self.motion_duration_ms = motion_duration_ms
+        self.drain_ms = sample_ms * fifo_samples // 2
+        self.fifo_overflows = 0
+        self._fifo_buf = bytearray(fifo_samples * self.ACCEL_BYTES)
+        self._fifo_view = memoryview(self._fifo_buf)
+        self._count_buf = bytearray(2)
+        self._reg = bytearray(1)
+        self.int_pin = None
+        self._edges = None
+        if int_pin is not None:
+            self.int_pin = Pin(int_pin, Pin.IN)
+            self._edges = EdgeCapture(self.int_pin)
+
         self.init_sensor()
 
     def init_sensor(self):
         self.i2c.writeto_mem(self.addr, self.PWR_MGMT_1, bytes([0]))
+        if self.int_pin is not None:
+            self.enable_fifo()
+            self.enable_motion_interrupt(self.motion_mg, self.motion_duration_ms)
 
-    def _read_raw_accel(self):
-        x = self.i2c.readfrom_mem(self.addr, self.ACCEL_XOUT_H, 2)
-        y = self.i2c.readfrom_mem(self.addr, self.ACCEL_YOUT_H, 2)
-        z = self.i2c.readfrom_mem(self.addr, self.ACCEL_ZOUT_H, 2)
+    def _write_reg(self, reg, value):
+        self._reg[0] = value
+        self.i2c.writeto_mem(self.addr, reg, self._reg)
 
-        x_val = int.from_bytes(x, 'big')
-        y_val = int.from_bytes(y, 'big')
-        z_val = int.from_bytes(z, 'big')
+    def _read_reg(self, reg):
+        self.i2c.readfrom_mem_into(self.addr, reg, self._reg)
+        return self._reg[0]
 
-        if x_val > 0x7FFF:
-            x_val -= 0x10000
-        if y_val > 0x7FFF:
-            y_val -= 0x10000
-        if z_val > 0x7FFF:
-            z_val -= 0x10000
+    def enable_fifo(self):
+        """Sample the accelerometer into the FIFO every sample_ms (1 to 256 ms)"""
+        self._write_reg(self.CONFIG, self.DLPF_CFG_1)
+        self._write_reg(self.SMPLRT_DIV, self.sample_ms - 1)
+        self._write_reg(self.FIFO_EN, self.ACCEL_FIFO_EN)
+        self.reset_fifo()
 
-        return x_val, y_val, z_val
+    def reset_fifo(self):
+        self._write_reg(self.USER_CTRL, self.USER_FIFO_RESET)
+        self._write_reg(self.USER_CTRL, self.USER_FIFO_EN)
 
-    def get_cube_side(self) -> CubeSide:
-        x, y, z = self._read_raw_accel()
+    def enable_motion_interrupt(self, threshold_mg, duration_ms):
+        """
+        Raise INT when acceleration changes by more than threshold_mg for duration_ms.
+
+        INT is latched high until INT_STATUS or any other register is read.
+        """
+        self._write_reg(self.ACCEL_CONFIG, self.ACCEL_HPF_5HZ)
+        self._write_reg(self.MOT_THR, min(255, threshold_mg // 2))  # 2 mg per LSB
+        self._write_reg(self.MOT_DUR, min(255, duration_ms))
+        self._write_reg(self.INT_PIN_CFG, self.LATCH_INT_EN | self.INT_RD_CLEAR)
+        self._write_reg(self.INT_ENABLE, self.MOT_EN)
+
+    def read_int_status(self):
+        """Returns INT_STATUS, which also clears the latched interrupt"""
+        return self._read_reg(self.INT_STATUS)
+
+    def fifo_count(self):
+        self.i2c.readfrom_mem_into(self.addr, self.FIFO_COUNTH, self._count_buf)
+        return (self._count_buf[0] << 8) | self._count_buf[1]
+
+    def enable_wake(self):
+        """
+        Wake from deep sleep when the motion interrupt raises the INT pin.
+
+        Uses ext0 wake on the ESP32 and GPIO wake on chips without ext0 (ESP32-C3).
+
+        Raises:
+            ValueError: If the sensor has no INT pin
+            NotImplementedError: If the board's esp32 module has neither wake source
+        """
+        import esp32
+
+        if self.int_pin is None:
+            raise ValueError('Motion wake needs the INT pin, pass int_pin')
+        self.read_int_status()
+        if hasattr(esp32, 'wake_on_ext0'):
+            esp32.wake_on_ext0(pin=self.int_pin, level=esp32.WAKEUP_ANY_HIGH)
+        elif hasattr(esp32, 'wake_on_gpio'):
+            esp32.wake_on_gpio(pins=(self.int_pin,), level=esp32.WAKEUP_ANY_HIGH)
+        else:
+            import os
 
+            raise NotImplementedError(f'No GPIO deep sleep wake on {os.uname().machine}')
+
+    def _read_raw_accel(self):
+        self.i2c.readfrom_mem_into(self.addr, self.ACCEL_XOUT_H, self._accel_buf)
+        return struct.unpack_from('>hhh', self._accel_buf)
+
+    def read_motion(self):
+        """Returns raw (ax, ay, az, temp, gx, gy, gz) from a single 14-byte burst read"""
+        self.i2c.readfrom_mem_into(self.addr, self.ACCEL_XOUT_H, self._motion_buf)
+        return struct.unpack_from('>hhhhhhh', self._motion_buf)
+
+    @staticmethod
+    def _side_for(x, y, z):
         abs_values = [abs(x), abs(y), abs(z)]
         max_index = abs_values.index(max(abs_values))
 
@@ -56,3 +258,228 @@ class CubeOrientationSensor:
             return CubeSide.FRONT if y > 0 else CubeSide.BACK
         else:  # Z-axis
             return CubeSide.TOP if z > 0 else CubeSide.BOTTOM
+
+    def get_cube_side(self) -> CubeSide:
+        x, y, z = self._read_raw_accel()
+        return self._side_for(x, y, z)
+
+    def on_side_change(self, callback):
+        """
+        Register a callback for a stable change of the upward side.
+
+        Args:
+            callback: Function called with (old_side, new_side)
+        """
+        self._on_side_change = callback
+
+    def on_moving(self, callback):
+        """Register a callback for when the settled cube starts moving"""
+        self._on_moving = callback
+
+    def on_settled(self, callback):
+        """Register a callback for when the cube comes to rest"""
+        self._on_settled = callback
+
+    def on_shake(self, callback):
+        """Register a callback for when the cube is shaken"""
+        self._on_shake = callback
+
+    def on_tap(self, callback):
+        """Register a callback for a single tap on the cube"""
+        self._on_tap = callback
+
+    def _component(self, side):
+        axis, sign = _SIDE_AXES[side]
+        return sign * self._filtered[axis]
+
+    def _sample(self, x, y, z, now):
+        """
+        Feed a raw reading into the filter and face tracking.
+
+        Args:
+            x, y, z: Raw accelerometer reading
+            now: Time of the reading in ticks_ms
+
+        Returns:
+            The previous side if a stable side change happened, otherwise None
+        """
+        filtered = self._filtered
+        if self.side is None:
+            filtered[0], filtered[1], filtered[2] = x, y, z
+            self._previous[0], self._previous[1], self._previous[2] = x, y, z
+            self.side = self._side_for(x, y, z)
+            self._last_motion_ms = now
+            self._deviation = 0
+            return None
+
+        deviation = abs(x - filtered[0]) + abs(y - filtered[1]) + abs(z - filtered[2])
+        self._deviation = deviation
+        shift = self.filter_shift
+        filtered[0] += (x - filtered[0]) >> shift
+        filtered[1] += (y - filtered[1]) >> shift
+        filtered[2] += (z - filtered[2]) >> shift
+
+        if deviation > self.motion_threshold:
+            self._last_motion_ms = now
+            self.settled = False
+            return None
+        if time.ticks_diff(now, self._last_motion_ms) < self.settle_ms:
+            return None
+        self.settled = True
+
+        candidate = self._side_for(filtered[0], filtered[1], filtered[2])
+        if candidate == self.side:
+            return None
+        if self._component(candidate) - self._component(self.side) <= self.hysteresis:
+            return None
+        old, self.side = self.side, candidate
+        return old
+
+    def _detect(self, x, y, z, now):
+        """
+        Update shake and tap detection with a sample already fed to _sample().
+
+        Returns:
+            tuple: (shake, tap) booleans for events completed by this sample
+        """
+        previous = self._previous
+        jerk = abs(x - previous[0]) + abs(y - previous[1]) + abs(z - previous[2])
+        previous[0], previous[1], previous[2] = x, y, z
+
+        # Running sum over the energy ring buffer
+        idx = self._energy_idx
+        self._energy_sum += self._deviation - self._energy[idx]
+        self._energy[idx] = self._deviation
+        self._energy_idx = (idx + 1) & self._energy_mask
+
+        shake = False
+        if self._energy_sum > self.shake_level * len(self._energy) and (
+            self._last_shake_ms is None
+            or time.ticks_diff(now, self._last_shake_ms) >= self.shake_cooldown_ms
+        ):
+            self._last_shake_ms = now
+            self._tap_ms = None
+            shake = True
+
+        if jerk > self.tap_threshold:
+            last = self._last_jerk_ms
+            if last is None or time.ticks_diff(now, last) >= self.tap_quiet_ms:
+                self._tap_ms = None if shake else now
+            elif self._tap_ms is not None and time.ticks_diff(now, self._tap_ms) > self.tap_max_ms:
+                self._tap_ms = None  # jerks going on for too long are a tumble or a shake
+            self._last_jerk_ms = now
+            return shake, False
+
+        tap = False
+        if (
+            self._tap_ms is not None
+            and time.ticks_diff(now, self._last_jerk_ms) >= self.tap_quiet_ms
+        ):
+            self._tap_ms = None
+            tap = True
+        return shake, tap
+
+    async def _run_callback(self, callback, *args):
+        if callback is None:
+            return
+        try:
+            result = callback(*args)
+            if hasattr(result, 'send'):
+                await result
+        except Exception as e:
+            self.logger.info('Error in callback: %s', e)
+
+    async def _process(self, x, y, z, now):
+        was_settled = self.settled
+        old = self._sample(x, y, z, now)
+        shake, tap = self._detect(x, y, z, now)
+        if shake:
+            self.logger.info('Shake')
+            await self._run_callback(self._on_shake)
+        if tap:
+            self.logger.info('Tap')
+            await self._run_callback(self._on_tap)
+        if self.settled != was_settled:
+            await self._run_callback(self._on_settled if self.settled else self._on_moving)
+        if old is not None:
+            self.logger.info('Side changed: %s -> %s', old.value, self.side.value)
+            await self._run_callback(self._on_side_change, old, self.side)
+
+    async def drain_fifo(self):
+        """
+        Read every buffered sample in one burst and feed it to the tracking.
+
+        Returns:
+            int: Number of samples processed
+        """
+        if self.read_int_status() & self.FIFO_OFLOW:
+            # Samples are no longer aligned to axis boundaries
+            self.fifo_overflows += 1
+            self.reset_fifo()
+            return 0
+
+        nbytes = min(self.fifo_count(), len(self._fifo_buf))
+        count = nbytes // self.ACCEL_BYTES
+        if not count:
+            return 0
+        self.i2c.readfrom_mem_into(
+            self.addr, self.FIFO_R_W, self._fifo_view[: count * self.ACCEL_BYTES]
+        )
+
+        # The newest sample was taken now, older ones sample_ms apart
+        now = time.ticks_ms()
+        for i in range(count):
+            x, y, z = struct.unpack_from('>hhh', self._fifo_buf, i * self.ACCEL_BYTES)
+            await self._process(x, y, z, time.ticks_add(now, (i + 1 - count) * self.sample_ms))
+        return count
+
+    async def _monitor_fifo(self):
+        self._edges.start()
+        self.reset_fifo()
+        while self._running:
+            try:
+                if self.settled and not self._edges.pending():
+                    # At rest: sleep until the motion interrupt fires
+                    await self._edges.wait()
+                    if not self._running:
+                        break
+                    # Drop the samples buffered at rest, the current reading still
+                    # holds the jolt that raised the interrupt
+                    self.reset_fifo()
+                    x, y, z = self._read_raw_accel()
+                    await self._process(x, y, z, time.ticks_ms())
+                else:
+                    await uasyncio.sleep_ms(self.drain_ms)
+                while self._edges.pending():
+                    self._edges.pop()
+                await self.drain_fifo()
+            except Exception as e:
+                self.logger.info('Error in monitor: %s', e)
+                await uasyncio.sleep(0.1)
+        self._edges.stop()
+
+    async def monitor(self):
+        """Sample the accelerometer and report side changes until stop() is called"""
+        self.logger.info('Starting orientation monitoring every %d ms', self.sample_ms)
+        self._running = True
+        self.side = None
+        self.settled = False
+
+        if self._edges is not None:
+            await self._monitor_fifo()
+            return
+
+        while self._running:
+            try:
+                x, y, z = self._read_raw_accel()
+                await self._process(x, y, z, time.ticks_ms())
+            except Exception as e:
+                self.logger.info('Error in monitor: %s', e)
+
+            await uasyncio.sleep_ms(self.sample_ms)
+
+    def stop(self):
+        """Stop orientation monitoring"""
+        self._running = False
+        if self._edges is not None:
+            self._edges.wake()
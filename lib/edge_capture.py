@@ -0,0 +1,62 @@
+import time
+from array import array
+
+import uasyncio
+from machine import Pin
+
+
+class EdgeCapture:
+    """
+    Records pin edges from an IRQ into a preallocated ring buffer.
+
+    The IRQ handler only stores the ticks_us timestamp and pin level and sets a flag,
+    so debouncing and callbacks run later in the task awaiting wait().
+    """
+
+    def __init__(self, pin, size=16):
+        if size < 2 or size & (size - 1):
+            raise ValueError('Edge buffer size must be a power of two')
+
+        self.pin = pin
+        self._ticks = array('L', [0] * size)
+        self._levels = bytearray(size)
+        self._mask = size - 1
+        self._head = 0
+        self._tail = 0
+        self._flag = uasyncio.ThreadSafeFlag()
+        self.overflows = 0
+
+    def _handler(self, pin):
+        head = self._head
+        next_head = (head + 1) & self._mask
+        if next_head == self._tail:
+            self.overflows += 1
+            return
+        self._ticks[head] = time.ticks_us()
+        self._levels[head] = pin.value()
+        self._head = next_head
+        self._flag.set()
+
+    def start(self):
+        self._head = self._tail = 0
+        self.pin.irq(handler=self._handler, trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING)
+
+    def stop(self):
+        self.pin.irq(handler=None)
+        self._flag.set()
+
+    def pending(self):
+        return self._head != self._tail
+
+    def pop(self):
+        """Returns the oldest (ticks_us, level) edge, call only when pending()"""
+        tail = self._tail
+        edge = (self._ticks[tail], self._levels[tail])
+        self._tail = (tail + 1) & self._mask
+        return edge
+
+    def wake(self):
+        self._flag.set()
+
+    async def wait(self):
+        await self._flag.wait()
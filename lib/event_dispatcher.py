@@ -0,0 +1,136 @@
+import uasyncio
+from logger import Logger
+
+
+class EventChannel:
+    """
+    Bounded queue of pending callbacks for one input.
+
+    Callbacks of a channel never run concurrently, so handlers see events in order.
+    """
+
+    def __init__(self, dispatcher, policy, size):
+        self._dispatcher = dispatcher
+        self.policy = policy
+        self.size = size
+        self._callbacks = [None] * size
+        self._args = [None] * size
+        self._head = 0
+        self._count = 0
+        self._busy = False
+        self.dropped = 0
+
+    def pending(self):
+        return self._count
+
+    def post(self, callback, args=()):
+        """Queue callback(*args) according to the channel policy, returns False if dropped"""
+        if self.policy == EventDispatcher.DROP and (self._busy or self._count):
+            self.dropped += 1
+            return False
+
+        if self.policy == EventDispatcher.COALESCE:
+            for i in range(self._count):
+                idx = (self._head + i) % self.size
+                if self._callbacks[idx] is callback:
+                    self._args[idx] = args
+                    return True
+
+        if self._count == self.size:
+            self.dropped += 1
+            return False
+
+        idx = (self._head + self._count) % self.size
+        self._callbacks[idx] = callback
+        self._args[idx] = args
+        self._count += 1
+        self._dispatcher._wake.set()
+        return True
+
+    def _pop(self):
+        idx = self._head
+        callback = self._callbacks[idx]
+        args = self._args[idx]
+        self._callbacks[idx] = None
+        self._args[idx] = None
+        self._head = (idx + 1) % self.size
+        self._count -= 1
+        return callback, args
+
+
+class EventDispatcher:
+    """
+    Runs input callbacks on a fixed pool of worker tasks.
+
+    Components post callbacks to their channel and return to sampling immediately,
+    so a slow handler no longer stalls the monitor() loop that detected the event.
+    Channel policies decide what happens when events arrive faster than handled:
+    - DROP: ignore events while a handler of the channel is queued or running
+    - COALESCE: replace the arguments of an already queued identical callback
+    - QUEUE: keep events in order until the channel is full, then drop new ones
+    """
+
+    DROP = 'drop'
+    COALESCE = 'coalesce'
+    QUEUE = 'queue'
+
+    def __init__(self, workers=2, debug=False):
+        self.workers = workers
+        self._channels = []
+        self._next = 0
+        self._running = False
+        self._wake = uasyncio.Event()
+        self.logger = Logger(prefix='EventDispatcher', debug=debug)
+
+    def channel(self, policy=QUEUE, size=4):
+        if policy not in (self.DROP, self.COALESCE, self.QUEUE):
+            raise ValueError(f'Unknown dispatch policy: {policy}')
+        if size < 1:
+            raise ValueError('Channel size must be at least 1')
+
+        channel = EventChannel(self, policy, size)
+        self._channels.append(channel)
+        return channel
+
+    def _next_ready(self):
+        count = len(self._channels)
+        for i in range(count):
+            channel = self._channels[(self._next + i) % count]
+            if channel._count and not channel._busy:
+                self._next = (self._next + i + 1) % count
+                return channel
+        return None
+
+    async def _run(self, channel):
+        callback, args = channel._pop()
+        channel._busy = True
+        try:
+            await uasyncio.create_task(callback(*args))
+        except Exception as e:
+            self.logger.info('Error in callback: %s', e)
+        finally:
+            channel._busy = False
+
+    async def run_pending(self):
+        """Run queued callbacks until every channel is empty or busy"""
+        channel = self._next_ready()
+        while channel is not None:
+            await self._run(channel)
+            channel = self._next_ready()
+
+    async def _worker(self):
+        while self._running:
+            channel = self._next_ready()
+            if channel is None:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            await self._run(channel)
+
+    async def monitor(self):
+        self._running = True
+        await uasyncio.gather(*(self._worker() for _ in range(self.workers)))
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
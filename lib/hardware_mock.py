@@ -9,14 +9,20 @@ class MockPWM:
         self._freq = 0
         self._duty = 0
 
+    def _trace(self, name, value):
+        if MockPin.trace is not None:
+            MockPin.trace.record(f'pwm_{getattr(self.pin, "id", self.pin)}_{name}', value)
+
     def freq(self, value=None):
         if value is not None:
             self._freq = value
+            self._trace('freq', value)
         return self._freq
 
     def duty_u16(self, value=None):
         if value is not None:
             self._duty = value
+            self._trace('duty', value)
         return self._duty
 
 
@@ -38,8 +44,117 @@ class MockRTC:
         return self._datetime
 
 
+class MockTouchPad:
+    def __init__(self, pin):
+        self.pin = pin
+        self._value = 600
+        self.threshold = None
+
+    def read(self):
+        return self._value
+
+    def config(self, value):
+        self.threshold = value
+
+
+class MockTimer:
+    """
+    machine.Timer that only fires when a test asks it to.
+
+    fire() calls the callback directly, run_for() fires every period elapsed in the
+    given time and moves the mock clock along, so traces get real timestamps.
+    """
+
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=0, **kwargs):
+        self.id = id
+        self.mode = None
+        self.period = None
+        self.callback = None
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, mode=PERIODIC, period=None, freq=None, callback=None):
+        if freq is not None:
+            period = 1000 / freq
+        self.mode = mode
+        self.period = -1 if period is None else period
+        self.callback = callback
+
+    def deinit(self):
+        self.callback = None
+
+    @property
+    def active(self):
+        return self.callback is not None
+
+    def fire(self, count=1):
+        for _ in range(count):
+            if self.callback is None:
+                return
+            callback = self.callback
+            if self.mode == self.ONE_SHOT:
+                self.callback = None
+            callback(self)
+
+    def run_for(self, duration_ms):
+        """Fire the callback once per period in duration_ms of mock time"""
+        import time_mock
+
+        elapsed = 0
+        while self.callback is not None and elapsed + self.period <= duration_ms:
+            time_mock.advance_time(self.period / 1000)
+            elapsed += self.period
+            self.fire()
+        time_mock.advance_time((duration_ms - elapsed) / 1000)
+
+
+_i2c_memory = {}
+
+
+class MockI2C:
+    """I2C bus with register memory per device address, shared by all instances"""
+
+    def __init__(self, id=0, scl=None, sda=None, freq=400000):
+        self.id = id
+        self.scl = scl
+        self.sda = sda
+        self.freq = freq
+
+    @classmethod
+    def registers(cls, addr):
+        memory = _i2c_memory.get(addr)
+        if memory is None:
+            memory = _i2c_memory[addr] = bytearray(256)
+        return memory
+
+    @classmethod
+    def reset(cls):
+        _i2c_memory.clear()
+
+    def scan(self):
+        return sorted(_i2c_memory)
+
+    def writeto_mem(self, addr, memaddr, buf):
+        self.registers(addr)[memaddr : memaddr + len(buf)] = buf
+
+    def readfrom_mem(self, addr, memaddr, nbytes):
+        return bytes(self.registers(addr)[memaddr : memaddr + nbytes])
+
+    def readfrom_mem_into(self, addr, memaddr, buf):
+        buf[:] = self.registers(addr)[memaddr : memaddr + len(buf)]
+
+
 # Mock machine module
 mock_machine = MagicMock()
 mock_machine.RTC = MockRTC
 mock_machine.Pin = MockPin
 mock_machine.PWM = MockPWM
+mock_machine.TouchPad = MockTouchPad
+mock_machine.I2C = MockI2C
+mock_machine.Timer = MockTimer
+
+# Mock esp32 module
+mock_esp32 = MagicMock()
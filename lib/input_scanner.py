@@ -0,0 +1,105 @@
+import time
+
+import machine
+import uasyncio
+from logger import Logger
+from micropython import const
+
+_STABLE = const(0x80)
+_PRIMED = const(0x40)
+_COUNT = const(0x3F)
+
+
+class InputScanner:
+    """
+    Samples many inputs from a single task instead of one monitor() per input.
+
+    Each registered input (Button, DebouncedButton, CapacitiveTouchSensor) is
+    debounced with one state byte: bit 7 is the stable level, bit 6 marks the input
+    as primed and the low bits count consecutive samples disagreeing with the stable
+    level. Once debounce_samples samples agree, the input's _update() is called.
+
+    Inputs that integrate readings themselves (CapacitiveTouchSensor) are fed every
+    raw sample through _sample() and skip the scanner's debounce.
+
+    With port_reg set (e.g. PinConfigEsp32C3.GPIO_IN_REG) all inputs are read from a
+    single GPIO input register load per scan instead of one pin.value() call each.
+    """
+
+    def __init__(self, interval_ms=5, debounce_samples=3, port_reg=None, debug=False):
+        if not 1 <= debounce_samples <= _COUNT:
+            raise ValueError(f'debounce_samples must be between 1 and {_COUNT}')
+
+        self.interval_ms = interval_ms
+        self.debounce_samples = debounce_samples
+        self.port_reg = port_reg
+        self._inputs = []
+        self._pins = []
+        self._bits = bytearray()
+        self._inverts = bytearray()
+        self._raw = bytearray()
+        self._states = bytearray()
+        self._running = False
+        self.logger = Logger(prefix='InputScanner', debug=debug)
+
+    def add(self, component):
+        """Register an input, it must not run its own monitor() afterwards"""
+        if getattr(component, 'touch_pad', None) is not None:
+            raise ValueError('Touch pads are analog inputs, poll them with monitor()')
+
+        pin_num = component.pin_num
+        if self.port_reg is not None and not 0 <= pin_num < 32:
+            raise ValueError(f'Pin {pin_num} is not in the GPIO input register')
+
+        self._inputs.append(component)
+        self._pins.append(component.pin)
+        self._bits.append(pin_num if self.port_reg is not None else 0)
+        self._inverts.append(0 if component.active_high else 1)
+        self._raw.append(1 if hasattr(component, '_sample') else 0)
+        self._states.append(0)
+        return component
+
+    async def _scan_once(self):
+        now = time.ticks_us()
+        now_ms = time.ticks_ms()
+        port = machine.mem32[self.port_reg] if self.port_reg is not None else 0
+        states = self._states
+
+        for i in range(len(self._inputs)):
+            level = self._pins[i].value() if self.port_reg is None else port >> self._bits[i]
+            active = (level ^ self._inverts[i]) & 1
+
+            if self._raw[i]:
+                if self._inputs[i]._sample(bool(active), now_ms):
+                    await self._inputs[i]._notify()
+                continue
+
+            state = states[i]
+
+            if not state & _PRIMED:
+                states[i] = _PRIMED | (active << 7)
+                await self._inputs[i]._update(bool(active), now)
+                continue
+
+            if active == state >> 7:
+                states[i] = state & (_STABLE | _PRIMED)
+                continue
+
+            if (state & _COUNT) + 1 < self.debounce_samples:
+                states[i] = state + 1
+                continue
+
+            states[i] = _PRIMED | (active << 7)
+            await self._inputs[i]._update(bool(active), now)
+
+    async def monitor(self):
+        self._running = True
+        while self._running:
+            try:
+                await self._scan_once()
+            except Exception as e:
+                self.logger.info('Error in monitor: %s', e)
+            await uasyncio.sleep_ms(self.interval_ms)
+
+    def stop(self):
+        self._running = False
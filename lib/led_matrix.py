@@ -440,7 +440,7 @@ class LedMatrix:
         print(f"Power toggled: {'on' if self.is_powered else 'off'}")
 
         if not self.is_powered:
-            self.stop_animation()
+            # Keep monitor() alive, it idles while unpowered
             self.clear()
         else:
             self.cycle_animation()
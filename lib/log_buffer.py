@@ -0,0 +1,181 @@
+import os
+import time
+from array import array
+
+import uasyncio
+from logger import Logger
+from micropython import const
+
+_WORDS = const(4)  # ticks_ms, header, arg0, arg1
+_MAX_ARGS = const(2)
+_MAX_LOGGERS = const(256)
+_MAX_MESSAGES = const(65536)
+_INT_MIN = const(-0x80000000)
+_INT_MAX = const(0x7FFFFFFF)
+
+
+def _fits(value):
+    return isinstance(value, int) and _INT_MIN <= value <= _INT_MAX
+
+
+class LogBuffer:
+    """
+    Binary log recorder for deployed blocks.
+
+    Each message is stored as four 32-bit words in a preallocated ring buffer:
+    ticks_ms, a header packing message id, logger id, level, argument count and a
+    mask of non-integer arguments, and up to two integer arguments. Format strings
+    and logger prefixes are kept once in a table file next to the log, so recording
+    costs two dict lookups and a few integer stores. The last logger and message id
+    are reserved for entries recorded after their table filled up.
+
+    monitor() spills full pages to flash; when the buffer wraps before a page was
+    spilled the oldest page is dropped and counted in lost. Decode the files on the
+    host with scripts/decode_log.py.
+    """
+
+    BOOT_PREFIX = '-'
+    BOOT_MESSAGE = '--- boot ---'
+
+    def __init__(self, path='log.bin', page_records=16, pages=4, max_bytes=65536, spill_ms=1000):
+        capacity = page_records * pages
+        if capacity & (capacity - 1):
+            raise ValueError('page_records * pages must be a power of two')
+
+        self.path = path
+        self.table_path = path + '.tab'
+        self.page_records = page_records
+        self.max_bytes = max_bytes
+        self.spill_ms = spill_ms
+        self.capacity = capacity
+        self.lost = 0
+        self._buf = array('i', [0] * (capacity * _WORDS))
+        self._mask = capacity - 1
+        self._head = 0
+        self._tail = 0
+        self._pending = 0
+        self._loggers = {}
+        self._messages = {}
+        self._table_dirty = False
+        self._running = False
+
+        self._load_table()
+        self.log(self.BOOT_PREFIX, Logger.INFO, self.BOOT_MESSAGE, ())
+
+    def _load_table(self):
+        try:
+            with open(self.table_path) as f:
+                for line in f:
+                    kind, ident, text = line.rstrip('\n').split(' ', 2)
+                    table = self._loggers if kind == 'L' else self._messages
+                    table[text] = int(ident)
+        except OSError:
+            pass
+
+    def _id(self, table, key, limit):
+        """Id of key, or limit - 1 once the table is full (reserved, never assigned)"""
+        ident = table.get(key)
+        if ident is None:
+            ident = len(table)
+            if ident >= limit - 1:
+                return limit - 1
+            table[key] = ident
+            self._table_dirty = True
+        return ident
+
+    def record(self, header, arg0=0, arg1=0):
+        if self._pending == self.capacity:
+            self._drop_page()
+
+        i = self._head * _WORDS
+        buf = self._buf
+        buf[i] = time.ticks_ms()
+        buf[i + 1] = header
+        buf[i + 2] = arg0
+        buf[i + 3] = arg1
+        self._head = (self._head + 1) & self._mask
+        self._pending += 1
+
+    def log(self, prefix, level, message, args):
+        logger_id = self._id(self._loggers, prefix, _MAX_LOGGERS)
+        message_id = self._id(self._messages, message, _MAX_MESSAGES)
+        argc = min(len(args), _MAX_ARGS)
+        arg0 = args[0] if argc > 0 else 0
+        arg1 = args[1] if argc > 1 else 0
+        missing = 0
+        if not _fits(arg0):
+            arg0 = 0
+            missing |= 1
+        if not _fits(arg1):
+            arg1 = 0
+            missing |= 2
+        header = message_id | logger_id << 16 | level << 24 | argc << 26 | missing << 28
+        self.record(header, arg0, arg1)
+
+    def pending(self):
+        return self._pending
+
+    def _drop_page(self):
+        self._tail = (self._tail + self.page_records) & self._mask
+        self._pending -= self.page_records
+        self.lost += self.page_records
+
+    def _write(self, f, count):
+        view = memoryview(self._buf)
+        start = self._tail
+        end = min(start + count, self.capacity)
+        f.write(view[start * _WORDS : end * _WORDS])
+        if start + count > end:
+            f.write(view[: (start + count - end) * _WORDS])
+        self._tail = (start + count) & self._mask
+        self._pending -= count
+
+    def _size(self, path):
+        try:
+            return os.stat(path)[6]
+        except OSError:
+            return -1
+
+    def _rotate(self):
+        if self._size(self.path) < self.max_bytes:
+            return
+        old = self.path + '.old'
+        if self._size(old) >= 0:
+            os.remove(old)
+        os.rename(self.path, old)
+
+    def _write_table(self):
+        loggers = sorted(self._loggers.items(), key=lambda item: item[1])
+        messages = sorted(self._messages.items(), key=lambda item: item[1])
+        with open(self.table_path, 'w') as f:
+            for prefix, ident in loggers:
+                f.write(f'L {ident} {prefix}\n')
+            for message, ident in messages:
+                f.write(f'M {ident} {message}\n')
+        self._table_dirty = False
+
+    def spill(self, partial=False):
+        """Write full pages to flash, or every pending record with partial=True"""
+        count = self._pending if partial else self._pending - self._pending % self.page_records
+        if not count:
+            return 0
+
+        if self._table_dirty:
+            self._write_table()
+        self._rotate()
+        with open(self.path, 'ab') as f:
+            self._write(f, count)
+        return count
+
+    def flush(self):
+        return self.spill(partial=True)
+
+    async def monitor(self):
+        self._running = True
+        while self._running:
+            await uasyncio.sleep_ms(self.spill_ms)
+            self.spill()
+
+    def stop(self):
+        self._running = False
+        self.flush()
@@ -2,32 +2,76 @@ import time
 
 
 class Logger:
-    def __init__(self, prefix='', debug=False):
+    """
+    Rate limited REPL logger with lazy formatting.
+
+    Messages are printf-style format strings, e.g. logger.info('Pin %d is %s', pin, value).
+    Arguments are only formatted once the message passed the debug flag, the level and
+    the per-level rate limit, so disabled calls cost no string building or timestamps.
+    Guard expensive argument expressions with enabled_for().
+
+    With a LogBuffer attached (per logger or for all loggers via Logger.buffer) every
+    message at or above the level is also recorded in binary form, regardless of the
+    debug flag and rate limit, so it can stay enabled on deployed blocks.
+    """
+
+    DEBUG = 0
+    INFO = 1
+    ERROR = 2
+
+    buffer = None
+
+    def __init__(self, prefix='', debug=False, level=INFO, buffer=None):
+        if buffer is not None:
+            self.buffer = buffer
         self.debug = debug
         self.prefix = prefix
-        self._last_log = 0
-        self._log_threshold = 0.1  # seconds between logs
+        self.level = level
+        self._last_log = [None, None, None]
+        self._threshold_ms = [100, 100, 100]  # ms between logs per level
+
+    def enabled_for(self, level):
+        return level >= self.level and (self.debug or self.buffer is not None)
+
+    def _log(self, level, message, args):
+        if level < self.level:
+            return
+
+        if self.buffer is not None:
+            self.buffer.log(self.prefix, level, message, args)
 
-    def _log(self, message):
         if not self.debug:
             return
 
-        current_time = time.time()
-        if current_time - self._last_log < self._log_threshold:
+        now = time.ticks_ms()
+        last = self._last_log[level]
+        if last is not None and time.ticks_diff(now, last) < self._threshold_ms[level]:
             return
 
-        self._last_log = current_time
+        self._last_log[level] = now
 
         try:
+            if args:
+                message = message % args
+            if level == self.ERROR:
+                message = 'ERROR: ' + message
             print(f'[{self.prefix}] {message}')
         except Exception:
             pass
 
-    def info(self, message):
-        self._log(message)
+    def log(self, level, message, *args):
+        self._log(level, message, args)
+
+    def info(self, message, *args):
+        self._log(self.INFO, message, args)
 
-    def error(self, message):
-        self._log(f'ERROR: {message}')
+    def error(self, message, *args):
+        self._log(self.ERROR, message, args)
 
-    def set_threshold(self, seconds):
-        self._log_threshold = seconds
+    def set_threshold(self, seconds, level=None):
+        """Set the minimum time between logs, for one level or all levels"""
+        threshold_ms = int(seconds * 1000)
+        if level is None:
+            self._threshold_ms = [threshold_ms, threshold_ms, threshold_ms]
+        else:
+            self._threshold_ms[level] = threshold_ms
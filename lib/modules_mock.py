@@ -0,0 +1,21 @@
+import sys
+
+import bluetooth_mock
+import hardware_mock
+import network_mock
+import time_mock
+import uasyncio_mock
+
+
+def install():
+    """Register the mock MicroPython modules in sys.modules"""
+    mock_micropython = hardware_mock.mock_machine  # reuse machine mock for micropython
+    mock_micropython.const = time_mock.mock_const
+    sys.modules['micropython'] = mock_micropython
+    sys.modules['machine'] = hardware_mock.mock_machine
+    sys.modules['esp32'] = hardware_mock.mock_esp32
+    sys.modules['bluetooth'] = bluetooth_mock.mock_bluetooth
+    sys.modules['network'] = network_mock.mock_network
+    sys.modules['urequests'] = network_mock.mock_urequests
+    sys.modules['uasyncio'] = uasyncio_mock.mock_uasyncio
+    sys.modules['time'] = time_mock.mock_time
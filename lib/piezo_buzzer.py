@@ -1,10 +1,28 @@
+import time
+from array import array
+
 import uasyncio
 from logger import Logger
-from machine import PWM, Pin
+from machine import PWM, Pin, Timer
 
 from lib.piezo_buzzer_types import Duration, Note
 
 
+def compile_song(song):
+    """
+    Compile a list of (note, duration) tuples into a flat array('H') of frequency
+    and duration pairs in Hz and ms, a frequency of 0 is a rest. Compile songs once
+    and keep the array, playing it then allocates nothing per note.
+    """
+    if isinstance(song, array):
+        return song
+    compiled = array('H', bytes(4 * len(song)))
+    for i, (note, duration) in enumerate(song):
+        compiled[2 * i] = int(note)
+        compiled[2 * i + 1] = int(duration)
+    return compiled
+
+
 class PWMWrapper:
     def __init__(self, pin, freq=440):
         self.pin = pin
@@ -22,6 +40,11 @@ class PWMWrapper:
         self._freq = int(value)
         self.pwm.freq(self._freq)
 
+    def set_freq(self, value):
+        """Fast path for timer callbacks, value must already be an int"""
+        self._freq = value
+        self.pwm.freq(value)
+
     @property
     def duty_u16(self):
         return self._duty
@@ -42,6 +65,12 @@ class PiezoBuzzer:
     def __init__(self, pin: int, freq=440):
         self.pwm = PWMWrapper(Pin(pin, Pin.OUT), freq)
         self.logger = Logger('PiezoBuzzer', debug=False)
+        self._generation = 0
+
+        # Arpeggiator state, stepped from a hardware timer callback
+        self._timer = None
+        self._arp_freqs = array('H')
+        self._arp_index = 0
 
     def _turn_on(self):
         self.pwm.duty_u16 = 32768  # 50% duty cycle
@@ -67,6 +96,7 @@ class PiezoBuzzer:
         if not isinstance(duration, Duration):
             duration = Duration.from_int(duration)
 
+        self.stop_arpeggio()
         if note == Note.REST:
             self._turn_off()
         else:
@@ -77,13 +107,129 @@ class PiezoBuzzer:
         await uasyncio.sleep(float(int(duration)) / 1000)  # Convert ms to seconds
         self._turn_off()
 
-    async def play_song(self, song):
+    async def play_song(self, song, tempo=100, articulation=100, gap_ms=50, loops=1):
         """
-        Play a sequence of notes (song) on the piezo buzzer
-        Each song is a list of (note, duration) tuples
+        Play a song, either (note, duration) tuples or an array from compile_song().
+
+        Note changes are scheduled against ticks_ms deadlines counted from the start of
+        the song, so late wake-ups never accumulate into tempo drift.
+
+        Args:
+            song: Song to play
+            tempo: Speed in percent of the written durations, 200 plays twice as fast
+            articulation: Percentage of each note that sounds, e.g. 50 for staccato
+            gap_ms: Silence after every note, at the written tempo
+            loops: Number of times to play the song, 0 repeats until stop()
+
+        Raises:
+            ValueError: If tempo is not positive or articulation is not in 1-100
         """
+        if tempo <= 0:
+            raise ValueError(f'tempo must be positive, got {tempo}')
+        if not 0 < articulation <= 100:
+            raise ValueError(f'articulation must be between 1 and 100, got {articulation}')
+        song = compile_song(song)
+        self.stop_arpeggio()  # the timer would overwrite every note
+        self._generation += 1
+        generation = self._generation
         self.logger.info('Starting to play song on piezo buzzer')
-        for note, duration in song:
-            await self.play_note(note, duration)
-            # Always add a small gap between notes for consistent rhythm
-            await uasyncio.sleep(0.05)  # Small gap between notes
+
+        deadline = time.ticks_ms()
+        played = 0
+        ringing = False
+        while loops == 0 or played < loops:
+            for i in range(0, len(song), 2):
+                freq = song[i]
+                sounding = song[i + 1] * 100 // tempo
+                slot = sounding + gap_ms * 100 // tempo
+                sounding = sounding * articulation // 100
+
+                if freq:
+                    self.pwm.freq = freq
+                    self._turn_on()
+                    ringing = True
+                elif ringing:
+                    self._turn_off()
+                    ringing = False
+
+                if ringing and sounding < slot:
+                    await self._sleep_until(time.ticks_add(deadline, sounding))
+                    self._turn_off()
+                    ringing = False
+                deadline = time.ticks_add(deadline, slot)
+                await self._sleep_until(deadline)
+                if generation != self._generation:
+                    return
+            played += 1
+        if ringing:
+            self._turn_off()
+
+    async def _sleep_until(self, deadline):
+        delay = time.ticks_diff(deadline, time.ticks_ms())
+        if delay > 0:
+            await uasyncio.sleep_ms(delay)
+
+    def start_arpeggio(self, notes, rate_hz=60, timer_id=0):
+        """
+        Emulate a chord by cycling the notes at rate_hz from a hardware timer.
+
+        The piezo plays one frequency at a time; switching 50-100 times a second is
+        heard as a chord. The timer callback only advances an index and writes the
+        PWM frequency, so the cycle keeps its rate whatever the event loop is doing.
+
+        Args:
+            notes: Note frequencies of the chord, rests (Note.REST) are skipped
+            rate_hz: Note changes per second
+            timer_id: Hardware timer to use, the ESP32-C3 has timers 0 and 1
+
+        Raises:
+            ValueError: If a frequency is negative or no notes are left to play
+        """
+        self.stop_arpeggio()
+        # Checked here, an exception in the timer callback would leave the timer armed
+        freqs = array('H')
+        for note in notes:
+            freq = int(note)
+            if freq < 0:
+                raise ValueError(f'Invalid note frequency: {freq}')
+            if freq != Note.REST:
+                freqs.append(freq)
+        if not freqs:
+            raise ValueError('An arpeggio needs at least one note')
+        self._arp_freqs = freqs
+        self._arp_index = 0
+        self.pwm.set_freq(freqs[0])
+        self._turn_on()
+
+        self._timer = Timer(timer_id)
+        self._timer.init(mode=Timer.PERIODIC, freq=rate_hz, callback=self._arp_step)
+
+    def _arp_step(self, timer):
+        index = self._arp_index + 1
+        if index >= len(self._arp_freqs):
+            index = 0
+        self._arp_index = index
+        self.pwm.set_freq(self._arp_freqs[index])
+
+    def stop_arpeggio(self):
+        """Stop the arpeggio timer and silence the buzzer, returns False if none was running"""
+        if self._timer is None:
+            return False
+        self._timer.deinit()
+        self._timer = None
+        self._turn_off()
+        return True
+
+    async def play_chord(self, notes, duration_ms, rate_hz=60, timer_id=0):
+        """Play notes as an arpeggiated chord for duration_ms"""
+        self.start_arpeggio(notes, rate_hz, timer_id)
+        try:
+            await uasyncio.sleep_ms(duration_ms)
+        finally:
+            self.stop_arpeggio()
+
+    def stop(self):
+        """Stop the song or arpeggio that is playing"""
+        self._generation += 1
+        if not self.stop_arpeggio():
+            self._turn_off()
@@ -0,0 +1,138 @@
+"""
+Parsers turning RTTTL ringtones and a simple text notation into compiled songs.
+
+Both produce the format of piezo_buzzer.compile_song(): an array('H') of
+frequency/duration pairs in Hz and ms, with frequency 0 for rests.
+
+RTTTL, as used by Nokia ringtones:
+
+    smoke:d=4,o=4,b=240:d,2f,2g,p,d,2f,2g#,2g
+
+Text notation, one or more notes per line, # starts a comment:
+
+    bpm=240           # quarter notes per minute, default 240 (quarter = 250 ms)
+    D4/8 F#4/8 G4/2.  # note, accidental (# or b), octave, /divisor, dot adds half
+    R/4               # rest
+"""
+
+from array import array
+
+from lib.piezo_buzzer_types import note_frequency
+
+_SEMITONES = {'c': 0, 'd': 2, 'e': 4, 'f': 5, 'g': 7, 'a': 9, 'b': 11}
+_DEFAULT_BPM = 240
+
+
+def _duration_ms(bpm, divisor, dotted):
+    if divisor <= 0:
+        raise ValueError(f'Invalid duration divisor: {divisor}')
+    duration = 240_000 // (bpm * divisor)  # a whole note lasts four beats
+    return duration + duration // 2 if dotted else duration
+
+
+def _digits(token, i):
+    start = i
+    while i < len(token) and token[i].isdigit():
+        i += 1
+    return (int(token[start:i]) if i > start else None), i
+
+
+def _append(song, freq, duration):
+    song.append(freq)
+    song.append(duration)
+
+
+def parse_rtttl(text):
+    """Parse an RTTTL ringtone into a compiled song"""
+    parts = text.strip().split(':')
+    if len(parts) != 3:
+        raise ValueError('RTTTL needs three sections: name:defaults:notes')
+
+    defaults = {'d': 4, 'o': 6, 'b': 63}
+    for setting in parts[1].split(','):
+        setting = setting.strip().lower()
+        if setting:
+            key, _, value = setting.partition('=')
+            if key not in defaults or not value.isdigit():
+                raise ValueError(f'Invalid RTTTL setting: {setting}')
+            defaults[key] = int(value)
+
+    song = array('H')
+    for token in parts[2].split(','):
+        token = token.strip().lower()
+        if not token:
+            continue
+        divisor, i = _digits(token, 0)
+        if i >= len(token) or (token[i] != 'p' and token[i] not in _SEMITONES):
+            raise ValueError(f'Invalid RTTTL note: {token}')
+        name = token[i]
+        i += 1
+        semitone = _SEMITONES.get(name, 0)
+        if i < len(token) and token[i] == '#':
+            semitone += 1
+            i += 1
+        dotted = i < len(token) and token[i] == '.'
+        i += dotted
+        octave, i = _digits(token, i)
+        if i < len(token) and token[i] == '.':
+            dotted = True
+            i += 1
+        if i != len(token):
+            raise ValueError(f'Invalid RTTTL note: {token}')
+
+        if divisor is None:
+            divisor = defaults['d']
+        if octave is None:
+            octave = defaults['o']
+        duration = _duration_ms(defaults['b'], divisor, dotted)
+        freq = 0 if name == 'p' else note_frequency(semitone, octave)
+        _append(song, freq, duration)
+    return song
+
+
+def parse_text(text):
+    """Parse the text notation into a compiled song"""
+    bpm = _DEFAULT_BPM
+    song = array('H')
+    for line in text.splitlines():
+        for token in line.split():
+            if token.startswith('#'):
+                break  # comment, a # inside a note is a sharp
+            lower = token.lower()
+            if lower.startswith('bpm='):
+                bpm = int(lower[4:])
+                continue
+
+            note, _, length = lower.partition('/')
+            dotted = length.endswith('.') or (not length and note.endswith('.'))
+            length = length.rstrip('.')
+            note = note.rstrip('.')
+            if not length.isdigit() and length:
+                raise ValueError(f'Invalid note: {token}')
+            duration = _duration_ms(bpm, int(length) if length else 4, dotted)
+
+            if note == 'r':
+                _append(song, 0, duration)
+                continue
+            if not note or note[0] not in _SEMITONES:
+                raise ValueError(f'Invalid note: {token}')
+            semitone = _SEMITONES[note[0]]
+            octave = note[1:]
+            if octave.startswith('#'):
+                semitone += 1
+                octave = octave[1:]
+            elif octave.startswith('b'):
+                semitone -= 1
+                octave = octave[1:]
+            if not octave.isdigit():
+                raise ValueError(f'Invalid note: {token}')
+            _append(song, note_frequency(semitone, int(octave)), duration)
+    return song
+
+
+def parse_song(text):
+    """Parse either format, RTTTL is a single name:defaults:notes line"""
+    text = text.strip()
+    if '\n' not in text and text.count(':') == 2:
+        return parse_rtttl(text)
+    return parse_text(text)
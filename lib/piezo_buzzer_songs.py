@@ -1,43 +1,85 @@
-from lib.piezo_buzzer_types import Duration, Note
-
 """
-Collection of songs for the piezo buzzer
-Each song is a list of (note, duration) tuples specific to piezo buzzer usage
+Song library for the piezo buzzer, loaded lazily by name.
+
+Songs live as files in /songs on flash (songs/ next to lib/ on the host) or on the SD
+card, so only the song being played takes RAM:
+
+    name.bin     precompiled by scripts/compile_songs.py, loaded without parsing
+    name.rtttl   RTTTL ringtone, parsed on load
+    name.txt     text notation, parsed on load
+
+Loaded songs are arrays in the piezo_buzzer.compile_song() format. The upper-case
+names of the built-in songs (e.g. SMOKE_ON_THE_WATER) still work as attributes
+and load on first access.
 """
 
-COME_AS_YOU_ARE = [
-    # First sequence
-    (Note.D4, Duration.EIGHTH),
-    (Note.D4, Duration.EIGHTH),
-    (Note.E4, Duration.EIGHTH),
-    (Note.FS4, Duration.EIGHTH),
-    (Note.G4, Duration.EIGHTH),
-    (Note.FS4, Duration.EIGHTH),
-    (Note.FS4, Duration.EIGHTH),
-    (Note.FS4, Duration.EIGHTH),
-    # Second sequence
-    (Note.FS4, Duration.EIGHTH),
-    (Note.FS4, Duration.EIGHTH),
-    (Note.E4, Duration.EIGHTH),
-    (Note.D4, Duration.EIGHTH),
-    (Note.D4, Duration.EIGHTH),
-    (Note.D4, Duration.EIGHTH),
-    (Note.D4, Duration.EIGHTH),
-]
-
-SMOKE_ON_THE_WATER = [
-    (Note.D4, Duration.QUARTER),
-    (Note.F4, Duration.HALF),
-    (Note.G4, Duration.HALF),
-    (Note.REST, Duration.QUARTER),
-    (Note.D4, Duration.QUARTER),
-    (Note.F4, Duration.HALF),
-    (Note.GS4, Duration.HALF),
-    (Note.G4, Duration.HALF),
-    (Note.REST, Duration.QUARTER),
-    (Note.D4, Duration.QUARTER),
-    (Note.F4, Duration.HALF),
-    (Note.G4, Duration.HALF),
-    (Note.F4, Duration.HALF),
-    (Note.D4, Duration.HALF),
-]
+import sys
+from array import array
+
+from lib.piezo_buzzer_parser import parse_song
+
+
+def _songs_dir(module_file=None):
+    # build_device.py uploads the compiled songs to /songs on flash
+    if sys.implementation.name == 'micropython':
+        return '/songs'
+    # On the host songs/ sits next to the lib/ directory holding this module
+    parts = (module_file or __file__).replace('\\', '/').rsplit('/', 2)
+    return parts[0] + '/songs' if len(parts) == 3 else 'songs'
+
+
+SONG_PATHS = [_songs_dir(), '/sd/songs']
+EXTENSIONS = ('.bin', '.rtttl', '.txt')
+
+
+def _read(path, mode):
+    try:
+        with open(path, mode) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def load_song(name, paths=None):
+    """
+    Load a song by name from the first directory that has it.
+
+    Raises:
+        ValueError: If no directory has the song
+    """
+    for directory in paths or SONG_PATHS:
+        base = f'{directory}/{name}'
+        data = _read(base + '.bin', 'rb')
+        if data is not None:
+            return array('H', data)
+        for extension in EXTENSIONS[1:]:
+            text = _read(base + extension, 'r')
+            if text is not None:
+                return parse_song(text)
+    raise ValueError(f'Song not found: {name}')
+
+
+def list_songs(paths=None):
+    """Names of all songs in the song directories"""
+    import os
+
+    names = set()
+    for directory in paths or SONG_PATHS:
+        try:
+            files = os.listdir(directory)
+        except OSError:
+            continue
+        for file in files:
+            for extension in EXTENSIONS:
+                if file.endswith(extension):
+                    names.add(file[: -len(extension)])
+    return sorted(names)
+
+
+def __getattr__(name):
+    if name.isupper():
+        try:
+            return load_song(name.lower())
+        except ValueError:
+            pass
+    raise AttributeError(name)
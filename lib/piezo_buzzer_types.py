@@ -1,3 +1,27 @@
+from array import array
+
+# C8 to B8 in Hz, lower octaves are derived by halving
+_OCTAVE_8 = array('H', [4186, 4435, 4699, 4978, 5274, 5588, 5920, 6272, 6645, 7040, 7459, 7902])
+
+
+def note_frequency(semitone, octave):
+    """
+    Frequency in Hz of a note in scientific pitch notation.
+
+    Args:
+        semitone: 0 for C up to 11 for B, values outside wrap into the next octave
+        octave: Octave number, 4 is the octave starting at middle C
+    """
+    octave += semitone // 12
+    semitone %= 12
+    if not 0 <= octave <= 8:
+        raise ValueError(f'Octave must be between 0 and 8, got {octave}')
+    shift = 8 - octave
+    if shift == 0:
+        return _OCTAVE_8[semitone]
+    return (_OCTAVE_8[semitone] + (1 << (shift - 1))) >> shift
+
+
 class Note:
     """
     Note frequencies for piezo buzzer
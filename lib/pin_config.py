@@ -1,7 +1,14 @@
 class PinConfigEsp32:
     """ESP32 pin configuration"""
     BOOT_BUTTON = 0
+    GPIO_IN_REG = 0x3FF4403C  # Input levels of GPIO 0-31
     LED_PIN = 2
+    # lib/benchmark.py fixtures, clear of the SPI flash pins GPIO 6-11
+    BENCH_SER_PIN = 25
+    BENCH_RCLK_PIN = 26
+    BENCH_SRCLK_PIN = 27
+    BENCH_BUTTON_PIN = 0
+    BENCH_AUDIO_PIN = 4
     
     def is_builtin_led_active_low(self):
         return False
@@ -10,7 +17,14 @@ class PinConfigEsp32:
 class PinConfigEsp32C3:
     """ESP32-C3 pin configuration"""
     BOOT_BUTTON = 9
+    GPIO_IN_REG = 0x6000403C  # Input levels of GPIO 0-21
     LED_PIN = 2
+    # lib/benchmark.py fixtures, clear of the SPI flash pins GPIO 12-17
+    BENCH_SER_PIN = 5
+    BENCH_RCLK_PIN = 6
+    BENCH_SRCLK_PIN = 7
+    BENCH_BUTTON_PIN = 9
+    BENCH_AUDIO_PIN = 4
     
     def is_builtin_led_active_low(self):
         return False
\ No newline at end of file
@@ -1,13 +1,32 @@
+import os
+from array import array
+from collections import deque
+
 import pytest
+from pin_trace_mock import PinTrace
 
 
 class MockPin:
+    """
+    Mock of machine.Pin keeping a history of value changes.
+
+    Set verbose (or MOCK_PIN_VERBOSE=1) to print every change. history_limit keeps
+    only the last N changes, 0 disables the history and None keeps all of them.
+    With apply_pulls set, pins created with PULL_UP idle high like on hardware.
+    """
+
     IN = 'in'
     OUT = 'out'
     PULL_UP = 'pull_up'
     PULL_DOWN = 'pull_down'
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
 
     _instances = {}
+    trace = None
+    verbose = bool(os.environ.get('MOCK_PIN_VERBOSE'))
+    history_limit = None
+    apply_pulls = False
 
     def __new__(cls, id, mode=OUT, pull=None):
         existing_instance = cls._instances.get(id)
@@ -19,11 +38,16 @@ class MockPin:
         if id not in self._instances:
             self.id = id
             self.mode = mode
-            self._value = 0
+            self._value = 1 if self.apply_pulls and pull == self.PULL_UP else 0
             self.led = self  # Make pin act as its own LED for test compatibility
-            self.history = []
-            print(f'Created MockPin {id} with mode {mode}')
+            self.history = array('B')
+            self._irq_handler = None
+            self._irq_trigger = 0
+            if self.verbose:
+                print(f'Created MockPin {id} with mode {mode}')
             self._instances[id] = self
+            if self.trace is not None:
+                self.trace.record(id, self._value)
 
     def value(self, val=None):
         if val is not None:
@@ -31,13 +55,36 @@ class MockPin:
             prev_value = self._value
             self._value = val
             if val != prev_value:  # Only add to history if value actually changed
-                print(f'Pin {self.id} value changed from {prev_value} to {val}')
-                self.history.append(val)
-                print(f'History updated: {self.history}')
-            else:
+                self._add_history(val)
+                if self.verbose:
+                    print(f'Pin {self.id} value changed from {prev_value} to {val}')
+                if self.trace is not None:
+                    self.trace.record(self.id, val)
+                self._fire_irq(val)
+            elif self.verbose:
                 print(f'Pin {self.id} value unchanged at {val}')
         return self._value
 
+    def _add_history(self, val):
+        limit = self.history_limit
+        if limit is None:
+            self.history.append(val)
+        elif limit:
+            history = self.history
+            if getattr(history, 'maxlen', None) != limit:
+                # A bounded deque drops the oldest change in O(1) once full
+                history = self.history = deque(history, maxlen=limit)
+            history.append(val)
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING):
+        self._irq_handler = handler
+        self._irq_trigger = trigger
+
+    def _fire_irq(self, val):
+        edge = self.IRQ_RISING if val else self.IRQ_FALLING
+        if self._irq_handler is not None and self._irq_trigger & edge:
+            self._irq_handler(self)
+
     def on(self):
         self.value(1)
 
@@ -47,10 +94,26 @@ class MockPin:
     def toggle(self):
         self.value(not self.value())
 
+    @classmethod
+    def start_trace(cls):
+        """Record transitions of all pins (and PWM channels) into a new PinTrace"""
+        cls.trace = PinTrace()
+        for pin in cls._instances.values():
+            cls.trace.record(pin.id, pin._value)
+        return cls.trace
+
+    @classmethod
+    def stop_trace(cls):
+        trace = cls.trace
+        cls.trace = None
+        return trace
+
     @classmethod
     def clear_instances(cls):
-        print('Clearing all pin instances')
+        if cls.verbose:
+            print('Clearing all pin instances')
         cls._instances.clear()
+        cls.trace = None
 
 
 @pytest.fixture(scope='function', autouse=True)
@@ -0,0 +1,150 @@
+from array import array
+
+import time_mock
+
+
+def _signal_name(signal):
+    name = signal if isinstance(signal, str) else f'pin_{signal}'
+    return ''.join(c if c.isalnum() or c == '_' else '_' for c in name).strip('_')
+
+
+class PinTrace:
+    """
+    Logic-analyzer style recorder for mock pins and PWM channels.
+
+    Every transition is stored as (virtual time in us, signal index, value) in
+    compact arrays. Query edges, pulse widths and frequencies in tests, or export a
+    VCD file for GTKWave/PulseView. Start one with MockPin.start_trace().
+    """
+
+    def __init__(self):
+        self.signals = []
+        self._index = {}
+        self._last = []
+        self._times = array('q')
+        self._signals = array('H')
+        self._values = array('l')
+
+    def __len__(self):
+        return len(self._times)
+
+    def record(self, signal, value, time_us=None):
+        """Record a value for a signal, repeated values are ignored"""
+        index = self._index.get(signal)
+        if index is None:
+            index = len(self.signals)
+            self._index[signal] = index
+            self.signals.append(signal)
+            self._last.append(None)
+        elif self._last[index] == value:
+            return
+
+        self._last[index] = value
+        self._times.append(time_mock.ticks_us() if time_us is None else time_us)
+        self._signals.append(index)
+        self._values.append(value)
+
+    def clear(self):
+        self.__init__()
+
+    def transitions(self, signal):
+        """Returns [(time_us, value)] for a signal, starting with its first recorded value"""
+        index = self._index.get(signal)
+        if index is None:
+            return []
+        return [
+            (self._times[i], self._values[i])
+            for i in range(len(self._times))
+            if self._signals[i] == index
+        ]
+
+    def edges(self, signal, rising=True):
+        """Times of rising (or falling) edges, the first recorded value is not an edge"""
+        points = self.transitions(signal)
+        return [
+            t
+            for (_, prev), (t, value) in zip(points, points[1:])
+            if (value > prev) == rising and value != prev
+        ]
+
+    def pulse_widths(self, signal, level=1):
+        """Durations in us of complete pulses at level, bounded by edges on both sides"""
+        points = self.transitions(signal)
+        return [
+            points[i + 1][0] - points[i][0]
+            for i in range(1, len(points) - 1)
+            if points[i][1] == level
+        ]
+
+    def period_us(self, signal):
+        """Average time between rising edges, None with fewer than two edges"""
+        rising = self.edges(signal)
+        if len(rising) < 2:
+            return None
+        return (rising[-1] - rising[0]) / (len(rising) - 1)
+
+    def frequency(self, signal):
+        period = self.period_us(signal)
+        return 1_000_000 / period if period else None
+
+    def duty_cycle(self, signal):
+        """Fraction of time high between the first and last rising edge"""
+        rising = self.edges(signal)
+        if len(rising) < 2:
+            return None
+        start, end = rising[0], rising[-1]
+        high = 0
+        points = self.transitions(signal)
+        for (t, value), (t_next, _) in zip(points, points[1:]):
+            if value and start <= t < end:
+                high += min(t_next, end) - t
+        return high / (end - start)
+
+    def export_text(self, path):
+        """Write one 'time_us signal value' line per record, easy to diff in CI"""
+        with open(path, 'w') as f:
+            for i in range(len(self._times)):
+                signal = _signal_name(self.signals[self._signals[i]])
+                f.write(f'{self._times[i]} {signal} {self._values[i]}\n')
+
+    def export_vcd(self, path, timescale='1us', module='toy_blocks'):
+        """
+        Write the trace as a Value Change Dump, times relative to the first record.
+
+        Signals that go negative get a sign bit and are written in two's complement.
+        """
+        widths = []
+        for index in range(len(self.signals)):
+            values = [
+                self._values[i] for i in range(len(self._values)) if self._signals[i] == index
+            ]
+            signed = min(values) < 0
+            bits = max((~value if value < 0 else value).bit_length() for value in values)
+            widths.append(max(1, bits + signed))
+
+        ids = [
+            chr(33 + i) if i < 94 else f'{chr(33 + i // 94)}{chr(33 + i % 94)}'
+            for i in range(len(self.signals))
+        ]
+        origin = self._times[0] if len(self._times) else 0
+
+        with open(path, 'w') as f:
+            f.write(f'$timescale {timescale} $end\n')
+            f.write(f'$scope module {module} $end\n')
+            for index, signal in enumerate(self.signals):
+                f.write(f'$var wire {widths[index]} {ids[index]} {_signal_name(signal)} $end\n')
+            f.write('$upscope $end\n$enddefinitions $end\n')
+
+            current = None
+            for i in range(len(self._times)):
+                t = self._times[i] - origin
+                if t != current:
+                    f.write(f'#{t}\n')
+                    current = t
+                index = self._signals[i]
+                width = widths[index]
+                value = self._values[i] & ((1 << width) - 1)
+                if width == 1:
+                    f.write(f'{value}{ids[index]}\n')
+                else:
+                    f.write(f'b{value:0{width}b} {ids[index]}\n')
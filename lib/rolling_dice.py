@@ -2,6 +2,7 @@ import random
 import uasyncio as asyncio
 
 from lib.led import Led
+from lib.shift_register import ShiftRegisterLed
 
 
 class RollingDice:
@@ -18,38 +19,138 @@ class RollingDice:
         5: [1, 1, 1, 0, 0, 1, 1],  # Like 4 + Middle
         6: [1, 1, 0, 1, 1, 1, 1],  # All except center
     }
-
-    def __init__(self, pins, active_low=False):
+    ALL_LEDS = 0x7F
+
+    # Single dot circling: TL -> TR -> BR -> LR -> LL -> BL
+    SPIN_PATH = (0, 1, 4, 6, 5, 3)
+    _FACE_FRAMES = 6  # frame index of face 1, spin frames come first
+
+    def __init__(
+        self,
+        pins,
+        active_low=False,
+        animation_steps=30,
+        spin_steps=10,
+        min_interval_ms=40,
+        max_interval_ms=240,
+    ):
         if len(pins) != 7:
             raise ValueError('Exactly 7 pins required for dice display')
 
         self.pins = pins
+        self.active_low = active_low
         self.leds = []
+        self._direct_pins = []  # (led index, pin) driven with Pin.value()
+        self._register_leds = []  # (led index, ShiftRegisterLed)
+        # Chained registers from next() share state but are separate objects, each
+        # one entering batch mode has to leave it again
+        batched = []
         # Handle both direct pins and shift register virtual pins
-        for pin in pins:
+        for index, pin in enumerate(pins):
             if isinstance(pin, tuple) and len(pin) == 2:
                 shift_register, position = pin
-                self.leds.append(Led(pin, active_low))
+                if all(other is not shift_register for other in batched):
+                    shift_register.begin_batch()
+                    batched.append(shift_register)
+                led = ShiftRegisterLed(shift_register, position, active_low)
+                self._register_leds.append((index, led))
             else:
-                self.leds.append(Led(pin, active_low))
+                led = Led(pin, active_low)
+                self._direct_pins.append((index, led.led))
+            self.leds.append(led)
+
+        # One update() per shift register chain presents a whole frame with one latch
+        self._registers = []
+        for _, led in self._register_leds:
+            shift_register = led.shift_register
+            if all(other.state is not shift_register.state for other in self._registers):
+                self._registers.append(shift_register)
+        for shift_register in batched:
+            shift_register.end_batch()
+        # Levels last written to the direct pins, Led() already drove them to off
+        self._levels = bytearray(1 if pin.value() else 0 for _, pin in self._direct_pins)
+
+        # Every face and animation frame is compiled once, rendering is then lookups only
+        self._faces = {
+            n: self._compile(self._mask(pattern)) for n, pattern in self.DICE_PATTERNS.items()
+        }
+        self._blank = self._compile(0)
+        self._all = self._compile(self.ALL_LEDS)
+        self._spin_frames = [self._compile(1 << led) for led in self.SPIN_PATH]
+        self._frames = self._spin_frames + [self._faces[n] for n in range(1, 7)]
 
         self.animation_timer = None
-        self.animation_delay = 80
         self.current_number = None
         self.animation_count = 0
-        self.ANIMATION_STEPS = 30
+        self.ANIMATION_STEPS = animation_steps
+        self.spin_steps = min(spin_steps, animation_steps)
+
+        # The dice decelerates along a cubic ease-in of the frame interval, computed once.
+        # Intervals are kept in seconds so the animation loop does no arithmetic.
+        last = max(1, animation_steps - 1)
+        span = max_interval_ms - min_interval_ms
+        self._intervals = [
+            (min_interval_ms + span * step**3 // last**3) / 1000 for step in range(animation_steps)
+        ]
+        self._schedule = bytearray(animation_steps)  # frame index per step of the current roll
+        self._generation = 0
+
+    @staticmethod
+    def _mask(pattern):
+        mask = 0
+        for index, value in enumerate(pattern):
+            if value:
+                mask |= 1 << index
+        return mask
+
+    def _compile(self, mask):
+        """
+        Turn a bitmask of lit LEDs (bit 0 = TL) into a frame for _present().
+
+        Returns:
+            tuple: (direct pin levels, ((register state, index, keep mask, bits), ...))
+        """
+        levels = bytearray(len(self._direct_pins))
+        for i, (index, _) in enumerate(self._direct_pins):
+            levels[i] = ((mask >> index) & 1) ^ self.active_low
+
+        updates = {}
+        for index, led in self._register_leds:
+            state = led.shift_register.state
+            register = led.shift_register.position
+            bit = 1 << led.position
+            keep, bits = updates.get((id(state), register), (0xFF, 0))
+            if ((mask >> index) & 1) ^ self.active_low:
+                bits |= bit
+            updates[(id(state), register)] = (keep & ~bit, bits)
+
+        ops = []
+        for _, led in self._register_leds:
+            state = led.shift_register.state
+            key = (id(state), led.shift_register.position)
+            if key in updates:
+                keep, bits = updates.pop(key)
+                ops.append((state, key[1], keep, bits))
+        return levels, tuple(ops)
+
+    def _present(self, frame):
+        """Show a compiled frame, writing only changed pins and latching each register once"""
+        levels, ops = frame
+        current = self._levels
+        for i, (_, pin) in enumerate(self._direct_pins):
+            if levels[i] != current[i]:
+                pin.value(levels[i])
+                current[i] = levels[i]
+        for state, register, keep, bits in ops:
+            state[register] = (state[register] & keep) | bits
+        for shift_register in self._registers:
+            shift_register.update()
 
     def clear(self):
-        for led in self.leds:
-            led.off()
-            if hasattr(led.led, 'shift_register'):
-                led.led.shift_register.write()
+        self._present(self._blank)
 
     def test(self):
-        for led in self.leds:
-            led.on()
-            if hasattr(led.led, 'shift_register'):
-                led.led.shift_register.write()
+        self._present(self._all)
 
     def cycle_number(self):
         if self.current_number is None:
@@ -65,32 +166,38 @@ class RollingDice:
                 self.current_number = next_number
 
     def display_number(self, number):
-        if number not in self.DICE_PATTERNS:
+        if number not in self._faces:
             return
         self.current_number = number
-
-        pattern = self.DICE_PATTERNS[number]
-        shift_register = None
-
-        for led, value in zip(self.leds, pattern):
-            if value:
-                led.on()
-            else:
-                led.off()
-            if hasattr(led.led, 'shift_register'):
-                shift_register = led.led.shift_register
-
-        if shift_register:
-            shift_register.write()
+        self._present(self._faces[number])
 
     def _stop_animation(self):
         if self.animation_timer:
             self.animation_timer.deinit()
             self.animation_timer = None
 
+    def _plan(self, final_number):
+        """
+        Fill the frame schedule of a roll: spin frames first, then tumbling through
+        random faces, each different from the next, ending on a face other than the
+        final one so the reveal is always visible.
+        """
+        schedule = self._schedule
+        spin_steps = self.spin_steps
+        for step in range(spin_steps):
+            schedule[step] = step % len(self.SPIN_PATH)
+
+        face = final_number
+        for step in range(self.ANIMATION_STEPS - 1, spin_steps - 1, -1):
+            face = (face + random.getrandbits(8) % 5) % 6 + 1
+            schedule[step] = self._FACE_FRAMES + face - 1
+
     async def roll(self, number=None):
         """Roll the dice with an LED animation, returning the final number.
 
+        Starting another roll interrupts this one, which then returns None without
+        touching the display again.
+
         Args:
             number (int, optional): Force a specific number (1-6). If not provided, randomly chosen.
         """
@@ -98,28 +205,24 @@ class RollingDice:
             raise ValueError('Forced number must be an integer between 1 and 6')
 
         self._stop_animation()
+        self._generation += 1
+        generation = self._generation
         self.animation_count = 0
-        animation_position = 0
         final_number = number if number is not None else random.randint(1, 6)
+        self._plan(final_number)
 
-        # Single dot circling: TL -> TR -> BR -> LR -> LL -> BL
-        edge_leds = [0, 1, 4, 6, 5, 3]  # TL, TR, BR, LR, LL, BL
-
+        frames = self._frames
+        schedule = self._schedule
+        intervals = self._intervals
         while self.animation_count < self.ANIMATION_STEPS:
-            self.clear()
-            curr_pos = animation_position % len(edge_leds)
-
-            self.leds[edge_leds[curr_pos]].on()  # Light only current LED
-            for led in self.leds:
-                if hasattr(led.led, 'shift_register'):
-                    led.led.shift_register.write()
-
-            animation_position += 1
+            step = self.animation_count
+            self._present(frames[schedule[step]])
             self.animation_count += 1
-            await asyncio.sleep(self.animation_delay / 1000)  # Convert ms to seconds
+            await asyncio.sleep(intervals[step])
+            if generation != self._generation:
+                return None
 
         self.display_number(final_number)
-        self.current_number = final_number
         return final_number
 
     def debug_display(self):
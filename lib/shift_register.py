@@ -212,9 +212,12 @@ class ShiftRegisterLed(Led):
         return self._virtual_pin.position
 
     def _set_value(self, value):
-        self.logger.info(
-            f"Setting to {'ON' if value else 'OFF'} (active {'low' if self.active_low else 'high'})"
-        )
+        if self.logger.enabled_for(Logger.INFO):
+            self.logger.info(
+                'Setting to %s (active %s)',
+                'ON' if value else 'OFF',
+                'low' if self.active_low else 'high',
+            )
         pin_value = not value if self.active_low else value
         self._virtual_pin.value(pin_value)
 
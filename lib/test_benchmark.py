@@ -0,0 +1,84 @@
+import json
+
+import benchmark
+import pytest
+import uasyncio
+from benchmark import CASES, board_name, measure, run
+from pin_mock import MockPin
+from uasyncio_virtual_mock import VirtualLoop
+
+
+def test_board_name_on_host():
+    assert board_name() == 'host'
+
+
+def test_measure_sync_and_async_cases():
+    with VirtualLoop().install():
+        us, alloc = measure(CASES['shift_register.update'](), iterations=3)
+        assert us > 0
+        assert alloc == 0  # gc.mem_alloc is MicroPython only
+
+        us, _ = measure(CASES['audio.sample_pump'](), iterations=2)
+        assert us == 32000  # 256 samples at 8 kHz on the virtual clock
+
+
+class FakeGc:
+    def __init__(self):
+        self.allocated = 0
+        self.enabled = True
+
+    def collect(self):
+        pass
+
+    def disable(self):
+        assert self.enabled
+        self.enabled = False
+
+    def enable(self):
+        self.enabled = True
+
+    def mem_alloc(self):
+        return self.allocated
+
+
+def test_measure_pauses_gc_per_call_in_one_event_loop(monkeypatch):
+    fake_gc = FakeGc()
+    monkeypatch.setattr(benchmark, 'gc', fake_gc)
+    sizes = iter([0, 16, 48, 32])
+    gc_enabled = []
+
+    async def op():
+        gc_enabled.append(fake_gc.enabled)
+        fake_gc.allocated += next(sizes)
+
+    with VirtualLoop().install() as loop:
+        runs = []
+        run_loop = loop.run
+        monkeypatch.setattr(uasyncio, 'run', lambda coro: runs.append(coro) or run_loop(coro))
+        _, alloc = measure(op, iterations=3)
+
+    assert len(runs) == 1
+    assert gc_enabled == [True, False, False, False]  # warm-up, then gc paused per call
+    assert alloc == 48
+    assert fake_gc.enabled
+
+
+def test_run_prints_machine_readable_lines(capsys):
+    with VirtualLoop().install():
+        results = run(['button.scan', 'logger.disabled'], iterations=2, board='esp32c3')
+
+    lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith('BENCH ')]
+    assert [json.loads(line[6:]) for line in lines] == results
+    assert [result['case'] for result in results] == ['button.scan', 'logger.disabled']
+    assert all(result['board'] == 'esp32c3' for result in results)
+
+
+def test_run_uses_board_pins(capsys):
+    MockPin.clear_instances()
+    with VirtualLoop().install():
+        run(['shift_register.update', 'button.scan'], iterations=1, board='esp32')
+    # The classic ESP32 fixtures stay off the SPI flash pins GPIO 6-11
+    assert sorted(MockPin._instances) == [0, 25, 26, 27]
+
+    with pytest.raises(ValueError, match='esp32s3'):
+        run(['button.scan'], iterations=1, board='esp32s3')
@@ -114,3 +114,42 @@ async def test_button_press_tracking():
     assert button.consume_was_pressed()
     assert not button.was_pressed  # State was reset
     assert not button.consume_was_pressed()  # Second check should return False
+
+
+@pytest.mark.asyncio
+async def test_button_irq_edges():
+    events = []
+
+    async def on_down():
+        events.append('down')
+
+    async def on_up():
+        events.append('up')
+
+    button = Button(pin=0, debug=False, use_irq=True)
+    button.on_button_down(on_down)
+    button.on_button_up(on_up)
+
+    button.pin.value(1)
+    button._edges.start()
+    await button._check_once()
+
+    button.pin.value(0)
+    button.pin.value(1)
+    assert button._edges.pending()
+
+    await button._process_edges()
+
+    assert events == ['down', 'up']
+    assert button.consume_was_pressed()
+    assert not button._edges.pending()
+
+
+@pytest.mark.asyncio
+async def test_button_irq_stop_releases_pin():
+    button = Button(pin=0, debug=False, use_irq=True)
+    button._edges.start()
+    assert button.pin._irq_handler is not None
+
+    button._edges.stop()
+    assert button.pin._irq_handler is None
@@ -36,6 +36,7 @@ async def test_button_debounce():
     # Third press after debounce (should be registered)
     button.pin.value(1)
     await button._check_once()
+    await uasyncio.sleep(0.021)
     button.pin.value(0)
     await button._check_once()
     assert press_count == 2  # Should register as a new press
@@ -74,6 +75,87 @@ async def test_debounce_up_event():
     # Another release after debounce
     button.pin.value(0)
     await button._check_once()
+    await uasyncio.sleep(0.021)
     button.pin.value(1)
     await button._check_once()
     assert up_count == 2  # Should register as a new release
+
+
+@pytest.mark.asyncio
+async def test_debounce_irq_bounces():
+    down_count = 0
+
+    async def callback():
+        nonlocal down_count
+        down_count += 1
+
+    button = DebouncedButton(pin=0, debounce_ms=20, debug=False, use_irq=True)
+    button.on_button_down(callback)
+    button._running = True
+
+    button.pin.value(1)
+    button._edges.start()
+    await button._check_once()
+
+    # Quick tap followed by chatter, all edges within a few hundred microseconds
+    for level in (0, 1, 0, 1):
+        button.pin.value(level)
+        await uasyncio.sleep(0.0001)
+
+    await button._process_edges()
+    assert down_count == 1
+    assert button._was_pressed is False
+
+
+@pytest.mark.asyncio
+async def test_debounce_irq_settles_on_rejected_last_edge():
+    button = DebouncedButton(pin=0, debounce_ms=20, debug=False, use_irq=True)
+    button._running = True
+
+    button.pin.value(1)
+    button._edges.start()
+    await button._check_once()
+
+    # Press, release, then a quick re-press that is rejected by the debounce window
+    button.pin.value(0)
+    button.pin.value(1)
+    button.pin.value(0)
+    await uasyncio.sleep(0.001)
+    button.pin.value(1)
+
+    await button._process_edges()
+    assert button._was_pressed is False
+    assert button.consume_was_pressed()
+
+
+@pytest.mark.asyncio
+async def test_debounce_irq_chatter_while_held():
+    events = []
+    button = DebouncedButton(pin=0, debounce_ms=20, debug=False, use_irq=True)
+    for name, register in (
+        ('down', button.on_button_down),
+        ('press', button.on_press),
+        ('up', button.on_button_up),
+    ):
+
+        async def callback(name=name):
+            events.append(name)
+
+        register(callback)
+    button._running = True
+
+    button.pin.value(1)
+    button._edges.start()
+    await button._check_once()
+
+    # Contact chatter on press, then held and released cleanly
+    for level in (0, 1, 0):
+        button.pin.value(level)
+        await uasyncio.sleep(0.0001)
+    await button._process_edges()
+
+    await uasyncio.sleep(0.5)
+    button.pin.value(1)
+    await button._process_edges()
+
+    assert events == ['down', 'press', 'up']
@@ -0,0 +1,137 @@
+import time
+
+import pytest
+import uasyncio
+from button import Button, DebouncedButton
+from button_gestures import ButtonGestures
+from uasyncio_virtual_mock import VirtualLoop
+
+
+def run_gestures(script, settle_ms=1000, **kwargs):
+    """
+    Run gestures.monitor() on the virtual loop while script(press) drives the button.
+
+    Returns the events as (name, ms since start) so tests can check when they fired.
+    """
+    events = []
+    loop = VirtualLoop()
+    with loop.install():
+        button = DebouncedButton(pin=0, debounce_ms=0, debug=False)
+        button.pin.value(1)
+        gestures = ButtonGestures(button, **kwargs)
+        start = time.ticks_ms()
+
+        for name in ('click', 'double_click', 'triple_click', 'long_press', 'repeat'):
+
+            async def callback(name=name):
+                events.append((name, time.ticks_diff(time.ticks_ms(), start)))
+
+            getattr(gestures, f'on_{name}')(callback)
+
+        async def press(hold_ms=50, gap_ms=0):
+            button.pin.value(0)
+            await button._check_once()
+            await uasyncio.sleep_ms(hold_ms)
+            button.pin.value(1)
+            await button._check_once()
+            await uasyncio.sleep_ms(gap_ms)
+
+        async def main():
+            await button._check_once()
+            loop.create_task(gestures.monitor())
+            await script(press)
+            await uasyncio.sleep_ms(settle_ms)
+            gestures.stop()
+
+        loop.run(main())
+    return events, gestures
+
+
+def test_single_click_fires_at_multi_click_deadline():
+    async def script(press):
+        await press(hold_ms=50)
+
+    events, _ = run_gestures(script)
+    # Released at 50 ms, the click fires when the 300 ms window closes, not at
+    # the 600 ms long-press deadline set on the press
+    assert events == [('click', 350)]
+
+
+def test_presses_further_apart_than_window_are_separate_clicks():
+    async def script(press):
+        await press(hold_ms=50, gap_ms=400)
+        await press(hold_ms=50)
+
+    events, _ = run_gestures(script)
+    assert events == [('click', 350), ('click', 800)]
+
+
+def test_double_and_triple_click():
+    async def script(press):
+        await press(gap_ms=100)
+        await press(gap_ms=400)
+        for _ in range(3):
+            await press(gap_ms=100)
+
+    events, _ = run_gestures(script)
+    assert events == [('double_click', 500), ('triple_click', 950)]
+
+
+def test_long_press_with_repeat():
+    async def script(press):
+        await press(hold_ms=950)
+
+    events, gestures = run_gestures(script, long_press_ms=500, repeat_ms=200)
+    assert events == [('long_press', 500), ('repeat', 700), ('repeat', 900)]
+    assert not gestures._has_deadline()
+
+
+def test_max_clicks_one_reports_immediately():
+    async def script(press):
+        await press(hold_ms=50)
+
+    events, gestures = run_gestures(script, max_clicks=1)
+    assert events == [('click', 50)]
+    assert not gestures._has_deadline()
+
+
+def test_monitors_button_and_gestures_concurrently():
+    loop = VirtualLoop()
+    with loop.install():
+        button = Button(pin=0, debug=False)
+        button.pin.value(1)
+        gestures = ButtonGestures(button)
+        start = time.ticks_ms()
+        events = []
+
+        async def on_long_press():
+            events.append(('long_press', time.ticks_ms() - start))
+
+        async def on_click():
+            events.append(('click', time.ticks_ms() - start))
+
+        gestures.on_long_press(on_long_press)
+        gestures.on_click(on_click)
+
+        async def user():
+            await uasyncio.sleep_ms(100)
+            button.pin.value(0)
+            await uasyncio.sleep_ms(800)
+            button.pin.value(1)
+            await uasyncio.sleep_ms(200)
+            button.pin.value(0)
+            await uasyncio.sleep_ms(50)
+            button.pin.value(1)
+
+        async def main():
+            await uasyncio.gather(button.monitor(), gestures.monitor(), user())
+
+        loop.run(main(), duration_ms=2000)
+
+    # The click fires when the multi-click window after the release closes
+    assert events == [('long_press', 700), ('click', 1450)]
+
+
+def test_invalid_max_clicks():
+    with pytest.raises(ValueError, match='max_clicks'):
+        ButtonGestures(DebouncedButton(pin=0, debug=False), max_clicks=4)
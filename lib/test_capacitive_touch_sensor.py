@@ -4,7 +4,7 @@ import time
 import capacitive_touch_sensor
 import pytest
 import uasyncio
-from capacitive_touch_sensor import CapacitiveTouchSensor
+from capacitive_touch_sensor import CapacitiveTouchSensor, TouchPadSensor
 from pin_mock import MockPin as Pin
 
 capacitive_touch_sensor.Pin = Pin
@@ -31,6 +31,12 @@ async def test_touch_sensor_init():
     assert sensor._running is False
 
 
+async def sample(sensor):
+    """Feed the current pin reading to the integrator like monitor() does"""
+    if sensor._sample(sensor.is_touched(), time.ticks_ms()):
+        await sensor._notify()
+
+
 @pytest.mark.asyncio
 async def test_touch_detection():
     """Test that the sensor correctly detects touch events."""
@@ -41,40 +47,28 @@ async def test_touch_detection():
         touch_called = True
 
     # Create sensor with active_high=True (default)
-    sensor = CapacitiveTouchSensor(pin=0)
+    sensor = CapacitiveTouchSensor(pin=0, attack_ms=20)
     sensor.on_touch(on_touch)
 
     # Initial state: not touched (LOW)
     sensor.pin.value(0)
-
-    # Simulates internal loop to track state changes
-    stable_count = 0
-    current_reading = False
-    last_touched = False
+    await sample(sensor)
 
     # Simulate touch event (HIGH)
     sensor.pin.value(1)
+    assert sensor.is_touched() is True  # Sensor returns TRUE when touched
+    await sample(sensor)
 
-    # First check doesn't trigger event due to stability checking
-    is_touched_now = sensor.is_touched()
-    assert is_touched_now is True  # Sensor returns TRUE when touched
-
-    # Simulate multiple consecutive readings to pass stability check
-    for _ in range(5):
-        if is_touched_now == current_reading:
-            stable_count += 1
-        else:
-            stable_count = 0
-            current_reading = is_touched_now
-
-    # Now we've passed stability check
-    if stable_count >= 3 and current_reading != last_touched:
-        sensor.touched = current_reading
-        last_touched = current_reading
-        await sensor._run_callback(sensor._on_touch)
+    # Touch registers once the attack time has been integrated
+    time.sleep_ms(15)
+    await sample(sensor)
+    assert touch_called is False
 
+    time.sleep_ms(5)
+    await sample(sensor)
     assert touch_called is True
     assert sensor.touched is True
+    assert sensor.latency_ms == 20
 
 
 @pytest.mark.asyncio
@@ -87,41 +81,26 @@ async def test_release_detection():
         release_called = True
 
     # Create sensor with active_high=True
-    sensor = CapacitiveTouchSensor(pin=0)
+    sensor = CapacitiveTouchSensor(pin=0, release_ms=50)
     sensor.on_release(on_release)
 
     # Start in touched state
     sensor.pin.value(1)
-    sensor.touched = True
-
-    # Simulates internal loop
-    stable_count = 0
-    current_reading = True
-    last_touched = True
+    await sample(sensor)
+    assert sensor.touched is True
 
     # Simulate release (LOW)
     sensor.pin.value(0)
+    assert sensor.is_touched() is False
+    await sample(sensor)
 
-    # Check touch state
-    is_touched_now = sensor.is_touched()
-    assert is_touched_now is False
-
-    # Simulate multiple readings for stability
     for _ in range(5):
-        if is_touched_now == current_reading:
-            stable_count += 1
-        else:
-            stable_count = 0
-            current_reading = is_touched_now
-
-    # Process release event
-    if stable_count >= 3 and current_reading != last_touched:
-        sensor.touched = current_reading
-        last_touched = current_reading
-        await sensor._run_callback(sensor._on_release)
+        time.sleep_ms(10)
+        await sample(sensor)
 
     assert release_called is True
     assert sensor.touched is False
+    assert sensor.latency_ms == 50
 
 
 @pytest.mark.asyncio
@@ -148,84 +127,121 @@ async def test_active_low_configuration():
 
 @pytest.mark.asyncio
 async def test_debounce():
-    """Test that the sensor properly debounces rapid state changes."""
+    """Test that the integrator filters rapid state changes."""
     touch_count = 0
 
     async def on_touch():
         nonlocal touch_count
         touch_count += 1
 
-    # 100ms debounce time
-    sensor = CapacitiveTouchSensor(pin=0, debounce_ms=100)
+    sensor = CapacitiveTouchSensor(pin=0, attack_ms=20, release_ms=20)
     sensor.on_touch(on_touch)
 
-    # Initial state
     sensor.pin.value(0)
-    sensor.touched = False
-    sensor.last_state_change = time.time() - 1.0  # Last change was 1 second ago
+    await sample(sensor)
 
-    # Simulate a touch (first press)
+    # 5 ms glitches separated by 10 ms of release never accumulate 20 ms of touch
+    for _ in range(5):
+        sensor.pin.value(1)
+        await sample(sensor)
+        time.sleep_ms(5)
+        sensor.pin.value(0)
+        await sample(sensor)
+        time.sleep_ms(10)
+        await sample(sensor)
+    assert touch_count == 0
+    assert sensor.touched is False
+
+    # A short release glitch during a held touch only slows the integrator down
     sensor.pin.value(1)
+    await sample(sensor)
+    time.sleep_ms(15)
+    sensor.pin.value(0)
+    await sample(sensor)
+    time.sleep_ms(2)
+    sensor.pin.value(1)
+    await sample(sensor)
+    time.sleep_ms(6)
+    await sample(sensor)
+    assert touch_count == 0
+    time.sleep_ms(1)
+    await sample(sensor)
+    assert touch_count == 1
 
-    # Process event manually (simplified version of what monitor does)
-    is_touched = sensor.is_touched()
-    assert is_touched is True
 
-    # Fake stability check being passed
-    sensor.touched = True
-    sensor.last_state_change = time.time()
-    await sensor._run_callback(sensor._on_touch)
-    assert touch_count == 1
+@pytest.mark.asyncio
+async def test_irq_edges_drive_integrator():
+    """Test that edge timestamps from IRQs are integrated without polling."""
+    events = []
+
+    async def on_touch():
+        events.append('touch')
+
+    async def on_release():
+        events.append('release')
+
+    sensor = CapacitiveTouchSensor(pin=0, attack_ms=20, release_ms=30, use_irq=True)
+    sensor.on_touch(on_touch)
+    sensor.on_release(on_release)
 
-    # Simulate rapid touch/release (should be ignored due to debounce)
     sensor.pin.value(0)
+    sensor._edges.start()
+    sensor._sample(sensor.is_touched(), time.ticks_ms())
+    assert sensor._settle_ms() is None
+
     sensor.pin.value(1)
+    time.sleep_ms(5)
+    await sensor._process_edges()
+    assert sensor._settle_ms() == 15
 
-    # Debounce in effect, no change should happen
-    time_since_last_change = time.time() - sensor.last_state_change
-    assert time_since_last_change < sensor.debounce_time
+    time.sleep_ms(15)
+    await sensor._process_edges()
+    assert events == ['touch']
+    assert sensor.latency_ms == 20
 
-    # Debounce test passes, touch count should still be 1
-    assert touch_count == 1
+    sensor.pin.value(0)
+    await sensor._process_edges()
+    assert sensor._settle_ms() == 30
+    time.sleep_ms(30)
+    await sensor._process_edges()
+    assert events == ['touch', 'release']
 
 
 @pytest.mark.asyncio
 async def test_toggle_callback():
     """Test that the toggle callback is called for both touch and release."""
-    toggle_count = 0
+    toggles = []
 
     async def on_toggle():
-        nonlocal toggle_count
-        toggle_count += 1
+        toggles.append(sensor.touched)
 
-    sensor = CapacitiveTouchSensor(pin=0)
+    sensor = CapacitiveTouchSensor(pin=0, attack_ms=20, release_ms=50)
     sensor.on_toggle(on_toggle)
 
     # Initial state
     sensor.pin.value(0)
-    sensor.touched = False
-    sensor.last_state_change = time.time() - 1.0  # Last change was 1 second ago
+    await sample(sensor)
 
-    # Process a touch event
+    # The touch toggles once the attack time has been integrated
     sensor.pin.value(1)
-
-    # Fake stability check and state change
-    sensor.touched = True
-    sensor.last_state_change = time.time()
-    await sensor._run_callback(sensor._on_toggle)
-    assert toggle_count == 1
-
-    # Wait for debounce
-    await uasyncio.sleep(0.1)
-
-    # Process a release event
+    await sample(sensor)
+    time.sleep_ms(19)
+    await sample(sensor)
+    assert toggles == []
+    time.sleep_ms(1)
+    await sample(sensor)
+    assert toggles == [True]
+
+    # The release toggles once the release time has been integrated
     sensor.pin.value(0)
-
-    # Fake stability check and state change
-    sensor.touched = False
-    sensor.last_state_change = time.time()
-    await sensor._run_callback(sensor._on_toggle)
-    assert toggle_count == 2
+    await sample(sensor)
+    time.sleep_ms(49)
+    await sample(sensor)
+    assert toggles == [True]
+    time.sleep_ms(1)
+    await sample(sensor)
+    assert toggles == [True, False]
+    assert sensor.latency_ms == 50
 
 
 @pytest.mark.asyncio
@@ -270,3 +286,69 @@ async def test_monitor_stops():
     # Verify callback was called and sensor was stopped
     assert touch_called
     assert sensor._running is False
+
+
+@pytest.mark.asyncio
+async def test_touch_pad_calibration_and_detection():
+    """Test that the touch pad backend calibrates and detects drops below the baseline."""
+    touch_called = False
+
+    async def on_touch():
+        nonlocal touch_called
+        touch_called = True
+
+    sensor = TouchPadSensor(pin=4, sensitivity=10, attack_ms=0)
+    sensor.on_touch(on_touch)
+    sensor.touch_pad._value = 600
+
+    await sensor.initialize()
+    assert sensor.baseline == 600
+    assert sensor.threshold == 540
+
+    await sample(sensor)
+    sensor.touch_pad._value = 550
+    await sample(sensor)
+    assert touch_called is False
+
+    sensor.touch_pad._value = 400
+    await sample(sensor)
+    assert touch_called is True
+
+
+@pytest.mark.asyncio
+async def test_touch_pad_baseline_tracks_drift():
+    """Test that the baseline follows slow drift only while released."""
+    sensor = TouchPadSensor(pin=4, drift_shift=2)
+    sensor.touch_pad._value = 600
+    await sensor.initialize()
+
+    sensor.touch_pad._value = 640
+    for _ in range(40):
+        sensor.is_touched()
+    assert sensor.baseline == 640
+    assert sensor.threshold == 576
+
+    # Touched readings never pull the baseline down
+    sensor.touch_pad._value = 300
+    for _ in range(40):
+        assert sensor.is_touched()
+    assert sensor.baseline == 640
+
+
+@pytest.mark.asyncio
+async def test_touch_pad_wake_from_deep_sleep():
+    import esp32
+
+    sensor = TouchPadSensor(pin=4)
+    await sensor.initialize()
+    sensor.enable_wake()
+
+    assert sensor.touch_pad.threshold == sensor.threshold
+    esp32.wake_on_touch.assert_called_with(True)
+
+
+def test_touch_pad_rejects_invalid_pins():
+    with pytest.raises(ValueError, match='not touch capable'):
+        TouchPadSensor(pin=5)
+    with pytest.raises(ValueError, match='IRQs'):
+        TouchPadSensor(pin=4, use_irq=True)
@@ -1,63 +1,290 @@
+import asyncio
+import os
+import struct
+import sys
+import time
 from unittest.mock import MagicMock
 
+import pytest
+import uasyncio
 from cube_orientation_sensor import CubeOrientationSensor, CubeSide
+from hardware_mock import MockI2C
 from machine import I2C, Pin
+from uasyncio_virtual_mock import VirtualLoop
+
+
+def set_accel(x, y, z, addr=0x68):
+    MockI2C.registers(addr)[0x3B:0x41] = struct.pack('>hhh', x, y, z)
 
 
 class TestCubeOrientationSensor:
     def setup_method(self):
+        MockI2C.reset()
         self.i2c = I2C(0, scl=Pin(22), sda=Pin(21))
         self.i2c.writeto_mem = MagicMock()
-        self.i2c.readfrom_mem = MagicMock()
         self.sensor = CubeOrientationSensor(self.i2c)
 
     def test_init_sensor(self):
         self.i2c.writeto_mem.assert_called_once_with(0x68, 0x6B, bytes([0]))
 
+    def test_read_raw_accel_single_burst(self):
+        set_accel(-2, 300, -16384)
+        self.i2c.readfrom_mem_into = MagicMock(wraps=self.i2c.readfrom_mem_into)
+
+        assert self.sensor._read_raw_accel() == (-2, 300, -16384)
+        self.i2c.readfrom_mem_into.assert_called_once_with(0x68, 0x3B, self.sensor._accel_buf)
+
+    def test_read_motion(self):
+        MockI2C.registers(0x68)[0x3B:0x49] = struct.pack('>hhhhhhh', 1, -2, 3, 1200, -4, 5, -6)
+        assert self.sensor.read_motion() == (1, -2, 3, 1200, -4, 5, -6)
+
     def test_get_cube_side_top(self):
-        self.i2c.readfrom_mem.side_effect = [
-            bytes([0x00, 0x00]),  # x = 0
-            bytes([0x00, 0x00]),  # y = 0
-            bytes([0x40, 0x00]),  # z = 16384 (positive)
-        ]
+        set_accel(0, 0, 16384)
         assert self.sensor.get_cube_side() == CubeSide.TOP
 
     def test_get_cube_side_bottom(self):
-        self.i2c.readfrom_mem.side_effect = [
-            bytes([0x00, 0x00]),  # x = 0
-            bytes([0x00, 0x00]),  # y = 0
-            bytes([0xC0, 0x00]),  # z = -16384 (negative)
-        ]
+        set_accel(0, 0, -16384)
         assert self.sensor.get_cube_side() == CubeSide.BOTTOM
 
     def test_get_cube_side_right(self):
-        self.i2c.readfrom_mem.side_effect = [
-            bytes([0x40, 0x00]),  # x = 16384 (positive)
-            bytes([0x00, 0x00]),  # y = 0
-            bytes([0x00, 0x00]),  # z = 0
-        ]
+        set_accel(16384, 0, 0)
         assert self.sensor.get_cube_side() == CubeSide.RIGHT
 
     def test_get_cube_side_left(self):
-        self.i2c.readfrom_mem.side_effect = [
-            bytes([0xC0, 0x00]),  # x = -16384 (negative)
-            bytes([0x00, 0x00]),  # y = 0
-            bytes([0x00, 0x00]),  # z = 0
-        ]
+        set_accel(-16384, 0, 0)
         assert self.sensor.get_cube_side() == CubeSide.LEFT
 
     def test_get_cube_side_front(self):
-        self.i2c.readfrom_mem.side_effect = [
-            bytes([0x00, 0x00]),  # x = 0
-            bytes([0x40, 0x00]),  # y = 16384 (positive)
-            bytes([0x00, 0x00]),  # z = 0
-        ]
+        set_accel(0, 16384, 0)
         assert self.sensor.get_cube_side() == CubeSide.FRONT
 
     def test_get_cube_side_back(self):
-        self.i2c.readfrom_mem.side_effect = [
-            bytes([0x00, 0x00]),  # x = 0
-            bytes([0xC0, 0x00]),  # y = -16384 (negative)
-            bytes([0x00, 0x00]),  # z = 0
-        ]
+        set_accel(0, -16384, 0)
         assert self.sensor.get_cube_side() == CubeSide.BACK
+
+
+class TestOrientationTracking:
+    def setup_method(self):
+        MockI2C.reset()
+        self.sensor = CubeOrientationSensor(I2C(0), settle_ms=100)
+        self.changes = []
+        self.sensor.on_side_change(lambda old, new: self.changes.append((old, new)))
+
+    def feed(self, x, y, z, start, end, step=20):
+        results = []
+        for now in range(start, end, step):
+            old = self.sensor._sample(x, y, z, now)
+            if old is not None:
+                results.append((old, self.sensor.side))
+        return results
+
+    def test_first_sample_sets_side_without_change(self):
+        assert self.feed(0, 0, 16384, 0, 20) == []
+        assert self.sensor.side == CubeSide.TOP
+        assert not self.sensor.settled
+
+    def test_settles_after_quiet_period(self):
+        self.feed(0, 0, 16384, 0, 100)
+        assert not self.sensor.settled
+        self.feed(0, 0, 16384, 100, 120)
+        assert self.sensor.settled
+
+    def test_reports_change_only_once_settled(self):
+        self.feed(0, 0, 16384, 0, 200)
+        # Turning onto the right side jolts the sensor, nothing is reported while moving
+        assert self.sensor._sample(16384, 0, 0, 200) is None
+        assert not self.sensor.settled
+
+        changes = self.feed(16384, 0, 0, 220, 600)
+        assert changes == [(CubeSide.TOP, CubeSide.RIGHT)]
+        assert self.sensor.settled
+
+    def test_hysteresis_near_45_degrees(self):
+        self.feed(0, 0, 16384, 0, 200)
+        # Slightly past 45 degrees towards the right side stays on top
+        assert self.feed(12000, 0, 11000, 200, 1000) == []
+        assert self.sensor.side == CubeSide.TOP
+        assert self.feed(14000, 0, 9000, 1000, 2000) == [(CubeSide.TOP, CubeSide.RIGHT)]
+
+    def test_monitor_fires_callbacks(self):
+        events = []
+        self.sensor.on_moving(lambda: events.append('moving'))
+        self.sensor.on_settled(lambda: events.append('settled'))
+
+        async def flip():
+            set_accel(0, 0, 16384)
+            await uasyncio.sleep_ms(500)
+            set_accel(0, -16384, 0)
+            await uasyncio.sleep_ms(500)
+            self.sensor.stop()
+
+        loop = VirtualLoop()
+        with loop.install():
+            loop.create_task(flip())
+            loop.run(self.sensor.monitor(), duration_ms=2000)
+
+        assert self.changes == [(CubeSide.TOP, CubeSide.BACK)]
+        assert events == ['settled', 'moving', 'settled']
+
+
+def set_fifo(samples, addr=0x68):
+    data = b''.join(struct.pack('>hhh', *sample) for sample in samples)
+    registers = MockI2C.registers(addr)
+    registers[0x72:0x74] = len(data).to_bytes(2, 'big')
+    registers[0x74 : 0x74 + len(data)] = data
+
+
+class TestMotionInterruptFifo:
+    def setup_method(self):
+        MockI2C.reset()
+        self.sensor = CubeOrientationSensor(I2C(0), int_pin=15, sample_ms=10, settle_ms=50)
+
+    def test_configures_fifo_and_motion_interrupt(self):
+        registers = MockI2C.registers(0x68)
+        assert registers[0x19] == 9  # 1 kHz / (1 + 9) = one sample every 10 ms
+        assert registers[0x23] == 0x08  # accelerometer into the FIFO
+        assert registers[0x6A] == 0x40  # FIFO enabled after reset
+        assert registers[0x1F] == 20  # 40 mg at 2 mg per LSB
+        assert registers[0x20] == 2
+        assert registers[0x37] == 0x30  # latched, cleared on read
+        assert registers[0x38] == 0x40  # motion interrupt
+
+    def test_drain_fifo_single_burst(self):
+        set_fifo([(0, 0, 16384)] * 3 + [(16384, 0, 0)])
+        reads = []
+        original = self.sensor.i2c.readfrom_mem_into
+        self.sensor.i2c.readfrom_mem_into = lambda addr, reg, buf: (
+            reads.append((reg, len(buf))),
+            original(addr, reg, buf),
+        )
+
+        assert asyncio.run(self.sensor.drain_fifo()) == 4
+        assert reads == [(0x3A, 1), (0x72, 2), (0x74, 24)]
+        assert self.sensor.side == CubeSide.TOP
+        assert self.sensor._filtered[0] > 0
+
+    def test_drain_fifo_resets_on_overflow(self):
+        set_fifo([(0, 0, 16384)] * 2)
+        MockI2C.registers(0x68)[0x3A] = 0x10
+        assert asyncio.run(self.sensor.drain_fifo()) == 0
+        assert self.sensor.fifo_overflows == 1
+
+    def test_enable_wake_uses_int_pin(self):
+        import esp32
+
+        self.sensor.enable_wake()
+        esp32.wake_on_ext0.assert_called_with(pin=self.sensor.int_pin, level=esp32.WAKEUP_ANY_HIGH)
+
+    def test_enable_wake_uses_gpio_wake_without_ext0(self, monkeypatch):
+        esp32 = MagicMock(spec=['wake_on_gpio', 'WAKEUP_ANY_HIGH'])
+        monkeypatch.setitem(sys.modules, 'esp32', esp32)
+
+        self.sensor.enable_wake()
+        esp32.wake_on_gpio.assert_called_with(
+            pins=(self.sensor.int_pin,), level=esp32.WAKEUP_ANY_HIGH
+        )
+
+    def test_enable_wake_unsupported_board(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, 'esp32', MagicMock(spec=['WAKEUP_ANY_HIGH']))
+        monkeypatch.setattr(
+            os, 'uname', lambda: MagicMock(machine='ESP32C3 module with ESP32C3'), raising=False
+        )
+
+        with pytest.raises(NotImplementedError, match='ESP32C3'):
+            self.sensor.enable_wake()
+
+    def test_monitor_sleeps_until_motion_interrupt(self):
+        loop = VirtualLoop()
+        with loop.install():
+            # The edge flag has to come from the virtual uasyncio
+            self.sensor = CubeOrientationSensor(I2C(0), int_pin=15, sample_ms=10, settle_ms=50)
+        changes = []
+        self.sensor.on_side_change(lambda old, new: changes.append((old, new)))
+        drains = []
+        original = self.sensor.drain_fifo
+
+        async def counted_drain():
+            drains.append(time.ticks_ms())
+            return await original()
+
+        self.sensor.drain_fifo = counted_drain
+        set_fifo([(0, 0, 16384)] * 8)
+
+        async def pick_up():
+            await uasyncio.sleep_ms(2000)
+            assert self.sensor.settled
+            quiet = len(drains)
+            await uasyncio.sleep_ms(2000)
+            assert len(drains) == quiet  # no polling while at rest
+
+            set_fifo([(16384, 0, 0)] * 8)
+            self.sensor.int_pin.value(1)
+            self.sensor.int_pin.value(0)
+            await uasyncio.sleep_ms(1000)
+            self.sensor.stop()
+
+        with loop.install():
+            loop.create_task(pick_up())
+            loop.run(self.sensor.monitor(), duration_ms=10_000)
+
+        assert changes == [(CubeSide.TOP, CubeSide.RIGHT)]
+
+
+class TestShakeAndTap:
+    def setup_method(self):
+        MockI2C.reset()
+        self.sensor = CubeOrientationSensor(I2C(0), shake_window=8, tap_quiet_ms=100)
+        self.now = 0
+
+    def feed(self, samples, step=10):
+        events = []
+        for x, y, z in samples:
+            self.sensor._sample(x, y, z, self.now)
+            shake, tap = self.sensor._detect(x, y, z, self.now)
+            if shake:
+                events.append(('shake', self.now))
+            if tap:
+                events.append(('tap', self.now))
+            self.now += step
+        return events
+
+    def test_resting_cube_has_no_events(self):
+        assert self.feed([(0, 0, 16384)] * 50) == []
+
+    def test_single_spike_is_a_tap(self):
+        self.feed([(0, 0, 16384)] * 10)
+        events = self.feed([(0, 0, 30000)] + [(0, 0, 16384)] * 20)
+        assert events == [('tap', 210)]  # spike and rebound, then 100 ms quiet
+
+    def test_spikes_close_together_are_not_a_tap(self):
+        self.feed([(0, 0, 16384)] * 10)
+        events = self.feed([(0, 0, 30000), (0, 0, 16384)] * 4 + [(0, 0, 16384)] * 20)
+        assert 'tap' not in [name for name, _ in events]
+
+    def test_shake_reported_once_per_cooldown(self):
+        self.feed([(0, 0, 16384)] * 10)
+        shaking = [(12000, -8000, 16384), (-12000, 8000, 16384)] * 60
+        events = self.feed(shaking)
+        assert [name for name, _ in events] == ['shake', 'shake']
+        assert events[1][1] - events[0][1] >= 1000
+
+    def test_monitor_fires_shake_and_tap_callbacks(self):
+        events = []
+        self.sensor.on_shake(lambda: events.append('shake'))
+        self.sensor.on_tap(lambda: events.append('tap'))
+
+        async def handle():
+            set_accel(0, 0, 16384)
+            await uasyncio.sleep_ms(500)
+            set_accel(0, 0, 32000)
+            await uasyncio.sleep_ms(20)
+            set_accel(0, 0, 16384)
+            await uasyncio.sleep_ms(500)
+            self.sensor.stop()
+
+        loop = VirtualLoop()
+        with loop.install():
+            loop.create_task(handle())
+            loop.run(self.sensor.monitor(), duration_ms=2000)
+
+        assert events == ['tap']
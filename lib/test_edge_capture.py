@@ -0,0 +1,41 @@
+import time
+
+import pytest
+from edge_capture import EdgeCapture
+from pin_mock import MockPin
+
+
+def test_edge_capture_records_timestamps():
+    pin = MockPin(4, MockPin.IN)
+    edges = EdgeCapture(pin)
+    edges.start()
+
+    start = time.ticks_us()
+    pin.value(1)
+    time.sleep_us(250)
+    pin.value(0)
+
+    assert edges.pop() == (start, 1)
+    assert edges.pop() == (start + 250, 0)
+    assert not edges.pending()
+
+
+def test_edge_capture_overflow():
+    pin = MockPin(4, MockPin.IN)
+    edges = EdgeCapture(pin, size=4)
+    edges.start()
+
+    for _ in range(4):
+        pin.toggle()
+
+    assert edges.overflows == 1
+    popped = 0
+    while edges.pending():
+        edges.pop()
+        popped += 1
+    assert popped == 3
+
+
+def test_edge_capture_requires_power_of_two():
+    with pytest.raises(ValueError, match='power of two'):
+        EdgeCapture(MockPin(4, MockPin.IN), size=10)
@@ -0,0 +1,135 @@
+import pytest
+from button import Button
+from event_dispatcher import EventDispatcher
+
+from lib.audio_amplifier import AudioAmplifier
+
+
+def make_recorder():
+    calls = []
+
+    async def callback(*args):
+        calls.append(args)
+
+    return calls, callback
+
+
+@pytest.mark.asyncio
+async def test_queue_policy_keeps_order_and_bounds():
+    dispatcher = EventDispatcher()
+    channel = dispatcher.channel(EventDispatcher.QUEUE, size=2)
+    calls, callback = make_recorder()
+
+    assert channel.post(callback, (1,))
+    assert channel.post(callback, (2,))
+    assert not channel.post(callback, (3,))
+    assert channel.dropped == 1
+
+    await dispatcher.run_pending()
+    assert calls == [(1,), (2,)]
+    assert channel.pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_ignores_events_while_pending():
+    dispatcher = EventDispatcher()
+    channel = dispatcher.channel(EventDispatcher.DROP, size=4)
+    calls, callback = make_recorder()
+
+    assert channel.post(callback)
+    assert not channel.post(callback)
+
+    await dispatcher.run_pending()
+    assert calls == [()]
+    assert channel.post(callback)
+
+
+@pytest.mark.asyncio
+async def test_coalesce_policy_keeps_latest_arguments():
+    dispatcher = EventDispatcher()
+    channel = dispatcher.channel(EventDispatcher.COALESCE, size=2)
+    calls, callback = make_recorder()
+    other_calls, other = make_recorder()
+
+    channel.post(callback, ('old',))
+    channel.post(other, ('other',))
+    channel.post(callback, ('new',))
+
+    await dispatcher.run_pending()
+    assert calls == [('new',)]
+    assert other_calls == [('other',)]
+
+
+@pytest.mark.asyncio
+async def test_busy_channel_is_not_run_concurrently():
+    dispatcher = EventDispatcher()
+    channel = dispatcher.channel()
+    calls, callback = make_recorder()
+    channel.post(callback)
+
+    channel._busy = True
+    assert dispatcher._next_ready() is None
+    channel._busy = False
+    assert dispatcher._next_ready() is channel
+
+
+@pytest.mark.asyncio
+async def test_failing_callback_does_not_block_channel():
+    dispatcher = EventDispatcher()
+    channel = dispatcher.channel()
+    calls, callback = make_recorder()
+
+    async def failing():
+        raise RuntimeError('boom')
+
+    channel.post(failing)
+    channel.post(callback)
+    await dispatcher.run_pending()
+
+    assert calls == [()]
+    assert not channel._busy
+
+
+@pytest.mark.asyncio
+async def test_button_posts_callbacks_without_running_them():
+    dispatcher = EventDispatcher()
+    calls, callback = make_recorder()
+
+    button = Button(pin=0, debug=False)
+    button.use_dispatcher(dispatcher, EventDispatcher.DROP, size=1)
+    button.on_press(callback)
+
+    button.pin.value(1)
+    await button._check_once()
+    for _ in range(2):
+        button.pin.value(0)
+        await button._check_once()
+        button.pin.value(1)
+        await button._check_once()
+
+    assert calls == []
+    assert button._channel.dropped == 1
+
+    await dispatcher.run_pending()
+    assert calls == [()]
+
+
+@pytest.mark.asyncio
+async def test_amplifier_passes_status_to_dispatched_callback():
+    dispatcher = EventDispatcher()
+    calls, callback = make_recorder()
+
+    amp = AudioAmplifier(data_pin=25)
+    amp.use_dispatcher(dispatcher)
+    amp.on_status_change(callback)
+
+    await amp._run_callback('status_change', {'playing': False})
+    await amp._run_callback('status_change', {'playing': True})
+    await dispatcher.run_pending()
+
+    assert calls == [({'playing': True},)]
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError, match='Unknown dispatch policy'):
+        EventDispatcher().channel('fifo')
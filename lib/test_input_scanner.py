@@ -0,0 +1,101 @@
+import time
+from unittest.mock import MagicMock
+
+import machine
+import pytest
+from button import Button, DebouncedButton
+from capacitive_touch_sensor import CapacitiveTouchSensor
+from input_scanner import InputScanner
+
+
+async def scan(scanner, times=1):
+    for _ in range(times):
+        await scanner._scan_once()
+
+
+@pytest.mark.asyncio
+async def test_scanner_debounces_button():
+    presses = 0
+
+    async def on_press():
+        nonlocal presses
+        presses += 1
+
+    scanner = InputScanner(debounce_samples=3)
+    button = scanner.add(Button(pin=0, debug=False))
+    button.on_press(on_press)
+
+    button.pin.value(1)
+    await scan(scanner)
+
+    # A single-sample glitch is ignored
+    button.pin.value(0)
+    await scan(scanner)
+    button.pin.value(1)
+    await scan(scanner, 3)
+    assert button._was_pressed is False
+
+    button.pin.value(0)
+    await scan(scanner, 2)
+    assert button._was_pressed is False
+    await scan(scanner)
+    assert button._was_pressed is True
+
+    button.pin.value(1)
+    await scan(scanner, 3)
+    assert presses == 1
+
+
+@pytest.mark.asyncio
+async def test_scanner_handles_mixed_inputs():
+    events = []
+
+    async def on_down():
+        events.append('button')
+
+    async def on_touch():
+        events.append('touch')
+
+    scanner = InputScanner(debounce_samples=1)
+    button = scanner.add(DebouncedButton(pin=0, debug=False))
+    sensor = scanner.add(CapacitiveTouchSensor(pin=1))
+    button.on_button_down(on_down)
+    sensor.on_touch(on_touch)
+
+    button.pin.value(1)
+    sensor.pin.value(0)
+    await scan(scanner)
+
+    button.pin.value(0)
+    sensor.pin.value(1)
+    await scan(scanner)
+    assert events == ['button']
+
+    # The touch sensor integrates raw samples for its attack time
+    time.sleep_ms(sensor.attack_ms)
+    await scan(scanner)
+    assert events == ['button', 'touch']
+    assert sensor.touched is True
+
+
+@pytest.mark.asyncio
+async def test_scanner_reads_port_register(monkeypatch):
+    registers = {0x6000403C: 1 << 9}
+    monkeypatch.setattr(machine, 'mem32', registers, raising=False)
+
+    scanner = InputScanner(debounce_samples=1, port_reg=0x6000403C)
+    button = scanner.add(Button(pin=9, debug=False))
+    button.pin.value = MagicMock(side_effect=AssertionError('pin read directly'))
+
+    await scan(scanner)
+    assert button._was_pressed is False
+
+    registers[0x6000403C] = 0
+    await scan(scanner)
+    assert button._was_pressed is True
+
+
+def test_scanner_rejects_pins_outside_port_register():
+    scanner = InputScanner(port_reg=0x3FF4403C)
+    with pytest.raises(ValueError, match='not in the GPIO input register'):
+        scanner.add(Button(pin=34, debug=False))
@@ -206,3 +206,16 @@ async def test_monitor(mock_pin):
         pytest.fail(f'Test failed with: {e}')
     finally:
         uasyncio.sleep = original_sleep
+
+
+def test_toggle_power_keeps_monitor_running(mock_pin):
+    pin_matrix = [[mock_pin(0), mock_pin(1)]]
+    matrix = LedMatrix(pin_matrix)
+    matrix._running = True
+
+    matrix.toggle_power()
+    assert matrix._running
+
+    matrix.toggle_power()
+    assert matrix._running
+    assert matrix.is_powered
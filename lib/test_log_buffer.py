@@ -0,0 +1,134 @@
+import struct
+
+import pytest
+import uasyncio
+from log_buffer import LogBuffer
+from logger import Logger
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / 'log.bin')
+
+
+def records(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    return list(struct.iter_unpack('<iiii', data))
+
+
+def test_rejects_non_power_of_two_capacity(log_path):
+    with pytest.raises(ValueError):
+        LogBuffer(log_path, page_records=3, pages=2)
+
+
+def test_records_header_and_int_args(log_path):
+    buffer = LogBuffer(log_path, page_records=4, pages=2)
+    logger = Logger(prefix='Test', buffer=buffer)
+    logger.info('Pin %d is %s', 4, 'high')
+    buffer.flush()
+
+    boot, record = records(log_path)
+    _, header, arg0, arg1 = record
+    assert header & 0xFFFF == 1
+    assert (header >> 16) & 0xFF == 1
+    assert (header >> 24) & 0x3 == Logger.INFO
+    assert (header >> 26) & 0x3 == 2
+    assert (header >> 28) & 0x3 == 0b10
+    assert (arg0, arg1) == (4, 0)
+    assert buffer.pending() == 0
+
+
+def test_records_regardless_of_debug_and_rate_limit(log_path, capsys):
+    buffer = LogBuffer(log_path, page_records=4, pages=2)
+    logger = Logger(prefix='Test', buffer=buffer)
+    assert logger.enabled_for(Logger.INFO)
+    for i in range(3):
+        logger.info('Burst %d', i)
+
+    assert buffer.pending() == 4
+    assert capsys.readouterr().out == ''
+
+
+def test_level_filter_applies_to_buffer(log_path):
+    buffer = LogBuffer(log_path, page_records=4, pages=2)
+    logger = Logger(prefix='Test', level=Logger.ERROR, buffer=buffer)
+    logger.info('skipped')
+    logger.error('kept')
+    assert buffer.pending() == 2
+
+
+def test_spill_writes_only_full_pages(log_path):
+    buffer = LogBuffer(log_path, page_records=4, pages=2)
+    for i in range(5):
+        buffer.log('Test', Logger.INFO, 'n=%d', (i,))
+
+    assert buffer.spill() == 4
+    assert buffer.pending() == 2
+    assert buffer.spill() == 0
+    assert buffer.flush() == 2
+    assert len(records(log_path)) == 6
+    assert [r[2] for r in records(log_path)][1:] == [0, 1, 2, 3, 4]
+
+
+def test_wrap_drops_oldest_page(log_path):
+    buffer = LogBuffer(log_path, page_records=2, pages=2)
+    for i in range(5):
+        buffer.log('Test', Logger.INFO, 'n=%d', (i,))
+
+    assert buffer.lost == 2
+    buffer.flush()
+    assert [r[2] for r in records(log_path)] == [1, 2, 3, 4]
+
+
+def test_rotates_when_file_is_full(log_path):
+    buffer = LogBuffer(log_path, page_records=2, pages=2, max_bytes=32)
+    buffer.log('Test', Logger.INFO, 'first', ())
+    buffer.spill()
+    buffer.log('Test', Logger.INFO, 'second', ())
+    buffer.log('Test', Logger.INFO, 'third', ())
+    buffer.spill()
+
+    assert len(records(log_path + '.old')) == 2
+    assert len(records(log_path)) == 2
+
+
+def test_table_survives_reboot(log_path):
+    buffer = LogBuffer(log_path, page_records=2, pages=2)
+    buffer.log('Test', Logger.INFO, 'hello', ())
+    buffer.flush()
+
+    rebooted = LogBuffer(log_path, page_records=2, pages=2)
+    rebooted.log('Other', Logger.INFO, 'new', ())
+    rebooted.log('Test', Logger.INFO, 'hello', ())
+    rebooted.flush()
+
+    headers = [r[1] & 0xFFFFFF for r in records(log_path)]
+    assert headers[1] == headers[4] == (1 << 16 | 1)
+    assert headers[3] == (2 << 16 | 2)
+
+
+def test_full_table_records_reserved_overflow_id(log_path):
+    buffer = LogBuffer(log_path, page_records=2, pages=2)
+    for i in range(300):
+        buffer.log(f'Logger {i}', Logger.INFO, 'hello', ())
+
+    assert max(buffer._loggers.values()) == 254
+    assert buffer._buf[(buffer._head - 1) * 4 + 1] >> 16 & 0xFF == 255
+    assert buffer._id({'a': 0, 'b': 1}, 'c', 4) == 2
+    assert buffer._id({'a': 0, 'b': 1, 'c': 2}, 'd', 4) == 3
+
+
+@pytest.mark.asyncio
+async def test_monitor_spills_periodically(log_path, monkeypatch):
+    buffer = LogBuffer(log_path, page_records=2, pages=2, spill_ms=100)
+    buffer.log('Test', Logger.INFO, 'tick', ())
+
+    async def stop_after_sleep(ms):
+        buffer._running = False
+
+    monkeypatch.setattr(uasyncio.sleep_ms, 'side_effect', stop_after_sleep)
+    await buffer.monitor()
+
+    uasyncio.sleep_ms.assert_called_with(100)
+    assert len(records(log_path)) == 2
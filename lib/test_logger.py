@@ -0,0 +1,62 @@
+import time
+
+from logger import Logger
+
+
+class Exploding:
+    def __str__(self):
+        raise AssertionError('formatted while disabled')
+
+
+def test_disabled_logger_does_not_format(capsys):
+    logger = Logger(prefix='Test')
+    logger.info('Value %s', Exploding())
+    logger.error('Value %s', Exploding())
+    assert capsys.readouterr().out == ''
+
+
+def test_formats_arguments_lazily(capsys):
+    logger = Logger(prefix='Test', debug=True)
+    logger.info('Pin %d is %s', 4, 'high')
+    assert capsys.readouterr().out == '[Test] Pin 4 is high\n'
+
+
+def test_message_without_args_is_not_formatted(capsys):
+    logger = Logger(prefix='Test', debug=True)
+    logger.info('Volume 100%')
+    assert capsys.readouterr().out == '[Test] Volume 100%\n'
+
+
+def test_error_prefix(capsys):
+    logger = Logger(prefix='Test', debug=True)
+    logger.error('Failed %s', 'read')
+    assert capsys.readouterr().out == '[Test] ERROR: Failed read\n'
+
+
+def test_level_filter_and_enabled_for(capsys):
+    logger = Logger(prefix='Test', debug=True, level=Logger.ERROR)
+    assert not logger.enabled_for(Logger.INFO)
+    assert logger.enabled_for(Logger.ERROR)
+    logger.info('Skipped %s', Exploding())
+    assert capsys.readouterr().out == ''
+    assert not Logger(debug=False).enabled_for(Logger.ERROR)
+
+
+def test_thresholds_are_per_level(capsys):
+    logger = Logger(prefix='Test', debug=True)
+    logger.set_threshold(1, level=Logger.INFO)
+    logger.set_threshold(0, level=Logger.ERROR)
+
+    logger.info('first')
+    logger.info('second')
+    logger.error('one')
+    logger.error('two')
+    assert capsys.readouterr().out.splitlines() == [
+        '[Test] first',
+        '[Test] ERROR: one',
+        '[Test] ERROR: two',
+    ]
+
+    time.sleep(1)
+    logger.info('third')
+    assert capsys.readouterr().out == '[Test] third\n'
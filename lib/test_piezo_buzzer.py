@@ -1,6 +1,13 @@
+import time
+from array import array
+
 import pytest
+import time_mock
+import uasyncio
+from pin_mock import MockPin
+from uasyncio_virtual_mock import VirtualLoop
 
-from lib.piezo_buzzer import PiezoBuzzer
+from lib.piezo_buzzer import PiezoBuzzer, compile_song
 from lib.piezo_buzzer_songs import COME_AS_YOU_ARE
 from lib.piezo_buzzer_types import Duration, Note
 
@@ -91,3 +98,161 @@ async def test_play_song_timing():
 
     # Verify sequence of events (on-off-gap-on-off)
     assert note_sequence == ['on', 'off', 'on', 'off'], 'Notes should follow on-off-on-off pattern'
+
+
+def test_compile_song():
+    compiled = compile_song([(Note.C4, Duration.QUARTER), (Note.REST, 100)])
+    assert compiled == array('H', [262, 250, 0, 100])
+    assert compile_song(compiled) is compiled
+
+
+def _play_traced(song, slow_ms=0, **kwargs):
+    trace = MockPin.start_trace()
+    try:
+        loop = VirtualLoop()
+        with loop.install():
+            buzzer = PiezoBuzzer(15)
+            turn_on = buzzer._turn_on
+
+            def slow_turn_on():
+                turn_on()
+                time_mock.advance_time(slow_ms / 1000)  # a busy system wakes up late
+
+            buzzer._turn_on = slow_turn_on
+            start = time.ticks_us()
+            loop.run(buzzer.play_song(song, **kwargs))
+    finally:
+        MockPin.stop_trace()
+    return [
+        ((t - start) // 1000, value) for t, value in trace.transitions('pwm_15_duty') if t >= start
+    ]
+
+
+def test_sequencer_deadlines_from_song_start():
+    song = compile_song([(Note.C4, 200), (Note.REST, 100), (Note.D4, 200)])
+    # Every note, rests included, is followed by the 50 ms gap
+    assert _play_traced(song) == [(0, 32768), (200, 0), (400, 32768), (600, 0)]
+    # Late note starts do not push the following notes back
+    assert _play_traced(song, slow_ms=30) == [(0, 32768), (200, 0), (400, 32768), (600, 0)]
+
+
+def test_sequencer_tempo_and_articulation():
+    song = compile_song([(Note.C4, 200), (Note.D4, 200)])
+    duty = _play_traced(song, tempo=200, articulation=50, gap_ms=0)
+    assert duty == [(0, 32768), (50, 0), (100, 32768), (150, 0)]
+
+
+def test_sequencer_loops_and_stop():
+    buzzer_song = compile_song([(Note.C4, 100)])
+    loop = VirtualLoop()
+    with loop.install():
+        buzzer = PiezoBuzzer(15)
+        played = []
+        buzzer.pwm.pwm.freq = lambda value=None: played.append(value)
+
+        async def stop_later():
+            await uasyncio.sleep_ms(1000)
+            buzzer.stop()
+
+        loop.create_task(stop_later())
+        loop.run(buzzer.play_song(buzzer_song, gap_ms=0, loops=0))
+
+    assert len(played) == 10
+    assert buzzer.pwm.duty_u16 == 0
+
+
+def test_arpeggio_cycles_chord_from_timer():
+    buzzer = PiezoBuzzer(15)
+    played = []
+    buzzer.pwm.pwm.freq = lambda value=None: played.append(value)
+
+    buzzer.start_arpeggio([Note.C4, Note.E4, Note.G4], rate_hz=50)
+    assert buzzer._timer.period == 20
+    assert buzzer.pwm.duty_u16 == 32768
+
+    buzzer._timer.run_for(140)
+    assert played == [262, 330, 392, 262, 330, 392, 262, 330]
+
+    timer = buzzer._timer
+    buzzer.stop()
+    assert not timer.active
+    assert buzzer._timer is None
+    assert buzzer.pwm.duty_u16 == 0
+
+
+def test_arpeggio_rejects_empty_chord():
+    buzzer = PiezoBuzzer(15)
+    with pytest.raises(ValueError):
+        buzzer.start_arpeggio([])
+    with pytest.raises(ValueError):
+        buzzer.start_arpeggio([Note.REST, Note.REST])
+    assert buzzer._timer is None
+
+
+def test_arpeggio_skips_rests_and_rejects_negative_frequencies():
+    buzzer = PiezoBuzzer(15)
+    with pytest.raises(ValueError):
+        buzzer.start_arpeggio([Note.C4, -330])
+    assert buzzer._timer is None
+    assert buzzer.pwm.duty_u16 == 0
+
+    buzzer.start_arpeggio([Note.C4, Note.REST, Note.G4])
+    assert list(buzzer._arp_freqs) == [262, 392]
+    buzzer.stop()
+
+
+def test_play_chord_stops_timer_after_duration():
+    loop = VirtualLoop()
+    with loop.install():
+        buzzer = PiezoBuzzer(15)
+        started = []
+        start_arpeggio = buzzer.start_arpeggio
+
+        def record_start(*args):
+            start_arpeggio(*args)
+            started.append(buzzer._timer)
+
+        buzzer.start_arpeggio = record_start
+        start = time.ticks_ms()
+        loop.run(buzzer.play_chord([440, 554, 659], 500, rate_hz=100))
+
+    assert time.ticks_ms() - start == 500
+    assert started[0].period == 10
+    assert not started[0].active
+    assert buzzer.pwm.duty_u16 == 0
+
+
+def test_play_song_stops_running_arpeggio():
+    loop = VirtualLoop()
+    with loop.install():
+        buzzer = PiezoBuzzer(15)
+        buzzer.start_arpeggio([Note.C4, Note.E4, Note.G4])
+        timer = buzzer._timer
+        played = []
+        buzzer.pwm.pwm.freq = lambda value=None: played.append(value)
+
+        loop.run(buzzer.play_song(compile_song([(Note.A4, 100)]), gap_ms=0))
+        timer.fire(3)  # a late tick must not change the note
+
+    assert not timer.active
+    assert played == [440]
+
+
+def test_stop_turns_off_once(mocker):
+    buzzer = PiezoBuzzer(15)
+    buzzer.start_arpeggio([Note.C4, Note.E4])
+    turn_off = mocker.spy(buzzer, '_turn_off')
+    buzzer.stop()
+    assert turn_off.call_count == 1
+
+    buzzer.stop()
+    assert turn_off.call_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('kwargs', [{'tempo': 0}, {'articulation': 0}, {'articulation': 101}])
+async def test_play_song_rejects_invalid_timing(kwargs):
+    buzzer = PiezoBuzzer(15)
+    with pytest.raises(ValueError):
+        await buzzer.play_song([(Note.C4, 100)], **kwargs)
+    assert buzzer.pwm.duty_u16 == 0
@@ -0,0 +1,65 @@
+import pytest
+
+from lib.piezo_buzzer_parser import parse_rtttl, parse_song, parse_text
+from lib.piezo_buzzer_types import Note, note_frequency
+
+
+def test_note_frequency_matches_note_constants():
+    assert note_frequency(0, 4) == Note.C4
+    assert note_frequency(6, 4) == Note.FS4
+    assert note_frequency(9, 4) == Note.A4
+    assert note_frequency(0, 5) == Note.C5
+
+
+def test_note_frequency_full_range():
+    assert note_frequency(9, 0) == 28  # A0 = 27.5 Hz
+    assert note_frequency(9, 8) == 7040
+    assert note_frequency(-1, 4) == note_frequency(11, 3)
+    assert note_frequency(12, 4) == note_frequency(0, 5)
+    with pytest.raises(ValueError):
+        note_frequency(0, 9)
+
+
+def test_parse_rtttl():
+    song = parse_rtttl('tune:d=4,o=5,b=120:8c6,a,p,2g#4.,c.6')
+    assert list(song) == [
+        1047, 250,  # 8c6: eighth at 120 bpm
+        880, 500,  # a: default quarter in octave 5
+        0, 500,  # pause
+        415, 1500,  # dotted half g#4
+        1047, 750,  # dotted quarter c6, dot after the octave
+    ]  # fmt: skip
+
+
+def test_parse_rtttl_defaults_and_errors():
+    assert list(parse_rtttl('x::a')) == [1760, 952]  # d=4, o=6, b=63
+    assert list(parse_rtttl('x:o=5:a0,c8')) == [28, 952, 4186, 952]  # explicit octave 0
+    with pytest.raises(ValueError):
+        parse_rtttl('x::0a')  # explicit divisor 0
+    with pytest.raises(ValueError):
+        parse_rtttl('x:d=4')
+    with pytest.raises(ValueError):
+        parse_rtttl('x:q=4:a')
+    with pytest.raises(ValueError):
+        parse_rtttl('x:d=4:h')
+
+
+def test_parse_text():
+    song = parse_text("""
+        # comment with a : colon
+        bpm=120
+        C4 D#4/8 Eb4/8.  # trailing comment
+        R/2 A3/1
+    """)
+    assert list(song) == [262, 500, 311, 250, 311, 375, 0, 1000, 220, 2000]
+
+
+def test_parse_text_errors():
+    for text in ('H4', 'C', 'C4/x', 'C#/4'):
+        with pytest.raises(ValueError):
+            parse_text(text)
+
+
+def test_parse_song_detects_format():
+    assert parse_song('x:d=4,o=4,b=240:c') == parse_rtttl('x:d=4,o=4,b=240:c')
+    assert list(parse_song('bpm=240\nC4')) == [262, 250]
@@ -0,0 +1,50 @@
+import types
+from array import array
+
+import pytest
+
+from lib import piezo_buzzer_songs
+from lib.piezo_buzzer_songs import list_songs, load_song
+
+
+def test_load_text_and_rtttl(tmp_path):
+    (tmp_path / 'beep.txt').write_text('C4 R/8')
+    (tmp_path / 'ring.rtttl').write_text('ring:d=8,o=5,b=240:a')
+    assert list(load_song('beep', [str(tmp_path)])) == [262, 250, 0, 125]
+    assert list(load_song('ring', [str(tmp_path)])) == [880, 125]
+
+
+def test_binary_song_wins_and_paths_are_searched_in_order(tmp_path):
+    flash, sd = tmp_path / 'flash', tmp_path / 'sd'
+    flash.mkdir()
+    sd.mkdir()
+    (sd / 'tune.txt').write_text('C4')
+    assert list(load_song('tune', [str(flash), str(sd)])) == [262, 250]
+
+    (flash / 'tune.txt').write_text('D4')
+    (flash / 'tune.bin').write_bytes(array('H', [440, 100]).tobytes())
+    assert load_song('tune', [str(flash), str(sd)]) == array('H', [440, 100])
+    assert list_songs([str(flash), str(sd), str(tmp_path / 'missing')]) == ['tune']
+
+
+def test_missing_song(tmp_path):
+    with pytest.raises(ValueError):
+        load_song('missing', [str(tmp_path)])
+
+
+def test_builtin_songs_load_lazily():
+    assert 'smoke_on_the_water' in list_songs()
+    song = piezo_buzzer_songs.SMOKE_ON_THE_WATER
+    assert list(song[:6]) == [294, 250, 349, 500, 392, 500]
+    with pytest.raises(AttributeError):
+        getattr(piezo_buzzer_songs, 'NOT_A_SONG')  # noqa: B009
+
+
+def test_songs_dir_on_host_and_device(monkeypatch):
+    assert piezo_buzzer_songs._songs_dir('/repo/lib/piezo_buzzer_songs.py') == '/repo/songs'
+    assert piezo_buzzer_songs._songs_dir('lib/piezo_buzzer_songs.py') == 'songs'
+
+    # Imported as lib.piezo_buzzer_songs on the device, songs are still in /songs
+    micropython = types.SimpleNamespace(name='micropython')
+    monkeypatch.setattr(piezo_buzzer_songs.sys, 'implementation', micropython)
+    assert piezo_buzzer_songs._songs_dir('lib/piezo_buzzer_songs.py') == '/songs'
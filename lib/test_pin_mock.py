@@ -0,0 +1,52 @@
+import pytest
+from pin_mock import MockPin
+
+
+@pytest.fixture
+def history_limit():
+    def set_limit(limit):
+        MockPin.history_limit = limit
+
+    yield set_limit
+    MockPin.history_limit = None
+
+
+def test_quiet_by_default(capsys):
+    pin = MockPin(1)
+    pin.on()
+    pin.on()
+    assert capsys.readouterr().out == ''
+    assert list(pin.history) == [1]
+
+
+def test_verbose_prints_changes(capsys, monkeypatch):
+    monkeypatch.setattr(MockPin, 'verbose', True)
+    pin = MockPin(1)
+    pin.on()
+    pin.on()
+    assert capsys.readouterr().out.splitlines() == [
+        'Created MockPin 1 with mode out',
+        'Pin 1 value changed from 0 to 1',
+        'Pin 1 value unchanged at 1',
+    ]
+
+
+def test_bounded_history_keeps_latest(history_limit):
+    history_limit(3)
+    pin = MockPin(1)
+    for _ in range(5):
+        pin.toggle()
+    assert list(pin.history) == [1, 0, 1]
+    assert pin.history.maxlen == 3  # a ring, full writes do not shift the history
+
+    history_limit(2)
+    pin.toggle()
+    assert list(pin.history) == [1, 0]
+
+
+def test_history_can_be_disabled(history_limit):
+    history_limit(0)
+    pin = MockPin(1)
+    pin.toggle()
+    assert len(pin.history) == 0
+    assert pin.value() == 1
@@ -0,0 +1,136 @@
+import time
+
+import pytest
+from machine import PWM
+from pin_mock import MockPin
+from pin_trace_mock import PinTrace
+
+
+@pytest.fixture
+def trace():
+    trace = MockPin.start_trace()
+    yield trace
+    MockPin.stop_trace()
+
+
+def toggle(pin, times, high_us, low_us):
+    for _ in range(times):
+        pin.on()
+        time.sleep_us(high_us)
+        pin.off()
+        time.sleep_us(low_us)
+
+
+def test_records_transitions_with_virtual_time(trace):
+    pin = MockPin(5)
+    start = time.ticks_us()
+    pin.on()
+    time.sleep_us(250)
+    pin.on()
+    pin.off()
+
+    assert trace.transitions(5) == [(start, 0), (start, 1), (start + 250, 0)]
+    assert len(trace) == 3
+
+
+def test_start_trace_records_existing_pins():
+    pin = MockPin(2)
+    pin.on()
+    trace = MockPin.start_trace()
+    assert trace.transitions(2) == [(time.ticks_us(), 1)]
+    assert MockPin.stop_trace() is trace
+    pin.off()
+    assert len(trace) == 1
+
+
+def test_pulse_widths_frequency_and_duty(trace):
+    pin = MockPin(4)
+    toggle(pin, 5, high_us=250, low_us=750)
+
+    assert trace.pulse_widths(4) == [250] * 5
+    assert trace.pulse_widths(4, level=0) == [750] * 4
+    assert trace.period_us(4) == 1000
+    assert trace.frequency(4) == 1000
+    assert trace.duty_cycle(4) == 0.25
+    assert len(trace.edges(4, rising=False)) == 5
+
+
+def test_queries_without_enough_edges(trace):
+    MockPin(4).on()
+    assert trace.frequency(4) is None
+    assert trace.duty_cycle(4) is None
+    assert trace.pulse_widths('missing') == []
+
+
+def test_records_pwm_changes(trace):
+    pwm = PWM(MockPin(12))
+    pwm.freq(440)
+    pwm.duty_u16(32768)
+    pwm.duty_u16(32768)
+    time.sleep_us(100)
+    pwm.duty_u16(0)
+
+    assert [v for _, v in trace.transitions('pwm_12_duty')] == [32768, 0]
+    assert trace.pulse_widths('pwm_12_duty', level=32768) == []
+    assert trace.transitions('pwm_12_freq')[0][1] == 440
+
+
+def test_export_vcd(tmp_path, trace):
+    clock = MockPin(18)
+    data = MockPin((0, 1))
+    trace.record('duty', 1000)
+    toggle(clock, 2, high_us=10, low_us=10)
+    data.on()
+
+    path = tmp_path / 'trace.vcd'
+    trace.export_vcd(path)
+    lines = path.read_text().splitlines()
+
+    assert lines[:7] == [
+        '$timescale 1us $end',
+        '$scope module toy_blocks $end',
+        '$var wire 1 ! pin_18 $end',
+        '$var wire 1 " pin__0__1 $end',
+        '$var wire 10 # duty $end',
+        '$upscope $end',
+        '$enddefinitions $end',
+    ]
+    assert lines[7:] == [
+        '#0',
+        '0!',
+        '0"',
+        'b1111101000 #',
+        '1!',
+        '#10',
+        '0!',
+        '#20',
+        '1!',
+        '#30',
+        '0!',
+        '#40',
+        '1"',
+    ]
+
+
+def test_export_vcd_negative_values(tmp_path):
+    trace = PinTrace()
+    trace.record('offset', 5, time_us=0)
+    trace.record('offset', -5, time_us=10)
+    trace.record('offset', 0, time_us=20)
+
+    path = tmp_path / 'trace.vcd'
+    trace.export_vcd(path)
+    lines = path.read_text().splitlines()
+
+    assert '$var wire 4 ! offset $end' in lines
+    assert lines[-5:] == ['b0101 !', '#10', 'b1011 !', '#20', 'b0000 !']
+
+
+def test_record_with_explicit_time():
+    trace = PinTrace()
+    trace.record('clk', 0, time_us=0)
+    trace.record('clk', 1, time_us=5)
+    trace.record('clk', 0, time_us=10)
+    assert trace.pulse_widths('clk') == [5]
+    trace.clear()
+    assert len(trace) == 0
@@ -1,5 +1,7 @@
 import pytest
+import uasyncio
 from uasyncio_mock import mock_sleep, reset_mock_sleep
+from uasyncio_virtual_mock import VirtualLoop
 
 from lib.rolling_dice import RollingDice
 from lib.shift_register import ShiftRegister
@@ -182,3 +184,127 @@ Dice LED Pin Layout:
    (LL)   (LR)"""
 
     assert captured.out.strip() == expected_output.strip()
+
+
+@pytest.mark.asyncio
+async def test_roll_latches_once_per_frame(mocker):
+    shift_register = ShiftRegister(5, 6, 7)
+    dice = RollingDice([(shift_register, i) for i in range(7)])
+    update = mocker.spy(shift_register, 'update')
+    mocker.patch('random.randint', return_value=3)
+
+    await dice.roll()
+
+    # Every animation step plus the final face is a single update
+    assert update.call_count == dice.ANIMATION_STEPS + 1
+    # The spinning dot never shows a blank frame in between
+    assert shift_register.state[0] & 0x7F == dice._mask(dice.DICE_PATTERNS[3])
+
+
+@pytest.mark.asyncio
+async def test_shift_register_frame_keeps_other_outputs():
+    shift_register = ShiftRegister(5, 6, 7)
+    dice = RollingDice([(shift_register, i) for i in range(7)])
+    shift_register.state[0] |= 0x80  # Q7 drives something else
+
+    dice.display_number(4)
+    assert shift_register.state[0] == 0x80 | 0b1100011
+    dice.clear()
+    assert shift_register.state[0] == 0x80
+
+
+@pytest.mark.asyncio
+async def test_chained_registers_latch_after_init(mocker):
+    shift_register = ShiftRegister(5, 6, 7, registers=2)
+    chained = shift_register.next()
+    pins = [shift_register.q0, (shift_register, 1), (shift_register, 2)]
+    pins += [(shift_register, 3), (shift_register, 4), (shift_register, 5), chained.q0]
+    dice = RollingDice(pins)
+    assert not shift_register.batch_mode
+    assert not chained.batch_mode
+
+    first = mocker.spy(shift_register, 'update')
+    second = mocker.spy(chained, 'update')
+    dice.leds[0].on()
+    dice.leds[6].on()
+    chained.set_pin(1, 1)  # another component on the chained register
+    assert first.call_count == 1
+    assert second.call_count == 2
+    assert shift_register.state[0] & 1
+    assert shift_register.state[1] & 0b11 == 0b11
+
+
+@pytest.mark.asyncio
+async def test_active_low_shift_register_frame():
+    shift_register = ShiftRegister(5, 6, 7)
+    dice = RollingDice([(shift_register, i) for i in range(7)], active_low=True)
+    assert shift_register.state[0] & 0x7F == 0x7F  # all off
+
+    dice.display_number(1)
+    assert shift_register.state[0] & 0x7F == 0x7F & ~0b100
+
+
+@pytest.mark.asyncio
+async def test_active_low_direct_pins():
+    dice = RollingDice([5, 6, 7, 8, 9, 10, 11], active_low=True)
+    assert [led.led.value() for led in dice.leds] == [1] * 7  # all off
+
+    dice.display_number(6)
+    assert [led.led.value() for led in dice.leds] == [0, 0, 1, 0, 0, 0, 0]
+
+    dice.display_number(1)
+    assert [led.led.value() for led in dice.leds] == [1, 1, 0, 1, 1, 1, 1]
+
+    dice.clear()
+    assert [led.led.value() for led in dice.leds] == [1] * 7
+
+
+@pytest.mark.asyncio
+async def test_direct_pins_write_only_changes(mocker):
+    pins = [5, 6, 7, 8, 9, 10, 11]
+    dice = RollingDice(pins)
+    dice.display_number(4)
+
+    writes = [mocker.spy(led.led, 'value') for led in dice.leds]
+    dice.display_number(5)  # 5 adds the middle LED to 4
+
+    assert [len(spy.call_args_list) for spy in writes] == [0, 0, 1, 0, 0, 0, 0]
+    assert [led.led.value() for led in dice.leds] == dice.DICE_PATTERNS[5]
+
+
+def test_roll_schedule_decelerates_and_tumbles():
+    dice = RollingDice([5, 6, 7, 8, 9, 10, 11])
+    intervals = dice._intervals
+    assert intervals[0] == 0.04
+    assert intervals[-1] == 0.24
+    assert intervals == sorted(intervals)
+
+    for final in range(1, 7):
+        dice._plan(final)
+        faces = [frame - 5 for frame in dice._schedule[dice.spin_steps :]]
+        assert list(dice._schedule[: dice.spin_steps]) == [i % 6 for i in range(dice.spin_steps)]
+        assert all(1 <= face <= 6 for face in faces)
+        assert all(a != b for a, b in zip(faces, faces[1:]))
+        assert faces[-1] != final
+
+
+def test_new_roll_interrupts_running_roll():
+    dice = RollingDice([5, 6, 7, 8, 9, 10, 11])
+    results = {}
+
+    async def roll(name, number):
+        results[name] = await dice.roll(number)
+
+    async def main():
+        first = uasyncio.create_task(roll('first', 2))
+        await uasyncio.sleep_ms(500)
+        second = uasyncio.create_task(roll('second', 5))
+        await uasyncio.gather(first, second)
+
+    loop = VirtualLoop()
+    with loop.install():
+        loop.run(main())
+
+    assert results == {'first': None, 'second': 5}
+    assert [led.led.value() for led in dice.leds] == dice.DICE_PATTERNS[5]
+    assert all(task.done for task in loop.tasks)
@@ -0,0 +1,141 @@
+import time
+
+import pytest
+import uasyncio
+from uasyncio_virtual_mock import VirtualLoop
+
+
+@pytest.fixture
+def loop():
+    loop = VirtualLoop()
+    with loop.install():
+        yield loop
+
+
+def test_sleeping_tasks_interleave_on_virtual_clock(loop):
+    start = time.ticks_ms()
+    log = []
+
+    async def ticker(name, period_ms):
+        while True:
+            await uasyncio.sleep_ms(period_ms)
+            log.append((name, time.ticks_diff(time.ticks_ms(), start)))
+
+    async def main():
+        await uasyncio.gather(ticker('fast', 100), ticker('slow', 250))
+
+    assert loop.run(main(), duration_ms=500) is None
+    assert log == [
+        ('fast', 100),
+        ('fast', 200),
+        ('slow', 250),
+        ('fast', 300),
+        ('fast', 400),
+        ('slow', 500),
+        ('fast', 500),
+    ]
+    assert time.ticks_diff(time.ticks_ms(), start) == 500
+
+
+def test_hours_of_device_time_run_instantly(loop):
+    start = time.ticks_ms()
+    ticks = []
+
+    async def main():
+        while True:
+            await uasyncio.sleep(60)
+            ticks.append(time.ticks_ms())
+
+    loop.run(main(), duration_ms=3 * 3600 * 1000)
+    assert len(ticks) == 180
+    assert ticks[-1] - start == 3 * 3600 * 1000
+
+
+def test_run_returns_result_and_raises_errors(loop):
+    async def add(a, b):
+        await uasyncio.sleep_ms(10)
+        return a + b
+
+    async def main():
+        task = uasyncio.create_task(add(1, 2))
+        return await task, await uasyncio.gather(add(3, 4), add(5, 6))
+
+    assert loop.run(main()) == (3, [7, 11])
+
+    async def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        loop.run(fail())
+
+
+def test_event_and_thread_safe_flag(loop):
+    event = uasyncio.Event()
+    flag = uasyncio.ThreadSafeFlag()
+    log = []
+
+    async def waiter():
+        await event.wait()
+        log.append(('event', time.ticks_ms()))
+        await flag.wait()
+        log.append(('flag', flag.is_set()))
+
+    async def main():
+        task = uasyncio.create_task(waiter())
+        await uasyncio.sleep_ms(30)
+        event.set()
+        await uasyncio.sleep_ms(30)
+        flag.set()
+        await task
+
+    start = time.ticks_ms()
+    loop.run(main())
+    assert log == [('event', start + 30), ('flag', False)]
+
+
+def test_wait_for_times_out_and_cancels(loop):
+    cleaned_up = []
+
+    async def slow():
+        try:
+            await uasyncio.sleep(10)
+        finally:
+            cleaned_up.append(time.ticks_ms())
+
+    async def main():
+        with pytest.raises(uasyncio.TimeoutError):
+            await uasyncio.wait_for(slow(), 0.5)
+        return await uasyncio.wait_for_ms(uasyncio.sleep_ms(10), 100)
+
+    start = time.ticks_ms()
+    loop.run(main())
+    assert cleaned_up == [start + 500]
+
+
+def test_cancel_task_runs_finally(loop):
+    events = []
+
+    async def worker():
+        try:
+            await uasyncio.Event().wait()
+        except uasyncio.CancelledError:
+            events.append('cancelled')
+            raise
+
+    async def main():
+        task = uasyncio.create_task(worker())
+        await uasyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(uasyncio.CancelledError):
+            await task
+
+    loop.run(main())
+    assert events == ['cancelled']
+
+
+def test_deadlock_is_reported(loop):
+    async def main():
+        await uasyncio.Event().wait()
+
+    with pytest.raises(RuntimeError):
+        loop.run(main())
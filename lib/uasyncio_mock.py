@@ -12,9 +12,17 @@ async def _mock_sleep_impl(seconds):
 mock_sleep = AsyncMock(side_effect=_mock_sleep_impl)
 
 
+async def _mock_sleep_ms_impl(ms):
+    advance_time(ms / 1000)
+
+
+mock_sleep_ms = AsyncMock(side_effect=_mock_sleep_ms_impl)
+
+
 def reset_mock_sleep():
     """Reset the mock sleep call count before each test"""
     mock_sleep.reset_mock()
+    mock_sleep_ms.reset_mock()
 
 
 # Improved version that properly handles coroutines
@@ -41,6 +49,46 @@ def create_task_with_cleanup(coro):
     return coro
 
 
+class MockThreadSafeFlag:
+    def __init__(self):
+        self.is_set = False
+
+    def set(self):
+        self.is_set = True
+
+    def clear(self):
+        self.is_set = False
+
+    async def wait(self):
+        self.is_set = False
+
+
+class MockEvent:
+    def __init__(self):
+        self._set = False
+
+    def is_set(self):
+        return self._set
+
+    def set(self):
+        self._set = True
+
+    def clear(self):
+        self._set = False
+
+    async def wait(self):
+        return True
+
+
+async def mock_wait_for_ms(aw, timeout):
+    return await aw
+
+
 mock_uasyncio = MagicMock()
 mock_uasyncio.sleep = mock_sleep
+mock_uasyncio.sleep_ms = mock_sleep_ms
+mock_uasyncio.ThreadSafeFlag = MockThreadSafeFlag
+mock_uasyncio.Event = MockEvent
+mock_uasyncio.wait_for_ms = mock_wait_for_ms
+mock_uasyncio.TimeoutError = TimeoutError
 mock_uasyncio.create_task = create_task_with_cleanup
@@ -0,0 +1,329 @@
+import heapq
+import sys
+from collections import deque
+from contextlib import contextmanager
+
+import time_mock
+
+
+class CancelledError(BaseException):
+    pass
+
+
+class TimeoutError(Exception):
+    pass
+
+
+class _Sleep:
+    def __init__(self, deadline):
+        self.deadline = deadline
+
+    def __await__(self):
+        yield self
+
+
+class _Wait:
+    """Parks the awaiting task on a waiter list until something readies it"""
+
+    def __init__(self, waiters):
+        self.waiters = waiters
+
+    def __await__(self):
+        yield self
+
+
+class Task:
+    def __init__(self, loop, coro):
+        self._loop = loop
+        self.coro = coro
+        self.done = False
+        self.result = None
+        self.exception = None
+        self._waiters = []
+        self._send = None
+        self._throw = None
+        self._blocked = None  # waiter list or sleep sequence while parked
+
+    def __await__(self):
+        if not self.done:
+            yield _Wait(self._waiters)
+        if self.exception is not None:
+            raise self.exception
+        return self.result
+
+    def cancel(self):
+        return self._loop._cancel(self)
+
+
+class Event:
+    def __init__(self):
+        self._set = False
+        self._waiters = []
+
+    def is_set(self):
+        return self._set
+
+    def set(self):
+        self._set = True
+        _wake_all(self._waiters)
+
+    def clear(self):
+        self._set = False
+
+    async def wait(self):
+        if not self._set:
+            await _Wait(self._waiters)
+        return True
+
+
+class ThreadSafeFlag(Event):
+    async def wait(self):
+        if not self._set:
+            await _Wait(self._waiters)
+        self._set = False
+
+
+async def _await(aw):
+    return await aw
+
+
+def _wake_all(waiters):
+    while waiters:
+        task = waiters.pop(0)
+        task._loop._wake(task)
+
+
+class VirtualLoop:
+    """
+    Deterministic uasyncio scheduler running on time_mock's virtual clock.
+
+    Ready tasks run in FIFO order; when every task is sleeping or waiting, the clock
+    jumps straight to the next deadline. Hours of device time therefore simulate in
+    seconds, with concurrent monitor() loops interleaving as they would on the device.
+
+        loop = VirtualLoop()
+        with loop.install():
+            loop.run(main(), duration_ms=3_600_000)
+
+    install() patches the uasyncio module (the mock from uasyncio_mock in tests), so
+    code doing `import uasyncio` picks up the virtual implementations.
+    """
+
+    CancelledError = CancelledError
+    TimeoutError = TimeoutError
+
+    def __init__(self):
+        self._ready = deque()
+        self._sleepers = []
+        self._sleep_seq = 0
+        self._stopping = False
+        self.tasks = []
+
+    def now_us(self):
+        return time_mock.ticks_us()
+
+    # uasyncio API
+
+    def create_task(self, coro):
+        if len(self.tasks) >= 64:
+            self.tasks = [task for task in self.tasks if not task.done]
+        task = Task(self, coro)
+        self.tasks.append(task)
+        self._ready.append(task)
+        return task
+
+    def sleep(self, seconds):
+        return _Sleep(self.now_us() + int(seconds * 1_000_000))
+
+    def sleep_ms(self, ms):
+        return _Sleep(self.now_us() + int(ms * 1000))
+
+    def _ensure_task(self, aw):
+        if isinstance(aw, Task):
+            return aw
+        if not hasattr(aw, 'send'):
+            aw = _await(aw)
+        return self.create_task(aw)
+
+    async def gather(self, *aws, return_exceptions=False):
+        tasks = [self._ensure_task(aw) for aw in aws]
+        results = []
+        for task in tasks:
+            try:
+                results.append(await task)
+            except CancelledError:
+                raise
+            except Exception as e:
+                if not return_exceptions:
+                    for other in tasks:
+                        other.cancel()
+                    raise
+                results.append(e)
+        return results
+
+    async def wait_for(self, aw, timeout):
+        task = self._ensure_task(aw)
+        if timeout is None:
+            return await task
+
+        expired = []
+
+        async def expire():
+            await self.sleep(timeout)
+            expired.append(True)
+            task.cancel()
+
+        timer = self.create_task(expire())
+        try:
+            return await task
+        except CancelledError:
+            if expired:
+                raise TimeoutError() from None
+            task.cancel()
+            raise
+        finally:
+            timer.cancel()
+
+    def wait_for_ms(self, aw, timeout):
+        return self.wait_for(aw, timeout / 1000)
+
+    def run_until_complete(self, coro):
+        return self.run(coro)
+
+    # Scheduler
+
+    def _wake(self, task, value=None):
+        task._blocked = None
+        task._send = value
+        self._ready.append(task)
+
+    def _cancel(self, task):
+        if task.done:
+            return False
+        task._throw = CancelledError()
+        blocked = task._blocked
+        if isinstance(blocked, list):
+            blocked.remove(task)
+            self._wake(task)
+        elif blocked is not None:
+            self._wake(task)
+        return True
+
+    def _finish(self, task, result=None, exception=None):
+        task.done = True
+        task.result = result
+        task.exception = exception
+        _wake_all(task._waiters)
+
+    def _step(self, task):
+        if task._blocked is not None or task.done:
+            return  # stale ready entry
+        send, throw = task._send, task._throw
+        task._send = task._throw = None
+        try:
+            command = task.coro.throw(throw) if throw is not None else task.coro.send(send)
+        except StopIteration as e:
+            self._finish(task, result=e.value)
+            return
+        except BaseException as e:
+            self._finish(task, exception=e)
+            return
+
+        if task._throw is not None:
+            self._ready.append(task)
+        elif isinstance(command, _Sleep):
+            self._sleep_seq += 1
+            task._blocked = self._sleep_seq
+            heapq.heappush(self._sleepers, (command.deadline, self._sleep_seq, task))
+        elif isinstance(command, _Wait):
+            task._blocked = command.waiters
+            command.waiters.append(task)
+        else:
+            self._ready.append(task)
+
+    def _next_sleeper(self):
+        while self._sleepers:
+            deadline, seq, task = self._sleepers[0]
+            if task._blocked == seq:
+                return deadline
+            heapq.heappop(self._sleepers)
+        return None
+
+    def run_for(self, duration_ms=None, main=None):
+        """Run tasks for duration_ms of virtual time, or until main is done"""
+        end = None if duration_ms is None else self.now_us() + int(duration_ms * 1000)
+        self._stopping = False
+        while main is None or not main.done:
+            if self._stopping:
+                return
+            if self._ready:
+                self._step(self._ready.popleft())
+                continue
+
+            deadline = self._next_sleeper()
+            if deadline is None:
+                if end is not None:
+                    time_mock.set_time(max(end, self.now_us()))
+                    return
+                if main is None:
+                    return
+                raise RuntimeError('Deadlock: every task is waiting')
+
+            if end is not None and deadline > end:
+                time_mock.set_time(max(end, self.now_us()))
+                return
+
+            _, _, task = heapq.heappop(self._sleepers)
+            time_mock.set_time(max(deadline, self.now_us()))
+            self._wake(task)
+
+    def stop(self):
+        """Make run() return after the current task step, e.g. on machine.deepsleep()"""
+        self._stopping = True
+
+    def run(self, coro, duration_ms=None):
+        """Run coro as the main task, returns its result or None if time ran out"""
+        main = self.create_task(coro)
+        self.run_for(duration_ms, main)
+        if not main.done:
+            return None
+        if main.exception is not None:
+            raise main.exception
+        return main.result
+
+    def close(self):
+        """Cancel every pending task so their finally blocks run"""
+        for task in self.tasks:
+            task.cancel()
+        self.run_for(0)
+        for task in self.tasks:
+            if not task.done:
+                task.coro.close()
+
+    @contextmanager
+    def install(self, module=None):
+        """Patch the uasyncio module with this loop while the context is active"""
+        if module is None:
+            module = sys.modules['uasyncio']
+        patches = {
+            'sleep': self.sleep,
+            'sleep_ms': self.sleep_ms,
+            'create_task': self.create_task,
+            'gather': self.gather,
+            'wait_for': self.wait_for,
+            'wait_for_ms': self.wait_for_ms,
+            'run': self.run,
+            'Event': Event,
+            'ThreadSafeFlag': ThreadSafeFlag,
+            'CancelledError': CancelledError,
+            'TimeoutError': TimeoutError,
+        }
+        saved = {name: getattr(module, name, None) for name in patches}
+        for name, value in patches.items():
+            setattr(module, name, value)
+        try:
+            yield self
+        finally:
+            self.close()
+            for name, value in saved.items():
+                setattr(module, name, value)
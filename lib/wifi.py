@@ -39,20 +39,20 @@ class WiFi:
 
     async def connect(self, ssid=WIFI_SSID, password=WIFI_PASSWORD, timeout=20):
         if not self.wlan.isconnected():
-            self.logger.info(f'Connecting to {ssid}...')
+            self.logger.info('Connecting to %s...', ssid)
             self.wlan.connect(ssid, password)
             elapsed_seconds = 0
             last_status = None
 
             while True:
                 if self.wlan.isconnected():
-                    self.logger.info(f'Connected. IP: {self.get_ip()}')
+                    self.logger.info('Connected. IP: %s', self.get_ip())
                     self._connected = True
                     return True
 
                 if elapsed_seconds >= timeout:
                     self.wlan.disconnect()
-                    self.logger.error(f'Connection timeout after {timeout}s')
+                    self.logger.error('Connection timeout after %ss', timeout)
                     return False
 
                 status = self.wlan.status()
@@ -66,7 +66,7 @@ class WiFi:
                         network.STAT_GOT_IP: 'GOT_IP',
                     }.get(status, f'Unknown status: {status}')
 
-                    self.logger.info(f'WiFi status: {status_name}')
+                    self.logger.info('WiFi status: %s', status_name)
                     last_status = status
 
                     if status in [network.STAT_WRONG_PASSWORD, network.STAT_NO_AP_FOUND]:
@@ -74,7 +74,7 @@ class WiFi:
                         return False
 
                 if elapsed_seconds % 2 == 0:  # Log every 2 seconds to avoid spam
-                    self.logger.info(f'Still connecting... ({elapsed_seconds}s)')
+                    self.logger.info('Still connecting... (%ss)', elapsed_seconds)
 
                 await uasyncio.sleep(1)
                 elapsed_seconds += 1
@@ -99,6 +99,6 @@ class WiFi:
         return None
 
     async def connect_with_delay(self, delay=5, ssid=WIFI_SSID, password=WIFI_PASSWORD, timeout=20):
-        self.logger.info(f'Waiting {delay}s before connecting...')
+        self.logger.info('Waiting %ss before connecting...', delay)
         await uasyncio.sleep(delay)
         return await self.connect(ssid, password, timeout)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Host benchmarks for lib hot paths with hardware-relevant counters.
+
+Runs the cases from lib/benchmark.py on the mocks and reports per operation:
+pin writes, PWM writes, simulated device time and peak Python allocation. These
+counts are deterministic, so they are compared against benchmark_baseline.json to
+flag regressions in CI; wall time is printed for information only.
+
+    python3 scripts/benchmark_host.py            # compare against the baseline
+    python3 scripts/benchmark_host.py --update   # store new baseline numbers
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from simulate_device import install_mocks
+
+BASELINE_PATH = Path(__file__).parent / 'benchmark_baseline.json'
+METRICS = ('pin_writes', 'pwm_writes', 'sim_us', 'alloc_bytes')
+# relative tolerance and absolute slack per metric before flagging a regression
+TOLERANCE = {
+    'pin_writes': (0.0, 0),
+    'pwm_writes': (0.0, 0),
+    'sim_us': (0.0, 0),
+    'alloc_bytes': (0.25, 256),
+}
+
+
+class Counters:
+    """Counts pin and PWM writes by wrapping the mock classes"""
+
+    def __init__(self):
+        self.pin_writes = 0
+        self.pwm_writes = 0
+        self._patched = []
+
+    def _wrap(self, cls, name, counter):
+        original = getattr(cls, name)
+
+        def counted(obj, value=None):
+            if value is not None:
+                setattr(self, counter, getattr(self, counter) + 1)
+            return original(obj, value)
+
+        setattr(cls, name, counted)
+        self._patched.append((cls, name, original))
+
+    def __enter__(self):
+        from hardware_mock import MockPWM
+        from pin_mock import MockPin
+
+        self._wrap(MockPin, 'value', 'pin_writes')
+        self._wrap(MockPWM, 'duty_u16', 'pwm_writes')
+        self._wrap(MockPWM, 'freq', 'pwm_writes')
+        return self
+
+    def __exit__(self, *exc):
+        for cls, name, original in self._patched:
+            setattr(cls, name, original)
+        self._patched = []
+
+
+def _call(loop, op):
+    result = op()
+    if hasattr(result, 'send'):
+        loop.run(result)
+
+
+def measure(name, setup, iterations=50):
+    import time_mock
+    from pin_mock import MockPin
+    from uasyncio_virtual_mock import VirtualLoop
+
+    MockPin.clear_instances()
+    MockPin.history_limit = 0
+    loop = VirtualLoop()
+    try:
+        with loop.install():
+            op = setup()
+            _call(loop, op)  # warm up caches and lazy state
+
+            started = datetime.now()
+            for _ in range(iterations):
+                _call(loop, op)
+            wall_us = (datetime.now() - started).total_seconds() * 1e6 / iterations
+
+            start_us = time_mock.ticks_us()
+            alloc = 0
+            tracemalloc.start()
+            with Counters() as counters:
+                for _ in range(iterations):
+                    before, _ = tracemalloc.get_traced_memory()
+                    tracemalloc.reset_peak()
+                    _call(loop, op)
+                    alloc = max(alloc, tracemalloc.get_traced_memory()[1] - before)
+            tracemalloc.stop()
+            sim_us = time_mock.ticks_us() - start_us
+    finally:
+        MockPin.history_limit = None
+
+    return {
+        'pin_writes': counters.pin_writes // iterations,
+        'pwm_writes': counters.pwm_writes // iterations,
+        'sim_us': sim_us // iterations,
+        'alloc_bytes': alloc,
+        'wall_us': round(wall_us, 1),
+    }
+
+
+def run_suite(iterations=50, cases=None):
+    install_mocks()
+    from lib.benchmark import CASES
+
+    names = cases or list(CASES)
+    return {name: measure(name, CASES[name], iterations) for name in names}
+
+
+def compare(results, baseline):
+    """Returns [(case, metric, baseline, current)] for metrics above tolerance"""
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in METRICS:
+            if metric not in base:
+                continue
+            relative, slack = TOLERANCE[metric]
+            if metrics[metric] > base[metric] * (1 + relative) + slack:
+                regressions.append((name, metric, base[metric], metrics[metric]))
+    return regressions
+
+
+def format_results(results, baseline):
+    lines = [f'{"case":<24}' + ''.join(f'{metric:>14}' for metric in (*METRICS, 'wall_us'))]
+    for name, metrics in results.items():
+        row = f'{name:<24}'
+        for metric in (*METRICS, 'wall_us'):
+            value = metrics[metric]
+            base = baseline.get(name, {}).get(metric)
+            delta = '' if base in (None, value) or metric == 'wall_us' else f' ({base})'
+            row += f'{str(value) + delta:>14}'
+        lines.append(row)
+    return '\n'.join(lines)
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not Path(path).exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    stored = {
+        name: {metric: metrics[metric] for metric in METRICS} for name, metrics in results.items()
+    }
+    with open(path, 'w') as f:
+        json.dump(stored, f, indent=4, sort_keys=True)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run host benchmarks for lib hot paths')
+    parser.add_argument('cases', nargs='*', help='case names (default: all)')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--baseline', default=str(BASELINE_PATH))
+    parser.add_argument('--update', action='store_true', help='store results as the baseline')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.iterations, args.cases)
+    baseline = load_baseline(args.baseline)
+    print(format_results(results, baseline))
+
+    if args.update:
+        save_baseline(results, args.baseline)
+        print(f'\nBaseline written to {args.baseline}')
+        return 0
+
+    regressions = compare(results, baseline)
+    for name, metric, base, current in regressions:
+        print(f'REGRESSION {name} {metric}: {base} -> {current}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
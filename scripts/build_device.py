@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Build an upload-ready copy of a device with logger calls stripped below a level.
+
+    python3 scripts/build_device.py rolling_dice --strip-below error
+
+writes build/rolling_dice/ with main.py, boot.py, lib/ and the precompiled songs/,
+leaving the source tree untouched. Stripped calls are replaced by `pass` on the same
+lines, so line numbers in device tracebacks still match the source. Upload the
+folder, e.g.:
+
+    mpremote cp -r build/rolling_dice/. :
+"""
+
+import argparse
+import ast
+import shutil
+import sys
+from pathlib import Path
+
+LEVELS = {'debug': 0, 'info': 1, 'error': 2, 'all': 3}
+METHOD_LEVELS = {'info': 1, 'error': 2}
+LEVEL_NAMES = {'DEBUG': 0, 'INFO': 1, 'ERROR': 2}
+
+
+def _is_logger(node):
+    if isinstance(node, ast.Name):
+        return node.id == 'logger'
+    return isinstance(node, ast.Attribute) and node.attr == 'logger'
+
+
+def _level_of(node):
+    """Level named by an expression like Logger.INFO, or None"""
+    if isinstance(node, ast.Attribute):
+        return LEVEL_NAMES.get(node.attr)
+    return None
+
+
+def _call_level(call):
+    """Level of a logger.info/error/log(...) or logger.enabled_for(...) call, or None"""
+    if not isinstance(call, ast.Call) or not isinstance(call.func, ast.Attribute):
+        return None
+    if not _is_logger(call.func.value):
+        return None
+
+    method = call.func.attr
+    if method in METHOD_LEVELS:
+        return METHOD_LEVELS[method]
+    if method in ('log', 'enabled_for') and call.args:
+        return _level_of(call.args[0])
+    return None
+
+
+def find_strippable(tree, min_level):
+    """Outermost statements that only log below min_level"""
+    nodes = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+            level = _call_level(node.value)
+            if level is not None and node.value.func.attr != 'enabled_for' and level < min_level:
+                nodes.append(node)
+        elif isinstance(node, ast.If) and not node.orelse:
+            level = _call_level(node.test)
+            if level is not None and node.test.func.attr == 'enabled_for' and level < min_level:
+                nodes.append(node)
+
+    result = []
+    for node in sorted(nodes, key=lambda node: node.lineno):
+        if result and node.lineno <= result[-1].end_lineno:
+            continue
+        result.append(node)
+    return result
+
+
+def _shares_lines(tree, target):
+    """True if another statement's code is on the target's first or last line"""
+    start, end = target.lineno, target.end_lineno
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.stmt) or node is target:
+            continue
+        if node.lineno <= start and end <= node.end_lineno:
+            if node.lineno == start:
+                return True
+            continue
+        if start <= node.lineno and node.end_lineno <= end:
+            continue
+        if node.lineno <= end and start <= node.end_lineno:
+            return True
+    return False
+
+
+def strip_logging(source, min_level):
+    """Returns (source, stripped call count) with logger calls below min_level removed"""
+    tree = ast.parse(source)
+    nodes = [node for node in find_strippable(tree, min_level) if not _shares_lines(tree, node)]
+    if not nodes:
+        return source, 0
+
+    lines = source.splitlines(keepends=True)
+    for node in reversed(nodes):
+        first = lines[node.lineno - 1]
+        indent = first[: len(first) - len(first.lstrip())]
+        blank = ['\n'] * (node.end_lineno - node.lineno)
+        lines[node.lineno - 1 : node.end_lineno] = [f'{indent}pass\n', *blank]
+
+    return ''.join(lines), len(nodes)
+
+
+def _is_device_module(path):
+    name = path.name
+    return not (name.startswith('test_') or name.endswith('_mock.py') or name == 'conftest.py')
+
+
+def build_device(device_type, min_level, project_root=None, out_dir=None):
+    if project_root is None:
+        project_root = Path(__file__).parent.parent
+    if out_dir is None:
+        out_dir = project_root / 'build' / device_type
+
+    device_dir = project_root / 'devices' / device_type
+    device_main = device_dir / 'main.py'
+    if not device_main.exists():
+        print(f"Error: Device type '{device_type}' does not exist")
+        sys.exit(1)
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    (out_dir / 'lib').mkdir(parents=True)
+
+    sources = [(device_main, out_dir / 'main.py')]
+    device_boot = device_dir / 'boot.py'
+    template_boot = project_root / 'templates' / 'boot.py.template'
+    if device_boot.exists():
+        sources.append((device_boot, out_dir / 'boot.py'))
+    elif template_boot.exists():
+        sources.append((template_boot, out_dir / 'boot.py'))
+    for path in sorted((project_root / 'lib').glob('*.py')):
+        if _is_device_module(path):
+            sources.append((path, out_dir / 'lib' / path.name))
+
+    stripped = 0
+    for src, dest in sources:
+        source, count = strip_logging(src.read_text(), min_level)
+        dest.write_text(source)
+        stripped += count
+
+    songs = {}
+    if (project_root / 'songs').is_dir():
+        from compile_songs import compile_songs
+
+        songs = compile_songs(project_root / 'songs', out_dir / 'songs')
+
+    print(f"""
+Built device: {device_type}
+  - Output: {out_dir}
+  - Copied {len(sources)} files
+  - Stripped {stripped} logger calls
+  - Compiled {len(songs)} songs
+""")
+    return stripped
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build a device copy with logging stripped')
+    parser.add_argument('device_type')
+    parser.add_argument(
+        '--strip-below',
+        choices=list(LEVELS),
+        default='error',
+        help='remove logger calls below this level (all removes every call)',
+    )
+    args = parser.parse_args()
+
+    build_device(args.device_type, LEVELS[args.strip_below])
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Compare on-device benchmark results against per-board baselines.
+
+Run lib/benchmark.py on a board and capture its serial output, e.g.:
+    mpremote run lib/benchmark.py > bench-esp32c3.log
+    python3 scripts/compare_benchmarks.py bench-esp32c3.log
+    python3 scripts/compare_benchmarks.py bench-esp32c3.log --update
+
+Only lines containing `BENCH {...}` are read, so REPL noise in the capture is fine.
+Baselines are kept per board in device_baselines.json.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).parent / 'device_baselines.json'
+MARKER = 'BENCH '
+
+
+def parse_results(lines):
+    """Returns {board: {case: {'us': ..., 'alloc': ...}}}, the last run of a case wins"""
+    results = {}
+    for line in lines:
+        start = line.find(MARKER + '{')
+        if start < 0:
+            continue
+        try:
+            result = json.loads(line[start + len(MARKER) :])
+        except ValueError:
+            continue
+        board = results.setdefault(result['board'], {})
+        board[result['case']] = {'us': result['us'], 'alloc': result['alloc']}
+    return results
+
+
+def compare(results, baselines, tolerance=0.15, alloc_slack=16):
+    """Returns [(board, case, metric, baseline, current)] for slower or hungrier cases"""
+    regressions = []
+    for board, cases in results.items():
+        board_baseline = baselines.get(board, {})
+        for case, metrics in cases.items():
+            base = board_baseline.get(case)
+            if base is None:
+                continue
+            if metrics['us'] > base['us'] * (1 + tolerance):
+                regressions.append((board, case, 'us', base['us'], metrics['us']))
+            if metrics['alloc'] > base['alloc'] + alloc_slack:
+                regressions.append((board, case, 'alloc', base['alloc'], metrics['alloc']))
+    return regressions
+
+
+def format_results(results, baselines):
+    lines = []
+    for board, cases in sorted(results.items()):
+        lines.append(f'{board}:')
+        for case, metrics in cases.items():
+            base = baselines.get(board, {}).get(case)
+            if base is None:
+                lines.append(f'  {case:<24} {metrics["us"]:>8} us {metrics["alloc"]:>8} B  (new)')
+                continue
+            change = (metrics['us'] - base['us']) * 100 / base['us'] if base['us'] else 0
+            lines.append(
+                f'  {case:<24} {metrics["us"]:>8} us {metrics["alloc"]:>8} B'
+                f'  ({change:+.1f}% vs {base["us"]} us, {base["alloc"]} B)'
+            )
+    return '\n'.join(lines)
+
+
+def load_baselines(path=BASELINE_PATH):
+    if not Path(path).exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def update_baselines(results, baselines, path=BASELINE_PATH):
+    for board, cases in results.items():
+        baselines.setdefault(board, {}).update(cases)
+    with open(path, 'w') as f:
+        json.dump(baselines, f, indent=4, sort_keys=True)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare device benchmark captures')
+    parser.add_argument('captures', nargs='+', help='serial captures or log files')
+    parser.add_argument('--baselines', default=str(BASELINE_PATH))
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed slowdown')
+    parser.add_argument('--update', action='store_true', help='store results as baselines')
+    args = parser.parse_args(argv)
+
+    lines = []
+    for capture in args.captures:
+        lines += Path(capture).read_text(errors='replace').splitlines()
+    results = parse_results(lines)
+    if not results:
+        print('Error: no BENCH results found')
+        return 1
+
+    baselines = load_baselines(args.baselines)
+    print(format_results(results, baselines))
+
+    if args.update:
+        update_baselines(results, baselines, args.baselines)
+        print(f'\nBaselines written to {args.baselines}')
+        return 0
+
+    regressions = compare(results, baselines, args.tolerance)
+    for board, case, metric, base, current in regressions:
+        print(f'REGRESSION {board} {case} {metric}: {base} -> {current}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Precompile songs/*.rtttl and songs/*.txt into the binary format loaded on the device.
+
+    python3 scripts/compile_songs.py                 # writes build/songs/*.bin
+    mpremote cp -r build/songs :
+
+Each .bin file is the raw array('H') of frequency/duration pairs, little-endian as
+on the ESP32, so lib/piezo_buzzer_songs.py loads it without parsing.
+build_device.py runs this for every device build.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from lib.piezo_buzzer_parser import parse_song  # noqa: E402
+
+SOURCE_EXTENSIONS = ('.rtttl', '.txt')
+
+
+def compile_song_file(src, dest):
+    song = parse_song(Path(src).read_text())
+    if sys.byteorder != 'little':
+        song.byteswap()
+    Path(dest).write_bytes(song.tobytes())
+    return len(song) // 2
+
+
+def compile_songs(src_dir=None, out_dir=None):
+    """Returns {name: note count} of the compiled songs"""
+    src_dir = Path(src_dir or PROJECT_ROOT / 'songs')
+    out_dir = Path(out_dir or PROJECT_ROOT / 'build' / 'songs')
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    compiled = {}
+    for src in sorted(src_dir.iterdir()):
+        if src.suffix not in SOURCE_EXTENSIONS:
+            continue
+        if src.stem in compiled:
+            raise ValueError(f'Song {src.stem} exists in more than one format')
+        try:
+            compiled[src.stem] = compile_song_file(src, out_dir / f'{src.stem}.bin')
+        except ValueError as e:
+            raise ValueError(f'{src.name}: {e}') from None
+    return compiled
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Precompile songs for the piezo buzzer')
+    parser.add_argument('--src', help='song sources (default: songs/)')
+    parser.add_argument('--out', help='output directory (default: build/songs/)')
+    args = parser.parse_args()
+
+    try:
+        songs = compile_songs(args.src, args.out)
+    except ValueError as e:
+        print(f'Error: {e}')
+        sys.exit(1)
+    for name, notes in songs.items():
+        print(f'  {name}: {notes} notes')
+    print(f'Compiled {len(songs)} songs')
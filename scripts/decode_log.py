@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Decode binary logs recorded by lib/log_buffer.py.
+
+Copy the log and its table from the device first, e.g.:
+    mpremote cp :log.bin.old :log.bin :log.bin.tab .
+    python3 scripts/decode_log.py log.bin.old log.bin
+"""
+
+import argparse
+import struct
+import sys
+from pathlib import Path
+
+RECORD = struct.Struct('<iiii')
+LEVELS = ('DEBUG', 'INFO', 'ERROR', '?')
+# Ids LogBuffer records once its logger or message table is full
+OVERFLOW_LOGGER = 0xFF
+OVERFLOW_MESSAGE = 0xFFFF
+
+
+def load_table(path):
+    loggers = {}
+    messages = {}
+    with open(path) as f:
+        for line in f:
+            kind, ident, text = line.rstrip('\n').split(' ', 2)
+            table = loggers if kind == 'L' else messages
+            table[int(ident)] = text
+    return loggers, messages
+
+
+def read_records(path):
+    data = Path(path).read_bytes()
+    usable = len(data) - len(data) % RECORD.size
+    for offset in range(0, usable, RECORD.size):
+        yield RECORD.unpack_from(data, offset)
+
+
+def format_message(message, args):
+    if not args:
+        return message
+    try:
+        return message % tuple('?' if arg is None else arg for arg in args)
+    except (TypeError, ValueError):
+        return f'{message} {args!r}'
+
+
+def decode_record(record, loggers, messages):
+    ticks, header, arg0, arg1 = record
+    message_id = header & 0xFFFF
+    logger_id = (header >> 16) & 0xFF
+    level = (header >> 24) & 0x3
+    argc = (header >> 26) & 0x3
+    missing = (header >> 28) & 0x3
+
+    args = []
+    for i, value in enumerate((arg0, arg1)[:argc]):
+        args.append(None if missing & (1 << i) else value)
+
+    if logger_id == OVERFLOW_LOGGER:
+        prefix = 'logger table full'
+    else:
+        prefix = loggers.get(logger_id, f'logger {logger_id}')
+    if message_id == OVERFLOW_MESSAGE:
+        message = '<message table full>'
+    else:
+        message = messages.get(message_id, f'<message {message_id}>')
+    text = format_message(message, args)
+    return f'{ticks / 1000:10.3f} [{prefix}] {LEVELS[level]} {text}'
+
+
+def decode(paths, table_path=None):
+    if table_path is None:
+        table_path = str(paths[-1]).removesuffix('.old') + '.tab'
+    loggers, messages = load_table(table_path)
+    return [
+        decode_record(record, loggers, messages) for path in paths for record in read_records(path)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Decode LogBuffer binary logs')
+    parser.add_argument('logs', nargs='+', help='log files, oldest first')
+    parser.add_argument('--table', help='message table (default: <log>.tab)')
+    args = parser.parse_args(argv)
+
+    try:
+        lines = decode(args.logs, args.table)
+    except OSError as e:
+        print(f'Error: {e}')
+        sys.exit(1)
+
+    for line in lines:
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
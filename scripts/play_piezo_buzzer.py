@@ -1,14 +1,99 @@
-import asyncio
-import math
+#!/usr/bin/env python3
+"""
+Render piezo buzzer songs on the host and play them through the laptop speakers.
+
+The whole song is rendered at once with NumPy as the square wave the piezo's 50% duty
+PWM produces, using the same timing as PiezoBuzzer.play_song() (tempo, articulation
+and the gap after every note). The output is deterministic, so rendered WAV files
+can be compared in CI.
+
+    python3 scripts/play_piezo_buzzer.py smoke_on_the_water
+    python3 scripts/play_piezo_buzzer.py come_as_you_are --tempo 150 --out song.wav --no-play
+"""
+
+import argparse
 import os
-import struct
+import subprocess
 import sys
-import tempfile
 import wave
 
+import numpy as np
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from lib.piezo_buzzer_songs import SMOKE_ON_THE_WATER
-from lib.piezo_buzzer_types import Duration, Note
+from lib.piezo_buzzer_songs import load_song
+
+SAMPLE_RATE = 44100
+
+
+def song_pairs(song):
+    """(frequencies, durations) arrays from a compiled song or (note, duration) tuples"""
+    if len(song) and isinstance(song[0], tuple):
+        flat = [int(value) for pair in song for value in pair]
+    else:
+        flat = song
+    pairs = np.asarray(flat, dtype=np.int64).reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def note_timing(song, tempo=100, articulation=100, gap_ms=50):
+    """
+    Start, sounding length and slot length of every note in ms, with the integer
+    arithmetic of PiezoBuzzer.play_song().
+
+    Returns:
+        tuple: (freqs, starts_ms, sounding_ms, slots_ms) arrays
+    """
+    freqs, durations = song_pairs(song)
+    sounding = durations * 100 // tempo
+    slots = sounding + gap_ms * 100 // tempo
+    sounding = sounding * articulation // 100
+    starts = np.cumsum(slots) - slots
+    return freqs, starts, sounding, slots
+
+
+def render_song(song, sample_rate=SAMPLE_RATE, amplitude=0.3, **timing):
+    """Render a song to mono int16 samples"""
+    freqs, starts, sounding, slots = note_timing(song, **timing)
+    total = int(starts[-1] + slots[-1]) * sample_rate // 1000 if len(slots) else 0
+
+    t = np.arange(total, dtype=np.int64)
+    start_samples = starts * sample_rate // 1000
+    note = np.searchsorted(start_samples, t, side='right') - 1
+    local = t - start_samples[note]
+    freq = freqs[note]
+
+    # Square wave restarting its phase at every note, high for the first half period
+    high = (local * freq * 2 // sample_rate) % 2 == 0
+    audible = (freq > 0) & (local < sounding[note] * sample_rate // 1000)
+    level = int(amplitude * 32767)
+    return np.where(audible, np.where(high, level, -level), 0).astype(np.int16)
+
+
+def write_wav(path, samples, sample_rate=SAMPLE_RATE):
+    with wave.open(str(path), 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.astype('<i2').tobytes())
+
+
+def play_wav(path):
+    """Play a WAV file with simpleaudio when installed, else the platform's player"""
+    try:
+        import simpleaudio
+    except ImportError:
+        simpleaudio = None
+    if simpleaudio is not None:
+        simpleaudio.WaveObject.from_wave_file(str(path)).play().wait_done()
+        return
+
+    if sys.platform == 'win32':
+        import winsound
+
+        winsound.PlaySound(str(path), winsound.SND_FILENAME)
+        return
+    player = 'afplay' if sys.platform == 'darwin' else 'aplay'
+    subprocess.run([player, str(path)], check=True)
 
 
 class LaptopPiezoBuzzer:
@@ -17,54 +102,42 @@ class LaptopPiezoBuzzer:
     This allows testing piezo buzzer songs on a development machine
     """
 
-    def __init__(self):
-        self.sample_rate = 44100
-        self.temp_dir = tempfile.mkdtemp()
-        self.tone_file = os.path.join(self.temp_dir, 'tone.wav')
-
-    def _generate_sine_wave(self, freq, duration_ms):
-        """Generate a sine wave with the given frequency and duration"""
-        num_samples = int((duration_ms / 1000.0) * self.sample_rate)
-        audio_data = []
-        for i in range(num_samples):
-            sample = math.sin(2 * math.pi * int(freq) * i / self.sample_rate)
-            audio_data.append(int(sample * 32767))
-
-        with wave.open(self.tone_file, 'w') as wav_file:
-            wav_file.setnchannels(1)
-            wav_file.setsampwidth(2)
-            wav_file.setframerate(self.sample_rate)
-            wav_file.writeframes(struct.pack('h' * len(audio_data), *audio_data))
-
-    async def play_note(self, note, duration) -> None:
-        """Play a single note on the simulated piezo buzzer"""
-        if not isinstance(note, Note):
-            note = Note.from_int(note)
-        if not isinstance(duration, Duration):
-            duration = Duration.from_int(duration)
-        if note != Note.REST:
-            self._generate_sine_wave(note, 100)  # Generate a short tone
-            os.system(f'afplay {self.tone_file}')
-        await asyncio.sleep(duration / 1000)
-
-    async def play_song(self, song):
-        """Play a sequence of notes (song) on the simulated piezo buzzer"""
-        for note, duration in song:
-            await self.play_note(note, duration)
-            if note != Note.REST:
-                await asyncio.sleep(0.05)
-
-
-async def main():
-    """
-    Main function to demonstrate piezo buzzer capabilities
-    by playing a song using the laptop audio as a simulation
-    """
-    print('Playing song on simulated piezo buzzer...')
-    buzzer = LaptopPiezoBuzzer()
-    await buzzer.play_song(SMOKE_ON_THE_WATER)
-    print('Piezo buzzer demonstration completed')
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
+
+    def render(self, song, **timing):
+        return render_song(song, self.sample_rate, **timing)
+
+    def play_song(self, song, path='piezo_song.wav', **timing):
+        """Render the whole song into one WAV file and play it"""
+        write_wav(path, self.render(song, **timing), self.sample_rate)
+        play_wav(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Play a piezo buzzer song on the laptop')
+    parser.add_argument('song', nargs='?', default='smoke_on_the_water', help='song name')
+    parser.add_argument('--tempo', type=int, default=100, help='speed in percent')
+    parser.add_argument('--articulation', type=int, default=100, help='sounding percent')
+    parser.add_argument('--gap', type=int, default=50, help='gap after notes in ms')
+    parser.add_argument('--out', default='piezo_song.wav', help='output WAV file')
+    parser.add_argument('--no-play', action='store_true', help='only write the WAV file')
+    args = parser.parse_args(argv)
+
+    try:
+        song = load_song(args.song)
+    except ValueError as e:
+        print(f'Error: {e}')
+        return 1
+
+    timing = {'tempo': args.tempo, 'articulation': args.articulation, 'gap_ms': args.gap}
+    samples = render_song(song, **timing)
+    write_wav(args.out, samples)
+    print(f'Rendered {args.song}: {len(samples) / SAMPLE_RATE:.2f} s to {args.out}')
+    if not args.no_play:
+        play_wav(args.out)
+    return 0
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Run a device's main.py on the host with mock hardware and a virtual clock.
+
+    python3 scripts/simulate_device.py rolling_dice --duration 5000 \\
+        --script events.txt --trace rolling_dice.vcd
+
+The script holds one input event per line, times in ms since start:
+
+    # time  action   target  [args]
+    100     press    9           # active-low button: pin 9 low
+    180     release  9
+    300     touch    20          # active-high input: pin 20 high
+    400     untouch  20
+    500     set      10 0        # any pin level
+    700     accel    0 0 16384   # raw MPU6050 accelerometer reading
+
+Pin transitions, PWM changes and deep sleep are recorded with virtual timestamps.
+Traces ending in .vcd open in GTKWave/PulseView, anything else is written as
+'time_us signal value' lines that can be diffed in CI.
+"""
+
+import argparse
+import runpy
+import sys
+import types
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+ACCEL_XOUT_H = 0x3B
+MPU6050_ADDR = 0x68
+
+
+def install_mocks(project_root=PROJECT_ROOT):
+    for path in (str(project_root), str(project_root / 'lib')):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    import modules_mock
+
+    modules_mock.install()
+    if 'wifi_config' not in sys.modules:
+        try:
+            import wifi_config
+        except ImportError:
+            wifi_config = types.ModuleType('wifi_config')
+            wifi_config.WIFI_SSID = 'simulator'
+            wifi_config.WIFI_PASSWORD = ''
+            sys.modules['wifi_config'] = wifi_config
+
+
+def parse_script(lines):
+    """Returns [(time_ms, action, [args])] sorted by time"""
+    events = []
+    for number, line in enumerate(lines, 1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split()
+        if len(parts) < 3:
+            raise ValueError(f'Line {number}: expected "<time_ms> <action> <target>"')
+        events.append((int(parts[0]), parts[1], [int(arg) for arg in parts[2:]]))
+    return sorted(events, key=lambda event: event[0])
+
+
+def apply_event(action, args):
+    from hardware_mock import MockI2C
+    from pin_mock import MockPin
+
+    if action == 'accel':
+        data = bytearray()
+        for value in args[:3]:
+            data += (value & 0xFFFF).to_bytes(2, 'big')
+        MockI2C.registers(MPU6050_ADDR)[ACCEL_XOUT_H : ACCEL_XOUT_H + 6] = data
+        return
+
+    levels = {'press': 0, 'release': 1, 'touch': 1, 'untouch': 0}
+    if action in levels:
+        MockPin(args[0]).value(levels[action])
+    elif action == 'set':
+        MockPin(args[0]).value(args[1])
+    else:
+        raise ValueError(f'Unknown action: {action}')
+
+
+class Simulation:
+    def __init__(self, device_type, project_root=PROJECT_ROOT):
+        self.device_main = project_root / 'devices' / device_type / 'main.py'
+        if not self.device_main.exists():
+            raise FileNotFoundError(f"Device type '{device_type}' does not exist")
+
+        install_mocks(project_root)
+        import time_mock
+        from hardware_mock import MockI2C
+        from pin_mock import MockPin
+        from uasyncio_virtual_mock import VirtualLoop
+
+        self._time = time_mock
+        self.loop = VirtualLoop()
+        self.start_us = time_mock.ticks_us()
+        self.deepsleep_ms = None
+
+        MockI2C.reset()
+        MockPin.clear_instances()
+        MockPin.apply_pulls = True
+        self.trace = MockPin.start_trace()
+
+    def _deepsleep(self, *args):
+        self.deepsleep_ms = self.elapsed_ms()
+        self.trace.record('deepsleep', 1)
+        self.loop.stop()
+
+    def elapsed_ms(self):
+        return (self._time.ticks_us() - self.start_us) // 1000
+
+    async def _play(self, events):
+        import uasyncio
+
+        for at_ms, action, args in events:
+            delay = at_ms - self.elapsed_ms()
+            if delay > 0:
+                await uasyncio.sleep_ms(delay)
+            apply_event(action, args)
+
+    def run(self, events=(), duration_ms=10_000):
+        import machine
+        from pin_mock import MockPin
+
+        saved_deepsleep = machine.deepsleep
+        machine.deepsleep = self._deepsleep
+        try:
+            with self.loop.install():
+                namespace = runpy.run_path(str(self.device_main), run_name='simulated_main')
+                if events:
+                    self.loop.create_task(self._play(events))
+                self.loop.run(namespace['main'](), duration_ms)
+        finally:
+            machine.deepsleep = saved_deepsleep
+            MockPin.apply_pulls = False
+            MockPin.stop_trace()
+        return self.trace
+
+    def save(self, path):
+        if str(path).endswith('.vcd'):
+            self.trace.export_vcd(path)
+        else:
+            self.trace.export_text(path)
+
+
+def simulate_device(device_type, events=(), duration_ms=10_000, trace_path=None, project_root=None):
+    simulation = Simulation(device_type, project_root or PROJECT_ROOT)
+    started = datetime.now()  # the time module is replaced by the virtual clock
+    simulation.run(events, duration_ms)
+    wall_ms = (datetime.now() - started).total_seconds() * 1000
+
+    if trace_path:
+        simulation.save(trace_path)
+
+    slept = ''
+    if simulation.deepsleep_ms is not None:
+        slept = f' (deep sleep at {simulation.deepsleep_ms} ms)'
+    print(f"""
+Simulated device: {device_type}
+  - Virtual time: {simulation.elapsed_ms()} ms{slept}
+  - Wall time: {wall_ms:.0f} ms
+  - Recorded {len(simulation.trace)} transitions on {len(simulation.trace.signals)} signals
+""")
+    return simulation
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulate a device on the host')
+    parser.add_argument('device_type')
+    parser.add_argument('--duration', type=int, default=10_000, help='virtual ms to run')
+    parser.add_argument('--script', help='input event script')
+    parser.add_argument('--event', action='append', default=[], help='inline "<ms> <action> <pin>"')
+    parser.add_argument('--trace', help='output trace (.vcd or text)')
+    args = parser.parse_args()
+
+    lines = list(args.event)
+    if args.script:
+        lines += Path(args.script).read_text().splitlines()
+
+    try:
+        simulate_device(args.device_type, parse_script(lines), args.duration, args.trace)
+    except (FileNotFoundError, ValueError) as e:
+        print(f'Error: {e}')
+        sys.exit(1)
@@ -0,0 +1,40 @@
+from benchmark_host import compare, format_results, load_baseline, main, run_suite, save_baseline
+
+
+def test_suite_matches_stored_baseline():
+    results = run_suite(iterations=3)
+
+    assert set(results) == set(load_baseline())
+    assert compare(results, load_baseline()) == []
+    assert results['shift_register.update']['pin_writes'] > 0
+    assert results['audio.sample_pump']['pwm_writes'] > 0
+    assert results['audio.sample_pump']['sim_us'] > 0
+
+
+def test_compare_flags_counts_and_tolerates_alloc_noise():
+    baseline = {'case': {'pin_writes': 10, 'pwm_writes': 0, 'sim_us': 5, 'alloc_bytes': 1000}}
+    current = {'case': {'pin_writes': 11, 'pwm_writes': 0, 'sim_us': 5, 'alloc_bytes': 1400}}
+    assert compare(current, baseline) == [('case', 'pin_writes', 10, 11)]
+
+    current['case']['alloc_bytes'] = 1600
+    assert ('case', 'alloc_bytes', 1000, 1600) in compare(current, baseline)
+    assert compare({'new_case': current['case']}, baseline) == []
+
+
+def test_format_results_shows_changed_baseline_values():
+    metrics = {'pin_writes': 11, 'pwm_writes': 0, 'sim_us': 5, 'alloc_bytes': 1000, 'wall_us': 1.5}
+    table = format_results({'case': metrics}, {'case': {'pin_writes': 10, 'sim_us': 5}})
+    assert '11 (10)' in table.splitlines()[1]
+    assert '5 (5)' not in table
+
+
+def test_main_updates_and_checks_baseline(tmp_path, capsys):
+    path = tmp_path / 'baseline.json'
+    assert main(['logger.disabled', '--iterations', '2', '--baseline', str(path), '--update']) == 0
+    assert main(['logger.disabled', '--iterations', '2', '--baseline', str(path)]) == 0
+
+    stored = load_baseline(path)
+    stored['logger.disabled']['alloc_bytes'] = -1000
+    save_baseline(stored, path)
+    assert main(['logger.disabled', '--iterations', '2', '--baseline', str(path)]) == 1
+    assert 'REGRESSION logger.disabled alloc_bytes' in capsys.readouterr().out
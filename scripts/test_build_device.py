@@ -0,0 +1,100 @@
+import ast
+
+import pytest
+from build_device import LEVELS, build_device, strip_logging
+
+SOURCE = """import time
+
+
+class Blink:
+    def __init__(self):
+        self.logger = Logger(prefix='Blink')
+
+    def on(self):
+        self.logger.info('On at %d', time.ticks_ms())
+
+    def off(self):
+        self.logger.info(
+            'Off after %d ms',
+            time.ticks_ms(),
+        )
+        self.pin.off()
+        if self.logger.enabled_for(Logger.INFO):
+            self.logger.info('State %s', self.state)
+
+    def fail(self):
+        try:
+            self.pin.on()
+        except Exception as e:
+            self.logger.error('Failed: %s', e)
+            self.logger.log(Logger.DEBUG, 'debug')
+        if self.ready: self.logger.info('kept, shares a line')
+"""
+
+
+def test_strips_calls_below_level_and_keeps_line_numbers():
+    result, count = strip_logging(SOURCE, LEVELS['error'])
+
+    assert count == 4
+    assert len(result.splitlines()) == len(SOURCE.splitlines())
+    assert "self.logger.error('Failed: %s', e)" in result
+    assert 'On at' not in result
+    assert 'Off after' not in result
+    assert 'enabled_for' not in result
+    assert "Logger.DEBUG, 'debug'" not in result
+    assert 'kept, shares a line' in result
+    assert result.splitlines()[15] == '        self.pin.off()'
+    ast.parse(result)
+
+
+def test_strip_all_keeps_valid_blocks():
+    result, count = strip_logging(SOURCE, LEVELS['all'])
+
+    assert count == 5
+    assert 'self.logger.error' not in result
+    assert '            pass' in result.splitlines()
+    ast.parse(result)
+
+
+def test_nothing_to_strip_returns_source_unchanged():
+    source = "# comment\nprint('hi')\n"
+    assert strip_logging(source, LEVELS['all']) == (source, 0)
+
+
+@pytest.fixture
+def mock_project(tmp_path):
+    project = tmp_path / 'project'
+    (project / 'devices' / 'blink').mkdir(parents=True)
+    (project / 'lib').mkdir()
+    (project / 'templates').mkdir()
+    (project / 'devices' / 'blink' / 'main.py').write_text("logger.info('boot')\nrun()\n")
+    (project / 'templates' / 'boot.py.template').write_text('# boot\n')
+    (project / 'lib' / 'blink.py').write_text(SOURCE)
+    (project / 'lib' / 'test_blink.py').write_text('def test(): pass\n')
+    (project / 'lib' / 'pin_mock.py').write_text('')
+    return project
+
+
+def test_build_device_copies_stripped_tree(mock_project):
+    out_dir = mock_project / 'build' / 'blink'
+    stripped = build_device('blink', LEVELS['error'], project_root=mock_project)
+
+    assert stripped == 5
+    assert sorted(p.name for p in out_dir.rglob('*.py')) == ['blink.py', 'boot.py', 'main.py']
+    assert (out_dir / 'main.py').read_text() == 'pass\nrun()\n'
+    assert (out_dir / 'boot.py').read_text() == '# boot\n'
+    assert 'On at' in (mock_project / 'lib' / 'blink.py').read_text()
+
+
+def test_build_device_precompiles_songs(mock_project):
+    (mock_project / 'songs').mkdir()
+    (mock_project / 'songs' / 'beep.txt').write_text('C4/8')
+    build_device('blink', LEVELS['error'], project_root=mock_project)
+
+    song = mock_project / 'build' / 'blink' / 'songs' / 'beep.bin'
+    assert song.read_bytes() == (262).to_bytes(2, 'little') + (125).to_bytes(2, 'little')
+
+
+def test_build_device_unknown_device(mock_project):
+    with pytest.raises(SystemExit):
+        build_device('missing', LEVELS['error'], project_root=mock_project)
@@ -0,0 +1,58 @@
+import json
+
+from compare_benchmarks import compare, format_results, main, parse_results
+
+CAPTURE = [
+    'MicroPython v1.23.0 on 2024-06-02; ESP32C3 module with ESP32C3',
+    'BENCH {"board": "esp32c3", "case": "button.scan", "us": 100, "alloc": 32, "iterations": 100}',
+    '>>> BENCH {"board": "esp32c3", "case": "led_matrix.frame", "us": 900, "alloc": 0, "iterations": 100}',
+    'BENCH {"board": "esp32", "case": "button.scan", "us": 60, "alloc": 32, "iterations": 100}',
+    'BENCH {broken',
+]
+
+
+def test_parse_results_groups_by_board():
+    assert parse_results(CAPTURE) == {
+        'esp32c3': {
+            'button.scan': {'us': 100, 'alloc': 32},
+            'led_matrix.frame': {'us': 900, 'alloc': 0},
+        },
+        'esp32': {'button.scan': {'us': 60, 'alloc': 32}},
+    }
+
+
+def test_compare_uses_per_board_baselines():
+    results = parse_results(CAPTURE)
+    baselines = {
+        'esp32c3': {
+            'button.scan': {'us': 80, 'alloc': 32},
+            'led_matrix.frame': {'us': 850, 'alloc': 0},
+        },
+        'esp32': {'button.scan': {'us': 60, 'alloc': 8}},
+    }
+    assert compare(results, baselines) == [
+        ('esp32c3', 'button.scan', 'us', 80, 100),
+        ('esp32', 'button.scan', 'alloc', 8, 32),
+    ]
+    assert '+25.0% vs 80 us' in format_results(results, baselines)
+
+
+def test_main_update_then_compare(tmp_path, capsys):
+    capture = tmp_path / 'bench.log'
+    capture.write_text('\n'.join(CAPTURE))
+    baselines = tmp_path / 'baselines.json'
+
+    assert main([str(capture), '--baselines', str(baselines), '--update']) == 0
+    assert json.loads(baselines.read_text())['esp32']['button.scan']['us'] == 60
+    assert main([str(capture), '--baselines', str(baselines)]) == 0
+
+    slower = CAPTURE[1].replace('"us": 100', '"us": 200')
+    capture.write_text(slower)
+    assert main([str(capture), '--baselines', str(baselines)]) == 1
+    assert 'REGRESSION esp32c3 button.scan us: 100 -> 200' in capsys.readouterr().out
+
+
+def test_main_without_results(tmp_path):
+    capture = tmp_path / 'empty.log'
+    capture.write_text('>>> nothing here\n')
+    assert main([str(capture)]) == 1
@@ -0,0 +1,35 @@
+from array import array
+
+import pytest
+from compile_songs import compile_songs
+
+from lib.piezo_buzzer_songs import load_song
+
+
+def test_compile_songs_round_trip(tmp_path):
+    src = tmp_path / 'songs'
+    src.mkdir()
+    (src / 'scale.txt').write_text('C4/8 D4/8 E4/8')
+    (src / 'ring.rtttl').write_text('ring:d=4,o=5,b=120:a,p')
+    (src / 'notes.md').write_text('ignored')
+    out = tmp_path / 'build' / 'songs'
+
+    assert compile_songs(src, out) == {'ring': 2, 'scale': 3}
+    assert sorted(path.name for path in out.iterdir()) == ['ring.bin', 'scale.bin']
+
+    scale = array('H')
+    scale.frombytes((out / 'scale.bin').read_bytes())
+    assert list(scale) == [262, 125, 294, 125, 330, 125]
+    assert load_song('ring', [str(out)]) == array('H', [880, 500, 0, 500])
+
+
+def test_compile_songs_reports_file(tmp_path):
+    (tmp_path / 'bad.txt').write_text('H4')
+    with pytest.raises(ValueError, match='bad.txt'):
+        compile_songs(tmp_path, tmp_path / 'out')
+
+
+def test_project_songs_compile(tmp_path):
+    songs = compile_songs(out_dir=tmp_path)
+    assert songs['come_as_you_are'] == 15
+    assert songs['smoke_on_the_water'] == 14
@@ -0,0 +1,49 @@
+from decode_log import decode, decode_record, format_message, main
+from log_buffer import LogBuffer
+from logger import Logger
+
+
+def test_format_message_marks_missing_args():
+    assert format_message('Pin %d is %s', [4, None]) == 'Pin 4 is ?'
+    assert format_message('Volume 100%', []) == 'Volume 100%'
+    assert format_message('Pin %d', [None]) == 'Pin %d [None]'
+
+
+def test_decode_record_unknown_ids():
+    header = 7 | 3 << 16 | Logger.ERROR << 24
+    line = decode_record((1500, header, 0, 0), {}, {})
+    assert line == '     1.500 [logger 3] ERROR <message 7>'
+
+
+def test_decode_record_overflow_ids():
+    header = 0xFFFF | 0xFF << 16 | Logger.INFO << 24 | 1 << 26
+    line = decode_record((0, header, 42, 0), {0xFF: 'Stale'}, {0xFFFF: 'Stale %d'})
+    assert line == '     0.000 [logger table full] INFO <message table full> [42]'
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'log.bin')
+    buffer = LogBuffer(path, page_records=2, pages=2, max_bytes=32)
+    logger = Logger(prefix='Dice', buffer=buffer)
+    logger.info('Rolled %d', 6)
+    buffer.flush()
+    logger.error('Sensor %s failed with %d', 'mpu', -5)
+    logger.info('%d%%', 50)
+    buffer.flush()
+
+    lines = decode([path + '.old', path])
+    assert [line.split(None, 1)[1] for line in lines] == [
+        '[-] INFO --- boot ---',
+        '[Dice] INFO Rolled 6',
+        '[Dice] ERROR Sensor ? failed with -5',
+        '[Dice] INFO 50%',
+    ]
+
+
+def test_main_prints_lines(tmp_path, capsys):
+    path = str(tmp_path / 'log.bin')
+    buffer = LogBuffer(path)
+    buffer.flush()
+
+    main([path])
+    assert capsys.readouterr().out.strip().endswith('[-] INFO --- boot ---')
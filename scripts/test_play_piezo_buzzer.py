@@ -0,0 +1,49 @@
+import wave
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from play_piezo_buzzer import SAMPLE_RATE, main, note_timing, render_song  # noqa: E402
+
+from lib.piezo_buzzer_types import Duration, Note  # noqa: E402
+
+
+def test_note_timing_matches_buzzer_sequencer():
+    song = [(Note.C4, 200), (Note.REST, 100), (Note.D4, 200)]
+    freqs, starts, sounding, slots = note_timing(song)
+    assert list(freqs) == [262, 0, 294]
+    assert list(starts) == [0, 250, 400]
+    assert list(sounding) == [200, 100, 200]
+
+    _, starts, sounding, _ = note_timing(song, tempo=200, articulation=50, gap_ms=0)
+    assert list(starts) == [0, 100, 150]
+    assert list(sounding) == [50, 25, 50]
+
+
+def test_render_square_wave_and_gaps():
+    samples = render_song([(Note.A4, Duration.QUARTER)], sample_rate=8000, amplitude=0.5)
+    assert samples.dtype == np.int16
+    assert len(samples) == 300 * 8  # note plus the 50 ms gap
+
+    tone, gap = samples[: 250 * 8], samples[250 * 8 :]
+    assert set(np.unique(tone)) == {-16383, 16383}
+    assert not gap.any()
+    # 440 Hz square wave: 110 rising edges in a quarter second
+    rising = np.count_nonzero((tone[1:] > 0) & (tone[:-1] < 0))
+    assert rising in (109, 110)
+
+
+def test_render_is_deterministic_for_ci():
+    song = [(Note.C4, 125), (Note.E4, 125), (Note.G4, 250)]
+    assert np.array_equal(render_song(song), render_song(list(song)))
+    assert len(render_song(song)) == (125 + 125 + 250 + 150) * SAMPLE_RATE // 1000
+
+
+def test_main_writes_wav_without_playing(tmp_path, capsys):
+    out = tmp_path / 'song.wav'
+    assert main(['come_as_you_are', '--out', str(out), '--no-play', '--tempo', '200']) == 0
+    with wave.open(str(out)) as wav:
+        assert wav.getframerate() == SAMPLE_RATE
+        assert wav.getnframes() == 15 * (62 + 25) * SAMPLE_RATE // 1000
+    assert main(['missing', '--no-play']) == 1
@@ -0,0 +1,82 @@
+import pytest
+from hardware_mock import MockI2C
+from simulate_device import apply_event, parse_script, simulate_device
+
+DEVICE_MAIN = """import machine
+import uasyncio
+from button import Button
+from machine import I2C, Pin
+
+led = Pin(2, Pin.OUT)
+i2c = I2C(0)
+
+
+async def main():
+    button = Button(0, debug=False)
+
+    async def toggle():
+        led.value(i2c.readfrom_mem(0x68, 0x3F, 2)[0] == 0x40)
+
+    button.on_press(toggle)
+
+    async def shutdown():
+        await uasyncio.sleep(5)
+        machine.deepsleep()
+
+    await uasyncio.gather(button.monitor(), shutdown())
+"""
+
+
+@pytest.fixture
+def mock_project(tmp_path):
+    device_dir = tmp_path / 'devices' / 'blink'
+    device_dir.mkdir(parents=True)
+    (device_dir / 'main.py').write_text(DEVICE_MAIN)
+    return tmp_path
+
+
+def test_parse_script():
+    events = parse_script(['# comment', '200 release 0', '', '100 press 0  # tap', '300 set 4 1'])
+    assert events == [(100, 'press', [0]), (200, 'release', [0]), (300, 'set', [4, 1])]
+
+    with pytest.raises(ValueError):
+        parse_script(['100 press'])
+
+
+def test_apply_accel_event():
+    apply_event('accel', [1, -1, 16384])
+    assert MockI2C.registers(0x68)[0x3B:0x41] == bytes([0, 1, 0xFF, 0xFF, 0x40, 0])
+
+    with pytest.raises(ValueError):
+        apply_event('jump', [0])
+
+
+def test_simulates_device_until_deepsleep(mock_project, tmp_path):
+    events = parse_script(['50 accel 0 0 16384', '100 press 0', '150 release 0'])
+    trace_path = tmp_path / 'trace.txt'
+    simulation = simulate_device(
+        'blink', events, duration_ms=60_000, trace_path=trace_path, project_root=mock_project
+    )
+
+    assert simulation.deepsleep_ms == 5000
+    assert simulation.elapsed_ms() == 5000
+    led = simulation.trace.transitions(2)
+    assert [value for _, value in led] == [0, 1]
+    assert (led[1][0] - simulation.start_us) // 1000 == 150
+    assert trace_path.read_text().splitlines()[-1].endswith('deepsleep 1')
+
+
+def test_unknown_device(mock_project):
+    with pytest.raises(FileNotFoundError):
+        simulate_device('missing', project_root=mock_project)
+
+
+def test_simulates_rolling_dice():
+    events = parse_script(['3000 press 9', '3100 release 9'])
+    simulation = simulate_device('rolling_dice', events, duration_ms=8_000)
+
+    assert simulation.deepsleep_ms is None
+    assert simulation.elapsed_ms() == 8_000
+    # the boot button press starts a second roll after the startup roll
+    roll_start = simulation.start_us + 3_100_000
+    assert any(t >= roll_start for t in simulation.trace.edges(5))